@@ -0,0 +1,402 @@
+# api/server.py
+import asyncio
+import json
+import re
+import signal
+import traceback
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from management.hospital_management import HospitalManagement
+from management.scheduling import SlotConflictError
+from models.doctor import Specialization
+
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 1024 * 1024
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+REASONS = {
+    200: "OK",
+    201: "Created",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class Request:
+    def __init__(self, method: str, target: str, headers: dict, body: bytes):
+        self.method = method
+        parts = urlsplit(target)
+        self.path = parts.path.rstrip("/") or "/"
+        self.query = dict(parse_qsl(parts.query))
+        self.headers = headers
+        self.body = body
+
+    def json(self) -> dict:
+        try:
+            data = json.loads(self.body or b"{}")
+        except ValueError:
+            raise HttpError(400, "Body is not valid JSON.")
+        if not isinstance(data, dict):
+            raise HttpError(400, "Body must be a JSON object.")
+        return data
+
+    def int_param(self, name: str, default: int, maximum: Optional[int] = None) -> int:
+        value = self.query.get(name)
+        if value is None:
+            return default
+        if not value.isdigit():
+            raise HttpError(400, f"{name} must be a non-negative integer.")
+        return min(int(value), maximum) if maximum is not None else int(value)
+
+
+Handler = Callable[..., Tuple[int, object]]
+
+
+def _required(data: dict, *fields: str):
+    missing = [field for field in fields if data.get(field) in (None, "")]
+    if missing:
+        raise HttpError(400, f"Missing fields: {', '.join(missing)}.")
+    return [data[field] for field in fields]
+
+
+def _age(value) -> int:
+    if not isinstance(value, int) or isinstance(value, bool) or value <= 0:
+        raise HttpError(400, "age must be a positive integer.")
+    return value
+
+
+def doctor_json(doctor) -> dict:
+    record = doctor.to_dict()
+    del record["password"]
+    return record
+
+
+class HospitalService:
+    # JSON over HTTP/1.1 for a HospitalManagement, on asyncio streams. All
+    # handlers run on the event loop thread and call HospitalManagement's
+    # public methods, which take its read/write lock themselves, so the same
+    # object may also be used from other threads. The operations are
+    # in-memory and quick, and persistence goes through the storage given
+    # to HospitalManagement (use WriteBehindStorage so writes are batched
+    # off the loop).
+    def __init__(self, hospital_mgmt: HospitalManagement):
+        self.hospital_mgmt = hospital_mgmt
+        self.routes: List[Tuple[str, re.Pattern, Handler]] = []
+        for method, pattern, handler in (
+            ("GET", r"/health", self.health),
+            ("GET", r"/doctors", self.list_doctors),
+            ("POST", r"/doctors", self.add_doctor),
+            ("GET", r"/doctors/(?P<doctor_id>[^/]+)", self.get_doctor),
+            ("GET", r"/patients", self.list_patients),
+            ("POST", r"/patients", self.add_patient),
+            ("GET", r"/patients/(?P<patient_id>[^/]+)", self.get_patient),
+            ("GET", r"/appointments", self.list_appointments),
+            ("POST", r"/appointments", self.book_appointment),
+            ("GET", r"/appointments/(?P<appointment_id>[^/]+)", self.get_appointment),
+            (
+                "PUT",
+                r"/appointments/(?P<appointment_id>[^/]+)",
+                self.update_appointment,
+            ),
+            (
+                "DELETE",
+                r"/appointments/(?P<appointment_id>[^/]+)",
+                self.delete_appointment,
+            ),
+            ("POST", r"/series", self.book_series),
+            ("GET", r"/series/(?P<series_id>[^/]+)", self.get_series),
+            ("PUT", r"/series/(?P<series_id>[^/]+)", self.update_series),
+            ("DELETE", r"/series/(?P<series_id>[^/]+)", self.cancel_series),
+        ):
+            self.routes.append((method, re.compile(pattern + "$"), handler))
+
+    # Routing
+    def dispatch(self, request: Request) -> Tuple[int, object]:
+        allowed = []
+        for method, pattern, handler in self.routes:
+            match = pattern.match(request.path)
+            if not match:
+                continue
+            if method != request.method:
+                allowed.append(method)
+                continue
+            return handler(request, **match.groupdict())
+        if allowed:
+            raise HttpError(405, f"Use {', '.join(allowed)} for {request.path}.")
+        raise HttpError(404, f"No such resource: {request.path}")
+
+    def health(self, request: Request):
+        return 200, {
+            collection: len(getattr(self.hospital_mgmt, collection))
+            for collection in ("doctors", "patients", "appointments", "series")
+        }
+
+    # Doctors
+    def list_doctors(self, request: Request):
+        limit = request.int_param("limit", DEFAULT_LIMIT, MAX_LIMIT)
+        offset = request.int_param("offset", 0)
+        query = request.query.get("q")
+        if query:
+            doctors = self.hospital_mgmt.complete_doctors(query, offset + limit)
+        else:
+            doctors = self.hospital_mgmt.list_doctors()
+        return 200, [doctor_json(doctor) for doctor in doctors[offset : offset + limit]]
+
+    def get_doctor(self, request: Request, doctor_id: str):
+        doctor = self.hospital_mgmt.find_doctor_by_id(doctor_id)
+        if not doctor:
+            raise HttpError(404, f"No doctor with ID {doctor_id}.")
+        return 200, doctor_json(doctor)
+
+    def add_doctor(self, request: Request):
+        name, age, specialization, password = _required(
+            request.json(), "name", "age", "specialization", "password"
+        )
+        try:
+            specialization = Specialization(specialization)
+        except ValueError:
+            raise HttpError(400, f"Unknown specialization {specialization!r}.")
+        doctor = self.hospital_mgmt.add_doctor(
+            str(name), _age(age), specialization, str(password)
+        )
+        return 201, doctor_json(doctor)
+
+    # Patients
+    def list_patients(self, request: Request):
+        limit = request.int_param("limit", DEFAULT_LIMIT, MAX_LIMIT)
+        offset = request.int_param("offset", 0)
+        query = request.query.get("q")
+        if query:
+            patients = self.hospital_mgmt.search_patients(query, offset + limit)
+        else:
+            patients = self.hospital_mgmt.list_patients()
+        return 200, [patient.to_dict() for patient in patients[offset : offset + limit]]
+
+    def get_patient(self, request: Request, patient_id: str):
+        patient = self.hospital_mgmt.find_patient_by_id(patient_id)
+        if not patient:
+            raise HttpError(404, f"No patient with ID {patient_id}.")
+        return 200, patient.to_dict()
+
+    def add_patient(self, request: Request):
+        data = request.json()
+        name, age = _required(data, "name", "age")
+        patient = self.hospital_mgmt.add_patient(
+            str(name), _age(age), str(data.get("medical_history", ""))
+        )
+        return 201, patient.to_dict()
+
+    # Appointments
+    def list_appointments(self, request: Request):
+        appointments = self.hospital_mgmt.query_appointments(
+            doctor_id=request.query.get("doctor_id"),
+            patient_id=request.query.get("patient_id"),
+            date_from=request.query.get("date_from"),
+            date_to=request.query.get("date_to"),
+            limit=request.int_param("limit", DEFAULT_LIMIT, MAX_LIMIT),
+            offset=request.int_param("offset", 0),
+        )
+        return 200, [appointment.to_dict() for appointment in appointments]
+
+    def get_appointment(self, request: Request, appointment_id: str):
+        appointment = self.hospital_mgmt.find_appointment_by_id(appointment_id)
+        if not appointment:
+            raise HttpError(404, f"No appointment with ID {appointment_id}.")
+        return 200, appointment.to_dict()
+
+    def book_appointment(self, request: Request):
+        data = request.json()
+        doctor_id, patient_id, date = _required(data, "doctor_id", "patient_id", "date")
+        options = {key: data[key] for key in ("start_time", "duration") if key in data}
+        appointment = self.hospital_mgmt.book_appointment(
+            doctor_id, patient_id, date, **options
+        )
+        if appointment is None:
+            raise HttpError(404, "Unknown doctor or patient.")
+        return 201, appointment.to_dict()
+
+    def update_appointment(self, request: Request, appointment_id: str):
+        data = request.json()
+        doctor_id, patient_id, date = _required(data, "doctor_id", "patient_id", "date")
+        if not self.hospital_mgmt.update_appointment(
+            appointment_id,
+            doctor_id,
+            patient_id,
+            date,
+            data.get("start_time"),
+            data.get("duration"),
+        ):
+            raise HttpError(404, "Unknown appointment, doctor or patient.")
+        return self.get_appointment(request, appointment_id)
+
+    def delete_appointment(self, request: Request, appointment_id: str):
+        if not self.hospital_mgmt.delete_appointment(appointment_id):
+            raise HttpError(404, f"No appointment with ID {appointment_id}.")
+        return 200, {"deleted": appointment_id}
+
+    # Recurring Series
+    def book_series(self, request: Request):
+        data = request.json()
+        doctor_id, patient_id, start_date, frequency = _required(
+            data, "doctor_id", "patient_id", "start_date", "frequency"
+        )
+        options = {
+            key: data[key]
+            for key in ("interval", "count", "until", "start_time", "duration")
+            if key in data
+        }
+        series = self.hospital_mgmt.book_series(
+            doctor_id, patient_id, start_date, frequency, **options
+        )
+        if series is None:
+            raise HttpError(404, "Unknown doctor or patient.")
+        return 201, self.series_json(series.series_id)
+
+    def get_series(self, request: Request, series_id: str):
+        return 200, self.series_json(series_id)
+
+    def update_series(self, request: Request, series_id: str):
+        # Only the fields given change; from_date limits the edit to the
+        # occurrences on or after it
+        data = request.json()
+        if not self.hospital_mgmt.update_series(
+            series_id,
+            data.get("doctor_id"),
+            data.get("patient_id"),
+            data.get("start_time"),
+            data.get("duration"),
+            data.get("from_date"),
+        ):
+            raise HttpError(404, "Unknown series, doctor or patient.")
+        return self.get_series(request, series_id)
+
+    def cancel_series(self, request: Request, series_id: str):
+        from_date = request.query.get("from_date")
+        if not self.hospital_mgmt.cancel_series(series_id, from_date):
+            raise HttpError(404, f"No series with ID {series_id}.")
+        return 200, {"cancelled": series_id, "from_date": from_date}
+
+    def series_json(self, series_id: str) -> dict:
+        series = self.hospital_mgmt.find_series_by_id(series_id)
+        if not series:
+            raise HttpError(404, f"No series with ID {series_id}.")
+        record = series.to_dict()
+        record["appointments"] = [
+            appointment.to_dict()
+            for appointment in self.hospital_mgmt.list_series_appointments(series_id)
+        ]
+        return record
+
+    # Connections
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        # One connection, any number of keep-alive requests
+        try:
+            while True:
+                request = await read_request(reader)
+                if request is None:
+                    break
+                status, payload = self.respond(request)
+                keep_alive = request.headers.get("connection", "").lower() != "close"
+                writer.write(encode_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except HttpError as e:
+            writer.write(encode_response(e.status, {"error": str(e)}, False))
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def respond(self, request: Request) -> Tuple[int, object]:
+        try:
+            return self.dispatch(request)
+        except HttpError as e:
+            return e.status, {"error": str(e)}
+        except SlotConflictError as e:
+            return 409, {"error": str(e)}
+        except (ValueError, TypeError) as e:
+            return 400, {"error": str(e)}
+        except Exception:
+            traceback.print_exc()
+            return 500, {"error": "Internal server error."}
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8080):
+        # Runs until SIGINT or SIGTERM, then returns so the caller can flush
+        # the storage
+        loop = asyncio.get_running_loop()
+        stopped = asyncio.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, stopped.set)
+            except NotImplementedError:  # Windows
+                pass
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        async with server:
+            await stopped.wait()
+
+
+async def read_request(reader: asyncio.StreamReader) -> Optional[Request]:
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as e:
+        if e.partial.strip():
+            raise HttpError(400, "Incomplete request.")
+        return None  # client closed the connection between requests
+    except asyncio.LimitOverrunError:
+        raise HttpError(413, "Request headers too large.")
+    if len(head) > MAX_HEADER_BYTES:
+        raise HttpError(413, "Request headers too large.")
+
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, _ = lines[0].split(" ", 2)
+    except ValueError:
+        raise HttpError(400, "Malformed request line.")
+    headers: Dict[str, str] = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        if name:
+            headers[name.strip().lower()] = value.strip()
+
+    length = headers.get("content-length", "0")
+    if not length.isdigit():
+        raise HttpError(400, "Invalid Content-Length.")
+    if int(length) > MAX_BODY_BYTES:
+        raise HttpError(413, "Request body too large.")
+    body = await reader.readexactly(int(length)) if int(length) else b""
+    return Request(method.upper(), target, headers, body)
+
+
+def encode_response(status: int, payload: object, keep_alive: bool = True) -> bytes:
+    body = json.dumps(payload).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {REASONS.get(status, 'Unknown')}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+def run_server(hospital_mgmt: HospitalManagement, host: str, port: int):
+    service = HospitalService(hospital_mgmt)
+    print(f"Serving on http://{host}:{port}")
+    try:
+        asyncio.run(service.serve(host, port))
+    except KeyboardInterrupt:
+        pass
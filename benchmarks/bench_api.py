@@ -0,0 +1,200 @@
+# benchmarks/bench_api.py
+# Load test for the HTTP service (main.py --serve). Starts a server on
+# synthetic data, or targets a running one with --address, and drives it
+# from many concurrent keep-alive clients. Run from the repository root:
+#   python -m benchmarks.bench_api --clients 50 --seconds 10
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+from benchmarks.synthetic import FIRST_DATE, Dataset, write_dataset
+from storage.backends import STORAGE_BACKENDS
+
+# (weight, kind) of the requests each client sends
+REQUEST_MIX = [
+    (40, "get_doctor"),
+    (20, "get_patient"),
+    (20, "list_appointments"),
+    (20, "book_and_delete"),
+]
+
+
+class Client:
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def request(self, method: str, path: str, body: dict = None):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(
+                self.host, self.port
+            )
+        payload = json.dumps(body).encode() if body is not None else b""
+        self.writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+            f"Content-Length: {len(payload)}\r\n\r\n".encode("latin-1") + payload
+        )
+        await self.writer.drain()
+        head = await self.reader.readuntil(b"\r\n\r\n")
+        status = int(head.split(b" ", 2)[1])
+        length = 0
+        for line in head.split(b"\r\n"):
+            if line.lower().startswith(b"content-length:"):
+                length = int(line.split(b":", 1)[1])
+        data = json.loads(await self.reader.readexactly(length)) if length else None
+        return status, data
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+async def run_client(client: Client, dataset: Dataset, deadline: float, seed: int):
+    rng = random.Random(seed)
+    kinds = [kind for weight, kind in REQUEST_MIX for _ in range(weight)]
+    latencies, errors = [], 0
+    # Each client books on its own far-off day so bookings never conflict
+    day = (FIRST_DATE + timedelta(days=dataset.days + seed)).isoformat()
+    while time.perf_counter() < deadline:
+        kind = rng.choice(kinds)
+        start = time.perf_counter()
+        if kind == "get_doctor":
+            status, _ = await client.request(
+                "GET", f"/doctors/D{rng.randint(1, dataset.doctors)}"
+            )
+        elif kind == "get_patient":
+            status, _ = await client.request(
+                "GET", f"/patients/P{rng.randint(1, dataset.patients)}"
+            )
+        elif kind == "list_appointments":
+            status, _ = await client.request(
+                "GET",
+                f"/appointments?doctor_id=D{rng.randint(1, dataset.doctors)}&limit=20",
+            )
+        else:
+            status, booked = await client.request(
+                "POST",
+                "/appointments",
+                {
+                    "doctor_id": f"D{rng.randint(1, dataset.doctors)}",
+                    "patient_id": f"P{rng.randint(1, dataset.patients)}",
+                    "date": day,
+                    "start_time": "09:00",
+                    "duration": 15,
+                },
+            )
+            if status == 201:
+                status, _ = await client.request(
+                    "DELETE", f"/appointments/{booked['appointment_id']}"
+                )
+        latencies.append(time.perf_counter() - start)
+        if status >= 400 and status != 409:
+            errors += 1
+    client.close()
+    return latencies, errors
+
+
+async def load_test(host: str, port: int, dataset: Dataset, args) -> dict:
+    deadline = time.perf_counter() + args.seconds
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(
+            run_client(Client(host, port), dataset, deadline, seed)
+            for seed in range(args.clients)
+        )
+    )
+    elapsed = time.perf_counter() - started
+    latencies = sorted(latency for client, _ in results for latency in client)
+    return {
+        "clients": args.clients,
+        "seconds": elapsed,
+        "requests": len(latencies),
+        "errors": sum(errors for _, errors in results),
+        "requests_per_second": len(latencies) / elapsed,
+        "latency_ms": {
+            "p50": statistics.median(latencies) * 1000,
+            "p95": latencies[int(len(latencies) * 0.95)] * 1000,
+            "max": latencies[-1] * 1000,
+        },
+    }
+
+
+async def wait_until_up(host: str, port: int, timeout: float):
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            client = Client(host, port)
+            await client.request("GET", "/health")
+            client.close()
+            return
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP service load test")
+    parser.add_argument("--patients", type=int, default=10_000)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--storage", choices=STORAGE_BACKENDS, default="json")
+    parser.add_argument(
+        "--address",
+        metavar="HOST:PORT",
+        help="test an already running service (its data must match --patients)",
+    )
+    parser.add_argument("--output", metavar="FILE", help="also write the report here")
+    args = parser.parse_args()
+
+    dataset = Dataset.at_scale(args.patients)
+    server = None
+    with tempfile.TemporaryDirectory() as data_dir:
+        if args.address:
+            host, _, port = args.address.rpartition(":")
+        else:
+            host, port = "127.0.0.1", str(args.port)
+            write_dataset(data_dir, dataset)
+            server = subprocess.Popen(
+                [
+                    sys.executable,
+                    os.path.join(os.path.dirname(__file__), "..", "main.py"),
+                    "--serve",
+                    f"{host}:{port}",
+                    "--storage",
+                    args.storage,
+                    "--data-dir",
+                    data_dir,
+                ],
+                stdout=subprocess.DEVNULL,
+            )
+        try:
+            asyncio.run(wait_until_up(host, int(port), timeout=120))
+            report = asyncio.run(load_test(host, int(port), dataset, args))
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+
+    report["dataset"] = dataset.to_dict()
+    report["storage"] = args.storage
+    text = json.dumps(report, indent=4)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
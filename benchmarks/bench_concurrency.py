@@ -0,0 +1,182 @@
+# benchmarks/bench_concurrency.py
+# Stress test for sharing one HospitalManagement between threads. Worker
+# pools of growing size book appointments in parallel (every slot is
+# requested twice, from different workers) and run lookups in parallel;
+# the run checks that every ID is unique, that each slot was booked exactly
+# once and that everything reached storage, and reports throughput per pool
+# size. Run from the repository root:
+#   python -m benchmarks.bench_concurrency --threads 1 2 4 8
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from benchmarks.synthetic import DAY_START, DURATION, FIRST_DATE, SLOTS_PER_DAY
+from benchmarks.synthetic import Dataset, write_dataset
+from management.hospital_management import HospitalManagement
+from management.scheduling import SlotConflictError
+from models.fields import format_time
+from storage.backends import STORAGE_BACKENDS, create_storage
+from storage.write_behind import WriteBehindStorage
+
+
+def booking_requests(dataset: Dataset, count: int) -> list:
+    # `count` distinct (doctor, date, time) slots after the synthetic
+    # appointments, each listed twice in a row
+    requests = []
+    for index in range(count):
+        day, slot = divmod(index // dataset.doctors, SLOTS_PER_DAY)
+        request = (
+            f"D{index % dataset.doctors + 1}",
+            (FIRST_DATE + timedelta(days=dataset.days + day)).isoformat(),
+            format_time(DAY_START + slot * DURATION),
+        )
+        requests += [request, request]
+    return requests
+
+
+def book(hospital_mgmt: HospitalManagement, requests: list, seed: int):
+    rng = random.Random(seed)
+    patients = len(hospital_mgmt.patients)
+    ids, conflicts = [], 0
+    for doctor_id, date, start_time in requests:
+        try:
+            appointment = hospital_mgmt.book_appointment(
+                doctor_id,
+                f"P{rng.randint(1, patients)}",
+                date,
+                start_time=start_time,
+                duration=DURATION,
+            )
+        except SlotConflictError:
+            conflicts += 1
+        else:
+            ids.append(appointment.appointment_id)
+    return ids, conflicts
+
+
+def read(hospital_mgmt: HospitalManagement, count: int, seed: int) -> int:
+    rng = random.Random(seed)
+    doctors, patients = len(hospital_mgmt.doctors), len(hospital_mgmt.patients)
+    found = 0
+    for _ in range(count):
+        if hospital_mgmt.find_patient_by_id(f"P{rng.randint(1, patients)}"):
+            found += 1
+        found += len(
+            hospital_mgmt.query_appointments(
+                doctor_id=f"D{rng.randint(1, doctors)}", limit=20
+            )
+        )
+    return found
+
+
+def in_parallel(threads: int, work, shares: list) -> tuple:
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        start = time.perf_counter()
+        results = list(pool.map(work, shares, range(len(shares))))
+        return results, time.perf_counter() - start
+
+
+def run_pool(threads: int, data_dir: str, dataset: Dataset, args) -> dict:
+    storage = WriteBehindStorage(create_storage(args.storage, data_dir))
+    hospital_mgmt = HospitalManagement(storage)
+    try:
+        appointments = len(hospital_mgmt.appointments)
+
+        # Interleaved shares put the two requests for a slot on different
+        # workers whenever there is more than one
+        requests = booking_requests(dataset, args.bookings)
+        results, booking_seconds = in_parallel(
+            threads,
+            lambda share, seed: book(hospital_mgmt, share, seed),
+            [requests[worker::threads] for worker in range(threads)],
+        )
+        ids = [number for worker_ids, _ in results for number in worker_ids]
+        conflicts = sum(worker_conflicts for _, worker_conflicts in results)
+        # Keep the writer thread's snapshot out of the read timings
+        storage.flush()
+
+        _, read_seconds = in_parallel(
+            threads,
+            lambda count, seed: read(hospital_mgmt, count, seed),
+            [args.reads // threads] * threads,
+        )
+        expected = appointments + len(ids)
+        in_memory = len(hospital_mgmt.appointments)
+    finally:
+        storage.close()
+
+    reloaded = HospitalManagement(create_storage(args.storage, data_dir))
+    reloaded.storage.close()
+    return {
+        "threads": threads,
+        "bookings_per_second": len(requests) / booking_seconds,
+        "reads_per_second": args.reads / read_seconds,
+        "ids": ids,
+        "checks": {
+            "booked_each_slot_once": len(ids) == args.bookings
+            and conflicts == args.bookings,
+            "in_memory": in_memory == expected,
+            "persisted": len(reloaded.appointments) == expected,
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent HospitalManagement")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--patients", type=int, default=10_000)
+    parser.add_argument("--bookings", type=int, default=5_000)
+    parser.add_argument("--reads", type=int, default=50_000)
+    parser.add_argument("--storage", choices=STORAGE_BACKENDS, default="json")
+    parser.add_argument("--output", metavar="FILE", help="also write the report here")
+    args = parser.parse_args()
+
+    dataset = Dataset.at_scale(args.patients)
+    pools, seen, duplicates = [], set(), 0
+    for threads in args.threads:
+        # Every pool starts from the same data so their timings compare
+        with tempfile.TemporaryDirectory() as data_dir:
+            write_dataset(data_dir, dataset)
+            pool = run_pool(threads, data_dir, dataset, args)
+        # IDs keep increasing within a process, even across pools
+        for appointment_id in pool.pop("ids"):
+            duplicates += appointment_id in seen
+            seen.add(appointment_id)
+        pools.append(pool)
+
+    single = pools[0]
+    for pool in pools:
+        pool["booking_speedup"] = (
+            pool["bookings_per_second"] / single["bookings_per_second"]
+        )
+        pool["read_speedup"] = pool["reads_per_second"] / single["reads_per_second"]
+    # Without free threading, pure-Python work cannot scale past one core;
+    # the checks matter more than the speedups there
+    report = {
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "dataset": dataset.to_dict(),
+        "storage": args.storage,
+        "bookings": args.bookings,
+        "reads": args.reads,
+        "duplicate_ids": duplicates,
+        "pools": pools,
+    }
+    text = json.dumps(report, indent=4)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    if duplicates or not all(all(pool["checks"].values()) for pool in pools):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
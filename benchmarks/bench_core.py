@@ -0,0 +1,221 @@
+# benchmarks/bench_core.py
+# Times the HospitalManagement core on synthetic data at several scales and
+# reports JSON that can be stored and compared against later runs. Run from
+# the repository root:
+#   python -m benchmarks.bench_core --output baseline.json
+#   python -m benchmarks.bench_core --baseline baseline.json
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+from benchmarks.synthetic import FIRST_DATE, Dataset, write_dataset
+from management.hospital_management import HospitalManagement
+from storage.backends import STORAGE_BACKENDS, create_storage
+
+DEFAULT_SCALES = [1_000, 100_000, 1_000_000]
+
+
+def best_of(repeat: int, run) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def bench_scale(scale: int, args) -> dict:
+    kind = args.storage
+    dataset = Dataset.at_scale(scale, args.seed)
+    rng = random.Random(args.seed)
+    results = {"dataset": dataset.to_dict()}
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_dataset(data_dir, dataset)
+        # Non-JSON backends import the files on first use; keep that out of
+        # the timings
+        create_storage(kind, data_dir).close()
+
+        hospital_mgmt = None
+
+        def load():
+            nonlocal hospital_mgmt
+            if hospital_mgmt is not None:
+                hospital_mgmt.storage.close()
+            hospital_mgmt = HospitalManagement(create_storage(kind, data_dir))
+
+        results["load_data"] = {"seconds": best_of(args.repeat, load)}
+        results["save_data"] = {
+            "seconds": best_of(args.repeat, hospital_mgmt.save_data)
+        }
+
+        # Lookups: mostly hits with some misses, the same IDs every run
+        for name, prefix, count in (
+            ("find_doctor_by_id", "D", dataset.doctors),
+            ("find_patient_by_id", "P", dataset.patients),
+        ):
+            ids = [
+                f"{prefix}{rng.randint(1, count * 11 // 10)}"
+                for _ in range(args.lookups)
+            ]
+            find = getattr(hospital_mgmt, name)
+
+            def lookup():
+                for record_id in ids:
+                    find(record_id)
+
+            seconds = best_of(args.repeat, lookup)
+            results[name] = {
+                "ops": len(ids),
+                "seconds": seconds,
+                "per_op_us": seconds / len(ids) * 1e6,
+            }
+
+        # Bookings go to a day after the generated data so none conflict;
+        # deleting them again leaves the data set as it was
+        free_day = FIRST_DATE + timedelta(days=dataset.days)
+        booked = []
+
+        def book():
+            for index in range(args.writes):
+                booked.append(
+                    hospital_mgmt.book_appointment(
+                        f"D{index % dataset.doctors + 1}",
+                        f"P{rng.randint(1, dataset.patients)}",
+                        (free_day + timedelta(days=index)).isoformat(),
+                    )
+                )
+
+        def delete():
+            while booked:
+                hospital_mgmt.delete_appointment(booked.pop().appointment_id)
+
+        for name, run in (("book_appointment", book), ("delete_appointment", delete)):
+            start = time.perf_counter()
+            run()
+            seconds = time.perf_counter() - start
+            results[name] = {
+                "ops": args.writes,
+                "seconds": seconds,
+                "per_op_ms": seconds / args.writes * 1e3,
+            }
+        hospital_mgmt.storage.close()
+
+    return results
+
+
+def run_scale(scale: int, args) -> dict:
+    # A fresh interpreter per scale, so one scale's garbage and ID counters
+    # don't affect the next
+    command = [
+        sys.executable,
+        "-m",
+        "benchmarks.bench_core",
+        "--run-scale",
+        str(scale),
+        "--storage",
+        args.storage,
+        "--seed",
+        str(args.seed),
+        "--repeat",
+        str(args.repeat),
+        "--lookups",
+        str(args.lookups),
+        "--writes",
+        str(args.writes),
+    ]
+    return json.loads(subprocess.check_output(command))
+
+
+def headline(metric: dict) -> float:
+    # The number compared against a baseline
+    for key in ("per_op_us", "per_op_ms", "seconds"):
+        if key in metric:
+            return metric[key]
+    raise KeyError("metric has no timing")
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list:
+    rows = []
+    for scale, metrics in report["scales"].items():
+        previous = baseline.get("scales", {}).get(scale)
+        if previous is None:
+            continue
+        for name, metric in metrics.items():
+            if name == "dataset" or name not in previous:
+                continue
+            old, new = headline(previous[name]), headline(metric)
+            ratio = new / old if old else float("inf")
+            rows.append(
+                {
+                    "scale": int(scale),
+                    "metric": name,
+                    "baseline": old,
+                    "current": new,
+                    "ratio": round(ratio, 3),
+                    "regression": ratio > 1 + tolerance,
+                }
+            )
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HospitalManagement core timings")
+    parser.add_argument(
+        "--scales",
+        type=int,
+        nargs="+",
+        default=DEFAULT_SCALES,
+        help="patients per data set (default: 1k 100k 1M)",
+    )
+    parser.add_argument("--storage", choices=STORAGE_BACKENDS, default="json")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--lookups", type=int, default=100_000)
+    parser.add_argument("--writes", type=int, default=10)
+    parser.add_argument("--output", metavar="FILE", help="also write the report here")
+    parser.add_argument(
+        "--baseline", metavar="FILE", help="compare against an earlier report"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="slowdown counted as a regression (default: 0.2 = 20%%)",
+    )
+    parser.add_argument("--run-scale", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_scale:
+        print(json.dumps(bench_scale(args.run_scale, args)))
+        return
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "storage": args.storage,
+        "scales": {str(scale): run_scale(scale, args) for scale in args.scales},
+    }
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            report["comparison"] = compare(report, json.load(f), args.tolerance)
+        regressions = [row for row in report["comparison"] if row["regression"]]
+
+    text = json.dumps(report, indent=4)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+# benchmarks/bench_memory.py
+# Compares the resident size of the compact models against the previous
+# __dict__-backed layout. Run from the repository root:
+#   python -m benchmarks.bench_memory --count 1000000
+import argparse
+import gc
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+
+from models.appointment import Appointment
+from models.doctor import Doctor, Specialization
+from models.patient import Patient
+
+FIRST_NAMES = ["Anas", "Nada", "Omar", "Sara", "Youssef", "Mona", "Ali", "Laila"]
+HISTORIES = ["None", "Asthma", "Diabetes type 2", "Hypertension", "Allergies"]
+
+
+class LegacyPatient:
+    # The pre-compaction layout: per-instance __dict__, string ID
+    def __init__(self, name, age, medical_history, patient_id):
+        self._name = name
+        self._age = age
+        self.patient_id = patient_id
+        self.medical_history = medical_history
+
+
+class LegacyDoctor:
+    def __init__(self, name, age, specialization, password, id):
+        self._name = name
+        self._age = age
+        self.id = id
+        self.specialization = specialization
+        self.password = password
+
+
+class LegacyAppointment:
+    def __init__(self, doctor_id, patient_id, date, appointment_id):
+        self.appointment_id = appointment_id
+        self.doctor_id = doctor_id
+        self.patient_id = patient_id
+        self.date = date
+
+
+def fresh(value: str) -> str:
+    # A new string object, as json.load would produce for every field
+    return value.encode().decode()
+
+
+def generate_rows(count: int, seed: int = 42):
+    rng = random.Random(seed)
+    doctor_count = max(1, count // 100)
+    doctors = [
+        {
+            "id": f"D{i}",
+            "name": fresh(rng.choice(FIRST_NAMES)),
+            "age": rng.randint(28, 70),
+            "specialization": rng.choice(list(Specialization)).value,
+            "password": fresh("secret"),
+        }
+        for i in range(1, doctor_count + 1)
+    ]
+    patients = (
+        {
+            "patient_id": f"P{i}",
+            "name": fresh(rng.choice(FIRST_NAMES)),
+            "age": rng.randint(1, 99),
+            "medical_history": fresh(rng.choice(HISTORIES)),
+        }
+        for i in range(1, count + 1)
+    )
+    appointments = (
+        {
+            "appointment_id": f"A{i}",
+            "doctor_id": f"D{rng.randint(1, doctor_count)}",
+            "patient_id": f"P{rng.randint(1, count)}",
+            "date": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        }
+        for i in range(1, count + 1)
+    )
+    return doctors, patients, appointments
+
+
+def build_compact(doctors, patients, appointments):
+    return (
+        [Doctor.from_dict(row) for row in doctors],
+        [Patient.from_dict(row) for row in patients],
+        [Appointment.from_dict(row) for row in appointments],
+    )
+
+
+def build_legacy(doctors, patients, appointments):
+    return (
+        [
+            LegacyDoctor(
+                row["name"],
+                row["age"],
+                Specialization(row["specialization"]),
+                row["password"],
+                row["id"],
+            )
+            for row in doctors
+        ],
+        [
+            LegacyPatient(
+                row["name"], row["age"], row["medical_history"], row["patient_id"]
+            )
+            for row in patients
+        ],
+        [
+            LegacyAppointment(
+                row["doctor_id"], row["patient_id"], row["date"], row["appointment_id"]
+            )
+            for row in appointments
+        ],
+    )
+
+
+def resident_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # Peak instead of current RSS; kilobytes on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def measure(model: str, count: int) -> int:
+    builder = build_compact if model == "compact" else build_legacy
+    doctors, patients, appointments = generate_rows(count)
+    gc.collect()
+    before = resident_bytes()
+    result = builder(doctors, patients, appointments)
+    gc.collect()
+    after = resident_bytes()
+    del result
+    return after - before
+
+
+def measure_in_subprocess(model: str, count: int) -> int:
+    # Each layout gets a fresh interpreter so freed arenas don't skew RSS
+    output = subprocess.check_output(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.bench_memory",
+            "--model",
+            model,
+            "--count",
+            str(count),
+        ]
+    )
+    return int(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Memory footprint of the record models"
+    )
+    parser.add_argument(
+        "--count", type=int, default=1_000_000, help="patients and appointments"
+    )
+    parser.add_argument(
+        "--model", choices=("legacy", "compact"), help=argparse.SUPPRESS
+    )
+    args = parser.parse_args()
+
+    if args.model:
+        print(measure(args.model, args.count))
+        return
+
+    legacy = measure_in_subprocess("legacy", args.count)
+    compact = measure_in_subprocess("compact", args.count)
+    print(
+        json.dumps(
+            {
+                "records": args.count,
+                "legacy_rss_bytes": legacy,
+                "compact_rss_bytes": compact,
+                "reduction": round(1 - compact / legacy, 3),
+            },
+            indent=4,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
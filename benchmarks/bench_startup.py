@@ -0,0 +1,71 @@
+# benchmarks/bench_startup.py
+# Cold-start comparison of the JSON files and the memory-mapped binary
+# snapshot. Run from the repository root:
+#   python -m benchmarks.bench_startup --patients 500000
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks import synthetic
+from benchmarks.synthetic import Dataset
+from management.hospital_management import HospitalManagement
+from storage.backends import copy_storage, create_storage
+from storage.binary_storage import BinaryStorage
+
+
+def write_dataset(data_dir: str, patients: int, seed: int = 7):
+    dataset = Dataset(patients // 100, patients, patients * 2, seed)
+    copy_storage(synthetic.write_dataset(data_dir, dataset), BinaryStorage(data_dir))
+
+
+def time_load(kind: str, data_dir: str) -> float:
+    start = time.perf_counter()
+    HospitalManagement(create_storage(kind, data_dir))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON vs binary snapshot startup")
+    parser.add_argument("--patients", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--time", nargs=2, metavar=("KIND", "DIR"), help=argparse.SUPPRESS
+    )
+    args = parser.parse_args()
+
+    if args.time:
+        print(time_load(*args.time))
+        return
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_dataset(data_dir, args.patients)
+        results = {"patients": args.patients, "appointments": args.patients * 2}
+        for kind in ("json", "binary"):
+            # Fresh interpreter per run so nothing is warm but the page cache
+            runs = [
+                float(
+                    subprocess.check_output(
+                        [
+                            sys.executable,
+                            "-m",
+                            "benchmarks.bench_startup",
+                            "--time",
+                            kind,
+                            data_dir,
+                        ]
+                    )
+                )
+                for _ in range(args.repeat)
+            ]
+            results[f"{kind}_load_seconds"] = round(min(runs), 3)
+        results["speedup"] = round(
+            results["json_load_seconds"] / results["binary_load_seconds"], 2
+        )
+        print(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
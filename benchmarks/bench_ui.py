@@ -0,0 +1,274 @@
+# benchmarks/bench_ui.py
+# Times MainWindow on synthetic data under Qt's offscreen platform, so it
+# runs without a display. Run from the repository root:
+#   python -m benchmarks.bench_ui --output ui-baseline.json
+#   python -m benchmarks.bench_ui --baseline ui-baseline.json
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QEvent, QObject
+from PySide6.QtWidgets import QApplication
+
+from benchmarks.bench_core import compare
+from benchmarks.synthetic import Dataset, write_dataset
+from management.hospital_management import HospitalManagement
+from storage.json_storage import JsonStorage
+from ui.loading import DataLoader
+from ui.main_window import APPOINTMENT_WINDOWS, EditAppointmentDialog, MainWindow
+
+DEFAULT_SCALES = [1_000, 100_000]
+PAINT_TIMEOUT = 30.0  # seconds to wait for a paint before giving up
+
+
+class PaintProbe(QObject):
+    # Application-wide event filter that notes when a given widget paints
+    def __init__(self):
+        super().__init__()
+        self.target = None
+        self.painted = False
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint and self.target is not None:
+            if obj is self.target():
+                self.painted = True
+        return False
+
+
+def time_until_painted(app: QApplication, probe: PaintProbe, run, target) -> float:
+    # Seconds from calling run() until target() (a widget, looked up after
+    # run() so it may be created by it) has received a paint event
+    probe.target = target
+    probe.painted = False
+    start = time.perf_counter()
+    run()
+    while not probe.painted:
+        app.processEvents()
+        if time.perf_counter() - start > PAINT_TIMEOUT:
+            raise TimeoutError("widget was never painted")
+    elapsed = time.perf_counter() - start
+    probe.target = None
+    return elapsed
+
+
+def summary(samples: list) -> dict:
+    return {
+        "runs": len(samples),
+        "seconds": statistics.median(samples),
+        "max_seconds": max(samples),
+    }
+
+
+def bench_background_load(app: QApplication, probe: PaintProbe, data_dir: str) -> dict:
+    # The startup path of main.py: the window opens empty and the data
+    # loads behind it. first_interactive should not grow with the data.
+    hospital_mgmt = HospitalManagement(JsonStorage(data_dir), autoload=False)
+    window = None
+
+    def open_window():
+        nonlocal window
+        window = MainWindow(hospital_mgmt, loading=True)
+        window.show()
+
+    first_interactive = time_until_painted(
+        app, probe, open_window, lambda: window.patient_table.viewport()
+    )
+
+    loader = DataLoader(hospital_mgmt)
+    loader.progress.connect(window.on_load_progress)
+    loader.finished.connect(window.on_load_finished)
+    finished = []
+    loader.finished.connect(finished.append)
+    start = time.perf_counter()
+    loader.start()
+    while not finished:
+        app.processEvents()
+        time.sleep(0.005)
+    background_load = time.perf_counter() - start
+
+    window.close()
+    hospital_mgmt.storage.close()
+    return {
+        "first_interactive": {"seconds": first_interactive},
+        "background_load": {"seconds": background_load},
+    }
+
+
+def bench_scale(scale: int, args) -> dict:
+    app = QApplication.instance() or QApplication([])
+    probe = PaintProbe()
+    app.installEventFilter(probe)
+    dataset = Dataset.at_scale(scale, args.seed)
+    results = {"dataset": dataset.to_dict()}
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_dataset(data_dir, dataset)
+        results.update(bench_background_load(app, probe, data_dir))
+
+        start = time.perf_counter()
+        hospital_mgmt = HospitalManagement(JsonStorage(data_dir))
+        results["load_data"] = {"seconds": time.perf_counter() - start}
+
+        # Time to first paint: building the window until its first tab's
+        # table has been drawn
+        window = None
+
+        def open_window():
+            nonlocal window
+            window = MainWindow(hospital_mgmt)
+            window.show()
+
+        results["first_paint"] = {
+            "seconds": time_until_painted(
+                app, probe, open_window, lambda: window.patient_table.viewport()
+            )
+        }
+        # Tables are looked up on use: only the first tab exists until the
+        # others are opened
+        tables = [
+            lambda: window.patient_table,
+            lambda: window.doctor_table,
+            lambda: window.appointment_table,
+        ]
+        # Opening a tab for the first time builds it and loads its data
+        for name, index in (
+            ("doctor_tab_first_open", 1),
+            ("appointment_tab_first_open", 2),
+        ):
+            results[name] = {
+                "seconds": time_until_painted(
+                    app,
+                    probe,
+                    lambda: window.tabs.setCurrentIndex(index),
+                    lambda: tables[index]().viewport(),
+                )
+            }
+
+        # Page through every appointment, not only the coming week
+        window.appointment_window_combo.setCurrentIndex(
+            [label for label, _, _ in APPOINTMENT_WINDOWS].index("All")
+        )
+
+        switches = []
+        for _ in range(args.repeat):
+            for index in (1, 2, 0):
+                switches.append(
+                    time_until_painted(
+                        app,
+                        probe,
+                        lambda: window.tabs.setCurrentIndex(index),
+                        lambda: tables[index]().viewport(),
+                    )
+                )
+        results["tab_switch"] = summary(switches)
+
+        for name, index, refresh in (
+            ("load_patients", 0, window.load_patients),
+            ("load_doctors", 1, window.load_doctors),
+            ("load_appointments", 2, window.load_appointments),
+        ):
+            window.tabs.setCurrentIndex(index)
+            app.processEvents()
+            results[name] = summary(
+                [
+                    time_until_painted(
+                        app, probe, refresh, lambda: tables[index]().viewport()
+                    )
+                    for _ in range(args.repeat)
+                ]
+            )
+
+        appointment = next(iter(hospital_mgmt.appointments))
+        dialogs = []
+
+        def open_dialog():
+            dialogs.append(EditAppointmentDialog(appointment, hospital_mgmt))
+            dialogs[-1].show()
+
+        samples = []
+        for _ in range(args.repeat):
+            samples.append(
+                time_until_painted(app, probe, open_dialog, lambda: dialogs[-1])
+            )
+            dialogs.pop().close()
+        results["edit_dialog_open"] = summary(samples)
+
+        window.close()
+        hospital_mgmt.storage.close()
+    return results
+
+
+def run_scale(scale: int, args) -> dict:
+    command = [
+        sys.executable,
+        "-m",
+        "benchmarks.bench_ui",
+        "--run-scale",
+        str(scale),
+        "--seed",
+        str(args.seed),
+        "--repeat",
+        str(args.repeat),
+    ]
+    return json.loads(subprocess.check_output(command))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MainWindow timings (offscreen)")
+    parser.add_argument(
+        "--scales",
+        type=int,
+        nargs="+",
+        default=DEFAULT_SCALES,
+        help="patients per data set (default: 1k 100k)",
+    )
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", metavar="FILE", help="also write the report here")
+    parser.add_argument(
+        "--baseline", metavar="FILE", help="compare against an earlier report"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="slowdown counted as a regression (default: 0.2 = 20%%)",
+    )
+    parser.add_argument("--run-scale", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_scale:
+        print(json.dumps(bench_scale(args.run_scale, args)))
+        return
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "qt_platform": os.environ["QT_QPA_PLATFORM"],
+        "scales": {str(scale): run_scale(scale, args) for scale in args.scales},
+    }
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            report["comparison"] = compare(report, json.load(f), args.tolerance)
+        regressions = [row for row in report["comparison"] if row["regression"]]
+
+    text = json.dumps(report, indent=4)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# benchmarks/synthetic.py
+# Deterministic synthetic hospital data: the same arguments always produce
+# the same records, so benchmark runs on different commits are comparable.
+import random
+from datetime import date, timedelta
+from typing import Dict, Iterator
+
+from models.doctor import Specialization
+from models.fields import format_time
+from storage.base import Storage
+from storage.json_storage import JsonStorage
+
+FIRST_NAMES = ["Anas", "Nada", "Omar", "Sara", "Youssef", "Mona", "Ali", "Laila"]
+LAST_NAMES = ["Hassan", "Ibrahim", "Mahmoud", "Saleh", "Fathy", "Naguib", "Adel"]
+HISTORIES = ["None", "Asthma", "Diabetes type 2", "Hypertension", "Allergies"]
+
+FIRST_DATE = date(2024, 1, 1)
+DAY_START = 8 * 60  # first appointment of the day, in minutes
+DURATION = 30
+SLOTS_PER_DAY = 16  # 08:00 to 16:00
+
+
+class Dataset:
+    def __init__(self, doctors: int, patients: int, appointments: int, seed: int = 7):
+        self.doctors = max(1, doctors)
+        self.patients = max(1, patients)
+        self.appointments = appointments
+        self.seed = seed
+
+    @classmethod
+    def at_scale(cls, scale: int, seed: int = 7) -> "Dataset":
+        # One doctor per hundred patients and one appointment per patient
+        return cls(scale // 100, scale, scale, seed)
+
+    @property
+    def days(self) -> int:
+        # Days covered by the generated appointments
+        per_day = self.doctors * SLOTS_PER_DAY
+        return -(-self.appointments // per_day)
+
+    def to_dict(self) -> dict:
+        return {
+            "doctors": self.doctors,
+            "patients": self.patients,
+            "appointments": self.appointments,
+            "seed": self.seed,
+        }
+
+    def records(self) -> Dict[str, Iterator[dict]]:
+        return {
+            "doctors": self.doctor_records(),
+            "patients": self.patient_records(),
+            "appointments": self.appointment_records(),
+        }
+
+    def doctor_records(self) -> Iterator[dict]:
+        rng = random.Random(f"{self.seed}-doctors")
+        specializations = list(Specialization)
+        for number in range(1, self.doctors + 1):
+            yield {
+                "id": f"D{number}",
+                "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                "age": rng.randint(28, 70),
+                "specialization": rng.choice(specializations).value,
+                "password": "secret",
+            }
+
+    def patient_records(self) -> Iterator[dict]:
+        rng = random.Random(f"{self.seed}-patients")
+        for number in range(1, self.patients + 1):
+            yield {
+                "patient_id": f"P{number}",
+                "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                "age": rng.randint(1, 99),
+                "medical_history": rng.choice(HISTORIES),
+            }
+
+    def appointment_records(self) -> Iterator[dict]:
+        # Appointments fill each doctor's day slot by slot, so the data
+        # never contains double bookings
+        rng = random.Random(f"{self.seed}-appointments")
+        for index in range(self.appointments):
+            doctor = index % self.doctors + 1
+            day, slot = divmod(index // self.doctors, SLOTS_PER_DAY)
+            yield {
+                "appointment_id": f"A{index + 1}",
+                "doctor_id": f"D{doctor}",
+                "patient_id": f"P{rng.randint(1, self.patients)}",
+                "date": (FIRST_DATE + timedelta(days=day)).isoformat(),
+                "start_time": format_time(DAY_START + slot * DURATION),
+                "duration": DURATION,
+            }
+
+    def write(self, storage: Storage):
+        for collection, records in self.records().items():
+            storage.save(collection, records)
+
+
+def write_dataset(data_dir: str, dataset: Dataset) -> JsonStorage:
+    storage = JsonStorage(data_dir)
+    dataset.write(storage)
+    return storage
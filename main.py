@@ -1,18 +1,218 @@
 # main.py
+import argparse
+import json
+import os
 import sys
+from contextlib import nullcontext
 
-from PySide6.QtWidgets import QApplication
-
+from management.bulk_import import IMPORT_FORMATS, import_file
 from management.hospital_management import HospitalManagement
-from ui.main_window import MainWindow
+from management.startup import StartupTimer
+from storage.backends import STORAGE_BACKENDS, copy_storage, create_storage
+from storage.json_storage import JsonStorage
+
+IMPORT_KINDS = ("doctors", "patients", "appointments")
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Hospital Management System")
+    parser.add_argument(
+        "--storage",
+        choices=STORAGE_BACKENDS,
+        default="json",
+        help="persistence backend (default: json)",
+    )
+    parser.add_argument(
+        "--data-dir", default=".", help="directory holding the data files"
+    )
+    parser.add_argument(
+        "--export-json",
+        metavar="DIR",
+        help="write the selected backend's data as JSON files to DIR and exit",
+    )
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        default=os.environ.get("HOSPITAL_METRICS") == "1",
+        help="record operation timings, shown in the Diagnostics tab "
+        "(Ctrl+Shift+D); also enabled by HOSPITAL_METRICS=1",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="DIR",
+        default=os.environ.get("HOSPITAL_PROFILE"),
+        help="run under cProfile and tracemalloc and write per-phase reports "
+        "to DIR on exit; also enabled by HOSPITAL_PROFILE=DIR",
+    )
+    parser.add_argument(
+        "--startup-report",
+        metavar="FILE",
+        default=os.environ.get("HOSPITAL_STARTUP_REPORT"),
+        help="write how long each startup step took as JSON to FILE once the "
+        "data is loaded; also enabled by HOSPITAL_STARTUP_REPORT=FILE",
+    )
+    parser.add_argument(
+        "--serve",
+        metavar="[HOST:]PORT",
+        help="run headless as an HTTP/JSON service instead of opening a window",
+    )
+    parser.add_argument(
+        "--import",
+        dest="imports",
+        nargs=2,
+        action="append",
+        metavar=("KIND", "FILE"),
+        help="bulk import doctors, patients or appointments from a CSV or "
+        "JSONL file and exit; may be repeated, files are imported in order",
+    )
+    parser.add_argument(
+        "--import-format",
+        choices=IMPORT_FORMATS,
+        help="format of the import files (default: from the file extension)",
+    )
+    # Unknown arguments are left for Qt (e.g. -platform, -style)
+    return parser.parse_known_args(argv[1:])
+
+
+def run_import(args) -> int:
+    for kind, _ in args.imports:
+        if kind not in IMPORT_KINDS:
+            kinds = ", ".join(IMPORT_KINDS)
+            print(f"Unknown import kind {kind!r}: use one of {kinds}")
+            return 2
+    storage = create_storage(args.storage, args.data_dir)
+    try:
+        hospital_mgmt = HospitalManagement(storage)
+        reports = [
+            import_file(hospital_mgmt, kind, path, args.import_format).to_dict()
+            for kind, path in args.imports
+        ]
+    finally:
+        storage.close()
+    print(json.dumps(reports, indent=4))
+    return 1 if any(report["rejected"] for report in reports) else 0
+
+
+def run_service(args) -> int:
+    from api.server import run_server
+    from storage.write_behind import WriteBehindStorage
+
+    host, _, port = args.serve.rpartition(":")
+    if not port.isdigit():
+        print(f"Invalid --serve address {args.serve!r}: expected [HOST:]PORT")
+        return 2
+    # Writes from many clients are coalesced by the background writer
+    storage = WriteBehindStorage(create_storage(args.storage, args.data_dir))
+    try:
+        # Build the search indexes before taking requests, not on the
+        # first search
+        hospital_mgmt = HospitalManagement(storage, autoload=False)
+        hospital_mgmt.load_data(build_indexes=True)
+        if args.metrics:
+            hospital_mgmt.enable_metrics()
+        run_server(hospital_mgmt, host or "127.0.0.1", int(port))
+    finally:
+        storage.close()
+    return 0
+
+
+def run_gui(args, qt_args, timer: StartupTimer):
+    profiler = None
+    if args.profile:
+        # cProfile, pstats and tracemalloc are only imported when profiling
+        from management.profiling import Profiler
+
+        profiler = Profiler(args.profile)
+
+    report_written = False
+
+    def write_startup_report():
+        nonlocal report_written
+        if args.startup_report and not report_written:
+            timer.write(args.startup_report)
+            report_written = True
+
+    def phase(name: str):
+        if profiler is None:
+            return nullcontext()
+        return profiler.phase(name, snapshot=True)
+
+    try:
+        with phase("startup"):
+            # Qt is only needed for the window; imports and exports run headless
+            from PySide6.QtWidgets import QApplication
+
+            from storage.write_behind import WriteBehindStorage
+            from ui.loading import DataLoader
+            from ui.main_window import MainWindow
+
+            timer.mark("imports")
+            argv = sys.argv[:1] + qt_args
+            if profiler is None:
+                app = QApplication(argv)
+            else:
+                from ui.profiling import ProfilingApplication
+
+                app = ProfilingApplication(argv, profiler)
+            timer.mark("application")
+            # Saves happen on a background thread; closing flushes anything
+            # pending
+            storage = WriteBehindStorage(create_storage(args.storage, args.data_dir))
+            hospital_mgmt = HospitalManagement(storage, autoload=False)
+            if args.metrics:
+                hospital_mgmt.enable_metrics()
+            timer.mark("storage")
+
+        with phase("first_paint"):
+            # Only the tab shown first is built here
+            window = MainWindow(hospital_mgmt, loading=True)
+            timer.mark("window")
+            window.show()
+            app.processEvents()
+            timer.mark("first_paint")
+
+        # The window is usable right away; the data streams in behind it
+        loader = DataLoader(hospital_mgmt, lambda: phase("load_data"))
+        loader.progress.connect(window.on_load_progress)
+        loader.finished.connect(window.on_load_finished)
+        loader.failed.connect(window.on_load_failed)
+        if hospital_mgmt.metrics is not None:
+            loader.finished.connect(
+                lambda seconds: hospital_mgmt.metrics.observe("load_data", seconds)
+            )
+        loader.finished.connect(lambda _: timer.mark("data_loaded"))
+        loader.finished.connect(lambda _: write_startup_report())
+        # Stop loading before the storage closes under it
+        app.aboutToQuit.connect(loader.stop)
+        app.aboutToQuit.connect(storage.close)
+        loader.start()
+
+        return app.exec()
+    finally:
+        # With whatever was reached, if the data never finished loading
+        write_startup_report()
+        if profiler is not None:
+            profiler.write_reports()
+            profiler.stop()
+            print(f"Profile written to {profiler.output_dir}", file=sys.stderr)
 
 
 def main():
-    app = QApplication(sys.argv)
-    hospital_mgmt = HospitalManagement()
-    window = MainWindow(hospital_mgmt)
-    window.show()
-    sys.exit(app.exec())
+    timer = StartupTimer()
+    args, qt_args = parse_args(sys.argv)
+    if args.export_json:
+        os.makedirs(args.export_json, exist_ok=True)
+        storage = create_storage(args.storage, args.data_dir)
+        copy_storage(storage, JsonStorage(args.export_json))
+        storage.close()
+        return
+    if args.imports:
+        sys.exit(run_import(args))
+    if args.serve:
+        sys.exit(run_service(args))
+
+    timer.mark("arguments")
+    sys.exit(run_gui(args, qt_args, timer))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,231 @@
+# management/bulk_import.py
+import csv
+import json
+from typing import IO, Callable, Iterator, List, Set, Tuple
+
+from management.hospital_management import HospitalManagement
+from management.scheduling import DoctorSchedule, validate_slot
+from models.appointment import ID_PREFIX as APPOINTMENT_PREFIX
+from models.appointment import DEFAULT_DURATION, DEFAULT_START_TIME, Appointment
+from models.doctor import ID_PREFIX as DOCTOR_PREFIX
+from models.doctor import Doctor, Specialization
+from models.fields import format_date, parse_date, parse_id, parse_time, try_parse_id
+from models.patient import ID_PREFIX as PATIENT_PREFIX
+from models.patient import Patient
+from models.sequence import IdSequence
+
+IMPORT_FORMATS = ("csv", "jsonl")
+BATCH_SIZE = 5000
+
+
+class ImportReport:
+    def __init__(self, collection: str):
+        self.collection = collection
+        self.accepted = 0
+        self.rejected: List[Tuple[int, str]] = []  # (line number, reason)
+
+    def to_dict(self) -> dict:
+        return {
+            "collection": self.collection,
+            "accepted": self.accepted,
+            "rejected": len(self.rejected),
+            "rejected_rows": [
+                {"line": line, "reason": reason} for line, reason in self.rejected
+            ],
+        }
+
+
+def detect_format(path: str) -> str:
+    return "jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv"
+
+
+def read_rows(stream: IO[str], fmt: str) -> Iterator[Tuple[int, dict]]:
+    # (line number, row) pairs; a row that cannot be parsed comes through as
+    # None so it can be reported instead of aborting the import
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+    elif fmt == "jsonl":
+        for line_number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield line_number, row if isinstance(row, dict) else None
+    else:
+        raise ValueError(f"Unknown import format: {fmt}")
+
+
+def _required(row: dict, field: str) -> str:
+    value = row.get(field)
+    if value is None or str(value).strip() == "":
+        raise ValueError(f"missing {field}")
+    return str(value).strip()
+
+
+def _age(row: dict) -> int:
+    try:
+        age = int(_required(row, "age"))
+    except ValueError as e:
+        raise ValueError(str(e) if "missing" in str(e) else "age is not a number")
+    if age <= 0:
+        raise ValueError("age must be positive")
+    return age
+
+
+class BulkImporter:
+    # Validates rows in batches, checks references against in-memory ID sets
+    # and adds the accepted rows with HospitalManagement.bulk_insert. All
+    # accepted rows are persisted once, when the import finishes.
+    def __init__(self, hospital_mgmt: HospitalManagement, batch_size: int = BATCH_SIZE):
+        self.hospital_mgmt = hospital_mgmt
+        self.batch_size = batch_size
+
+    # Each row passes every check before its record is built, and only then
+    # takes a new ID, so rejected rows leave no gaps in the ID sequences
+    def import_doctors(self, stream: IO[str], fmt: str = "csv") -> ImportReport:
+        known = {doctor.number for doctor in self.hospital_mgmt.doctors}
+
+        def build(row: dict) -> Doctor:
+            name = _required(row, "name")
+            age = _age(row)
+            try:
+                specialization = Specialization(_required(row, "specialization"))
+            except ValueError:
+                raise ValueError(
+                    f"unknown specialization {row.get('specialization')!r}"
+                )
+            password = _required(row, "password")
+            number = self._claim(
+                known, row.get("id"), DOCTOR_PREFIX, Doctor.id_sequence
+            )
+            return Doctor.from_fields(number, name, age, specialization, password)
+
+        return self._run("doctors", stream, fmt, build)
+
+    def import_patients(self, stream: IO[str], fmt: str = "csv") -> ImportReport:
+        known = {patient.number for patient in self.hospital_mgmt.patients}
+
+        def build(row: dict) -> Patient:
+            name = _required(row, "name")
+            age = _age(row)
+            medical_history = str(row.get("medical_history") or "").strip()
+            number = self._claim(
+                known, row.get("patient_id"), PATIENT_PREFIX, Patient.id_sequence
+            )
+            return Patient.from_fields(number, name, age, medical_history)
+
+        return self._run("patients", stream, fmt, build)
+
+    def import_appointments(self, stream: IO[str], fmt: str = "csv") -> ImportReport:
+        hospital_mgmt = self.hospital_mgmt
+        known = {appointment.number for appointment in hospital_mgmt.appointments}
+        doctors = {doctor.number for doctor in hospital_mgmt.doctors}
+        patients = {patient.number for patient in hospital_mgmt.patients}
+        # Bookings accepted by this import, so rows conflicting with each
+        # other are caught before they reach the hospital schedule
+        pending = DoctorSchedule()
+
+        def build(row: dict) -> Appointment:
+            start_time = str(row.get("start_time") or DEFAULT_START_TIME).strip()
+            try:
+                duration = int(row.get("duration") or DEFAULT_DURATION)
+                date_ordinal = parse_date(_required(row, "date"))
+                start_minute = parse_time(start_time)
+            except ValueError as e:
+                raise ValueError(str(e) if "missing" in str(e) else "bad date or time")
+            validate_slot(start_minute, duration)
+
+            doctor_id = _required(row, "doctor_id")
+            doctor_number = try_parse_id(DOCTOR_PREFIX, doctor_id)
+            if doctor_number not in doctors:
+                raise ValueError(f"unknown doctor {doctor_id}")
+            patient_id = _required(row, "patient_id")
+            patient_number = try_parse_id(PATIENT_PREFIX, patient_id)
+            if patient_number not in patients:
+                raise ValueError(f"unknown patient {patient_id}")
+            for schedule in (hospital_mgmt.schedule, pending):
+                if not schedule.is_free(
+                    doctor_number, date_ordinal, start_minute, duration
+                ):
+                    raise ValueError(
+                        f"{doctor_id} is already booked at {start_time} "
+                        f"on {format_date(date_ordinal)}"
+                    )
+            number = self._claim(
+                known,
+                row.get("appointment_id"),
+                APPOINTMENT_PREFIX,
+                Appointment.id_sequence,
+            )
+            appointment = Appointment.from_fields(
+                number,
+                doctor_number,
+                patient_number,
+                date_ordinal,
+                start_minute,
+                duration,
+            )
+            pending.add(appointment)
+            return appointment
+
+        return self._run("appointments", stream, fmt, build)
+
+    def _claim(
+        self, known: Set[int], given_id, prefix: str, sequence: IdSequence
+    ) -> int:
+        # The row's own ID if it has one, otherwise the next from `sequence`
+        given_id = str(given_id or "").strip()
+        if not given_id:
+            number = sequence.next()
+        else:
+            number = parse_id(prefix, given_id)
+            if number in known:
+                raise ValueError(f"duplicate ID {given_id}")
+        known.add(number)
+        return number
+
+    def _run(
+        self,
+        collection: str,
+        stream: IO[str],
+        fmt: str,
+        build: Callable[[dict], object],
+    ) -> ImportReport:
+        report = ImportReport(collection)
+        batch = []
+        with self.hospital_mgmt.batch():
+            for line_number, row in read_rows(stream, fmt):
+                if row is None:
+                    report.rejected.append((line_number, "unreadable row"))
+                    continue
+                try:
+                    batch.append(build(row))
+                except ValueError as e:
+                    report.rejected.append((line_number, str(e)))
+                    continue
+                if len(batch) >= self.batch_size:
+                    self._commit(collection, batch, report)
+                    batch = []
+            self._commit(collection, batch, report)
+        return report
+
+    def _commit(self, collection: str, batch: list, report: ImportReport):
+        self.hospital_mgmt.bulk_insert(collection, batch)
+        report.accepted += len(batch)
+
+
+def import_file(
+    hospital_mgmt: HospitalManagement, collection: str, path: str, fmt: str = None
+) -> ImportReport:
+    importer = BulkImporter(hospital_mgmt)
+    handler = {
+        "doctors": importer.import_doctors,
+        "patients": importer.import_patients,
+        "appointments": importer.import_appointments,
+    }[collection]
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        return handler(f, fmt or detect_format(path))
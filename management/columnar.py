@@ -0,0 +1,180 @@
+# management/columnar.py
+from typing import Dict, List, Optional, Tuple
+
+from management.events import ChangeEvent, ChangeType
+from models.doctor import ID_PREFIX as DOCTOR_PREFIX
+from models.doctor import Doctor, Specialization
+from models.fields import format_date, format_id, parse_date
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; only analytics need it
+    np = None
+
+SPECIALIZATIONS = list(Specialization)
+_SPEC_CODES = {spec: code for code, spec in enumerate(SPECIALIZATIONS)}
+_NO_SPEC = -1
+
+
+class AppointmentColumns:
+    # Columnar mirror of HospitalManagement.appointments: one NumPy array per
+    # field, kept in step through change events, so analytics are vectorized
+    # instead of Python loops over the objects. Deleted rows are tombstoned
+    # in `live` and squeezed out once they make up half of the arrays.
+    def __init__(self, hospital_mgmt, capacity: int = 1024):
+        if np is None:
+            raise ImportError("numpy is required for the columnar appointment store")
+        self.hospital_mgmt = hospital_mgmt
+        self._capacity = capacity
+        self.rebuild()
+        hospital_mgmt.subscribe(self.on_change)
+
+    def rebuild(self):
+        # Copies every doctor and appointment afresh; needed after records
+        # were added without change events, i.e. by a load
+        hospital_mgmt = self.hospital_mgmt
+        self._size = 0
+        self._dead = 0
+        self._row_of: Dict[int, int] = {}
+        self._allocate(max(self._capacity, len(hospital_mgmt.appointments)))
+
+        # Specialization code per doctor number, for histograms
+        self._doctor_spec = np.full(1, _NO_SPEC, dtype=np.int8)
+        for doctor in hospital_mgmt.doctors:
+            self._set_doctor(doctor)
+        for appointment in hospital_mgmt.appointments:
+            self._append(appointment)
+
+    def __len__(self) -> int:
+        return self._size - self._dead
+
+    # Maintenance
+    def on_change(self, event: ChangeEvent):
+        if event.collection == "doctors":
+            for doctor in event.records:
+                self._set_doctor(doctor)
+        elif event.collection == "appointments":
+            for appointment in event.records:
+                if event.change_type == ChangeType.INSERTED:
+                    self._append(appointment)
+                elif event.change_type == ChangeType.UPDATED:
+                    self._write(self._row_of[appointment.number], appointment)
+                else:
+                    self._remove(appointment.number)
+
+    def _allocate(self, capacity: int):
+        self.number = np.zeros(capacity, dtype=np.int64)
+        self.doctor = np.zeros(capacity, dtype=np.int32)
+        self.patient = np.zeros(capacity, dtype=np.int32)
+        self.date = np.zeros(capacity, dtype=np.int32)
+        self.live = np.zeros(capacity, dtype=bool)
+
+    def _grow(self):
+        old = (self.number, self.doctor, self.patient, self.date, self.live)
+        self._allocate(len(self.number) * 2)
+        for new_array, old_array in zip(
+            (self.number, self.doctor, self.patient, self.date, self.live), old
+        ):
+            new_array[: self._size] = old_array[: self._size]
+
+    def _append(self, appointment):
+        if self._size == len(self.number):
+            self._grow()
+        row = self._size
+        self._size += 1
+        self._row_of[appointment.number] = row
+        self._write(row, appointment)
+
+    def _write(self, row: int, appointment):
+        self._reserve_doctor(appointment.doctor_number)
+        self.number[row] = appointment.number
+        self.doctor[row] = appointment.doctor_number
+        self.patient[row] = appointment.patient_number
+        self.date[row] = appointment.date_ordinal
+        self.live[row] = True
+
+    def _remove(self, number: int):
+        row = self._row_of.pop(number, None)
+        if row is None:
+            return
+        self.live[row] = False
+        self._dead += 1
+        if self._dead * 2 > self._size:
+            self._compact()
+
+    def _compact(self):
+        keep = np.flatnonzero(self.live[: self._size])
+        for array in (self.number, self.doctor, self.patient, self.date, self.live):
+            array[: len(keep)] = array[keep]
+        self.live[len(keep) : self._size] = False
+        self._size = len(keep)
+        self._dead = 0
+        self._row_of = {
+            int(number): row for row, number in enumerate(self.number[: self._size])
+        }
+
+    def _set_doctor(self, doctor: Doctor):
+        self._reserve_doctor(doctor.number)
+        self._doctor_spec[doctor.number] = _SPEC_CODES[doctor.specialization]
+
+    def _reserve_doctor(self, number: int):
+        if number < len(self._doctor_spec):
+            return
+        grown = np.full(
+            max(number + 1, len(self._doctor_spec) * 2), _NO_SPEC, dtype=np.int8
+        )
+        grown[: len(self._doctor_spec)] = self._doctor_spec
+        self._doctor_spec = grown
+
+    # Queries
+    def date_mask(
+        self, start: Optional[str] = None, end: Optional[str] = None
+    ) -> "np.ndarray":
+        # Boolean mask over the live rows with start <= date <= end (inclusive)
+        mask = self.live[: self._size].copy()
+        dates = self.date[: self._size]
+        if start is not None:
+            mask &= dates >= parse_date(start)
+        if end is not None:
+            mask &= dates <= parse_date(end)
+        return mask
+
+    def counts_by_doctor(
+        self, start: Optional[str] = None, end: Optional[str] = None
+    ) -> Dict[str, int]:
+        mask = self.date_mask(start, end)
+        counts = np.bincount(self.doctor[: self._size][mask])
+        return {
+            format_id(DOCTOR_PREFIX, int(number)): int(counts[number])
+            for number in np.flatnonzero(counts)
+        }
+
+    def counts_by_doctor_per_day(
+        self, start: str, end: str
+    ) -> Tuple[List[str], List[str], "np.ndarray"]:
+        # Returns (doctor IDs, dates, counts[doctor, day]) over [start, end]
+        first = parse_date(start)
+        days = parse_date(end) - first + 1
+        mask = self.date_mask(start, end)
+        doctors = self.doctor[: self._size][mask]
+        day_offsets = self.date[: self._size][mask] - first
+
+        doctor_numbers, doctor_rows = np.unique(doctors, return_inverse=True)
+        counts = np.zeros((len(doctor_numbers), days), dtype=np.int64)
+        np.add.at(counts, (doctor_rows, day_offsets), 1)
+
+        doctor_ids = [
+            format_id(DOCTOR_PREFIX, int(number)) for number in doctor_numbers
+        ]
+        dates = [format_date(first + offset) for offset in range(days)]
+        return doctor_ids, dates, counts
+
+    def specialization_histogram(
+        self, start: Optional[str] = None, end: Optional[str] = None
+    ) -> Dict[str, int]:
+        mask = self.date_mask(start, end)
+        codes = self._doctor_spec[self.doctor[: self._size][mask]]
+        counts = np.bincount(codes[codes != _NO_SPEC], minlength=len(SPECIALIZATIONS))
+        return {
+            spec.value: int(counts[code]) for code, spec in enumerate(SPECIALIZATIONS)
+        }
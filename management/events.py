@@ -0,0 +1,28 @@
+# management/events.py
+from enum import Enum
+from typing import Callable
+
+
+class ChangeType(Enum):
+    INSERTED = "inserted"
+    UPDATED = "updated"
+    DELETED = "deleted"
+
+
+class ChangeEvent:
+    def __init__(self, collection: str, change_type: ChangeType, records: list):
+        # "doctors", "patients", "appointments" or "series"
+        self.collection = collection
+        self.change_type = change_type
+        # The records themselves, not their positions: finding positions
+        # would cost a pass over the collection for every change
+        self.records = records
+
+    def __repr__(self):
+        return (
+            f"ChangeEvent({self.collection!r}, {self.change_type.value}, "
+            f"records={len(self.records)})"
+        )
+
+
+ChangeListener = Callable[[ChangeEvent], None]
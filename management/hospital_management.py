@@ -1,117 +1,1064 @@
 # management/hospital_management.py
-import json
-import os
-from typing import List, Optional
+import threading
+from bisect import bisect_left, bisect_right, insort
+from contextlib import contextmanager
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, ValuesView
 
-from models.appointment import Appointment
+from management.events import ChangeEvent, ChangeListener, ChangeType
+from management.locking import ReadWriteLock, reading, writing
+from management.metrics import Metrics
+from management.scheduling import DoctorSchedule, SlotConflictError, validate_slot
+from management.search import NamePrefixIndex, PatientSearchIndex, SearchResults
+from models import appointment as appointment_model
+from models import doctor as doctor_model
+from models import patient as patient_model
+from models import series as series_model
+from models.appointment import DEFAULT_DURATION, DEFAULT_START_TIME, Appointment
 from models.doctor import Doctor, Specialization
+from models.fields import (
+    format_date,
+    format_id,
+    parse_date,
+    parse_id,
+    parse_time,
+    try_parse_id,
+)
+from models.human import check_age, check_name
 from models.patient import Patient
+from models.series import AppointmentSeries, occurrence_ordinals
+from storage.base import COLLECTIONS, DELETE, INSERT, UPDATE, Change, Storage
+from storage.json_storage import JsonStorage
+
+LOAD_CHUNK_SIZE = 10000
+
+# ID sequence of each collection's records
+ID_SEQUENCES = {
+    "doctors": Doctor.id_sequence,
+    "patients": Patient.id_sequence,
+    "appointments": Appointment.id_sequence,
+    "series": AppointmentSeries.id_sequence,
+}
+
+# Operations timed once metrics are enabled
+INSTRUMENTED_OPERATIONS = (
+    "add_doctor",
+    "find_doctor_by_id",
+    "complete_doctors",
+    "add_patient",
+    "find_patient_by_id",
+    "update_patient",
+    "complete_patients",
+    "search_patients",
+    "book_appointment",
+    "find_appointment_by_id",
+    "query_appointments",
+    "count_appointments",
+    "update_appointment",
+    "delete_appointment",
+    "free_slots",
+    "book_series",
+    "update_series",
+    "cancel_series",
+    "bulk_insert",
+    "save_data",
+)
+
+
+class LoadProgress:
+    def __init__(
+        self,
+        collection: str,
+        loaded: int,
+        total: Optional[int],
+        done: bool = False,
+        indexing: bool = False,
+    ):
+        self.collection = collection
+        self.loaded = loaded  # records of `collection` loaded so far
+        self.total = total  # None when the backend cannot tell up front
+        self.done = done  # True once every collection is loaded
+        self.indexing = indexing  # True while `collection` is being indexed
+
+    def __str__(self):
+        if self.done:
+            return "Data loaded."
+        if self.indexing:
+            return f"Indexing {self.collection}..."
+        if self.total:
+            return f"Loading {self.collection}... {self.loaded:,} of {self.total:,}"
+        return f"Loading {self.collection}... {self.loaded:,}"
+
+
+def appointment_order(appointment: Appointment):
+    return appointment.date_ordinal, appointment.start_minute, appointment.number
 
 
 class HospitalManagement:
-    def __init__(self):
-        self.doctors: List[Doctor] = []
-        self.patients: List[Patient] = []
-        self.appointments: List[Appointment] = []
-        self.load_data()
+    def __init__(self, storage: Optional[Storage] = None, autoload: bool = True):
+        self.storage = storage if storage is not None else JsonStorage()
+        # Public methods take the read or write side of this lock, so the
+        # object can be shared with worker threads. The collection views
+        # returned by list_*() are live; hold lock.read() while iterating
+        # them off the main thread. Change listeners run on the mutating
+        # thread with the write lock held.
+        self.lock = ReadWriteLock()
+        # Serializes building the lazy search indexes under the read lock
+        self._build_lock = threading.Lock()
+
+        # Primary-key indexes, keyed by the numeric part of the ID. They
+        # also hold the appointments and series in insertion order (see the
+        # properties below), so removing one is a dict deletion rather than
+        # a list search and shift.
+        self._doctors_by_id: Dict[int, Doctor] = {}
+        self._patients_by_id: Dict[int, Patient] = {}
+        # Doctors and patients are never removed, so they are also kept in
+        # append-only lists that give each one a fixed row
+        self._doctor_rows: List[Doctor] = []
+        self._patient_rows: List[Patient] = []
+        self._appointments_by_id: Dict[int, Appointment] = {}
+        self._series_by_id: Dict[int, AppointmentSeries] = {}
+
+        # Backends with their own indexes (SQLite) answer the doctor, patient
+        # and date queries, and the three secondary indexes below stay empty
+        self._indexed_storage = self.storage.indexed_queries
+
+        # Secondary indexes on doctor number, patient number and date ordinal
+        # (inner dicts keep insertion order and allow O(1) removal)
+        self._appointments_by_doctor: Dict[int, Dict[int, Appointment]] = {}
+        self._appointments_by_patient: Dict[int, Dict[int, Appointment]] = {}
+        self._appointments_by_date: Dict[int, Dict[int, Appointment]] = {}
+        # Occurrences of each series, by series number
+        self._appointments_by_series: Dict[int, Dict[int, Appointment]] = {}
+        # Sorted date ordinals that have appointments, for range queries
+        self._appointment_dates: List[int] = []
+
+        # Slot occupancy per doctor and day, for double-booking checks
+        self.schedule = DoctorSchedule()
+
+        self._listeners: List[ChangeListener] = []
+
+        # Changes held back while inside batch()
+        self._batch_depth = 0
+        self._batched: Dict[str, List[Change]] = {}
+        self._sequences_dirty = False
+
+        # Optional NumPy mirror of the appointments, see enable_columnar()
+        self.columns = None
+
+        # Operation metrics, see enable_metrics()
+        self.metrics: Optional[Metrics] = None
+
+        # Full-text index over patients, built while loading or by the first
+        # search
+        self.patient_index: Optional[PatientSearchIndex] = None
+
+        # Name prefix indexes for the pickers, built while loading or by the
+        # first completion
+        self._doctor_names: Optional[NamePrefixIndex] = None
+        self._patient_names: Optional[NamePrefixIndex] = None
+
+        if autoload:
+            self.load_data()
+
+    # Collections
+    @property
+    def doctors(self) -> List[Doctor]:
+        return self._doctor_rows
+
+    @property
+    def patients(self) -> List[Patient]:
+        return self._patient_rows
+
+    @property
+    def appointments(self) -> ValuesView[Appointment]:
+        return self._appointments_by_id.values()
+
+    @property
+    def series(self) -> ValuesView[AppointmentSeries]:
+        return self._series_by_id.values()
+
+    # Change Notification
+    def subscribe(self, listener: ChangeListener):
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: ChangeListener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self, collection: str, change_type: ChangeType, records: list):
+        if not self._listeners:
+            return
+        event = ChangeEvent(collection, change_type, records)
+        for listener in list(self._listeners):
+            listener(event)
 
     # Doctor Management
+    @writing
     def add_doctor(
         self, name: str, age: int, specialization: Specialization, password: str
     ) -> Doctor:
         new_doctor = Doctor(name, age, specialization, password)
-        self.doctors.append(new_doctor)
-        self.save_data()
+        self._insert_doctor(new_doctor)
+        self._persist("doctors", INSERT, new_doctor.to_dict())
+        self._notify("doctors", ChangeType.INSERTED, [new_doctor])
         return new_doctor
 
     def list_doctors(self) -> List[Doctor]:
         return self.doctors
 
     def find_doctor_by_id(self, doctor_id: str) -> Optional[Doctor]:
-        for doctor in self.doctors:
-            if doctor.id == doctor_id:
-                return doctor
-        return None
+        # Single dict lookups are atomic, so the find_*_by_id methods skip
+        # the lock; they are the hottest calls in the UI
+        number = try_parse_id(doctor_model.ID_PREFIX, doctor_id)
+        return self._doctors_by_id.get(number)
+
+    @reading
+    def complete_doctors(self, text: str, limit: int = 50) -> List[Doctor]:
+        # Doctors whose ID or a word of whose name starts with `text`
+        if self._doctor_names is None:
+            self._build_indexes("doctors")
+        return self._complete(
+            text,
+            doctor_model.ID_PREFIX,
+            Doctor.id_sequence.value,
+            self._doctors_by_id,
+            self._doctor_names,
+            limit,
+        )
 
     # Patient Management
+    @writing
     def add_patient(self, name: str, age: int, medical_history: str) -> Patient:
         new_patient = Patient(name, age, medical_history)
-        self.patients.append(new_patient)
-        self.save_data()
+        self._insert_patient(new_patient)
+        self._persist("patients", INSERT, new_patient.to_dict())
+        self._notify("patients", ChangeType.INSERTED, [new_patient])
         return new_patient
 
     def list_patients(self) -> List[Patient]:
         return self.patients
 
     def find_patient_by_id(self, patient_id: str) -> Optional[Patient]:
-        for patient in self.patients:
-            if patient.patient_id == patient_id:
-                return patient
-        return None
+        number = try_parse_id(patient_model.ID_PREFIX, patient_id)
+        return self._patients_by_id.get(number)
+
+    @reading
+    def complete_patients(self, text: str, limit: int = 50) -> List[Patient]:
+        # Patients whose ID or a word of whose name starts with `text`
+        if self._patient_names is None:
+            self._build_indexes("patients")
+        return self._complete(
+            text,
+            patient_model.ID_PREFIX,
+            Patient.id_sequence.value,
+            self._patients_by_id,
+            self._patient_names,
+            limit,
+        )
+
+    @writing
+    def update_patient(
+        self, patient_id: str, name: str, age: int, medical_history: str
+    ) -> bool:
+        patient = self.find_patient_by_id(patient_id)
+        if not patient:
+            return False
+        # Invalid input must leave the patient and its index entries as
+        # they were
+        check_name(name)
+        check_age(age)
+        indexes = [
+            index
+            for index in (self.patient_index, self._patient_names)
+            if index is not None
+        ]
+        for index in indexes:
+            index.remove(patient)
+        patient.name = name
+        patient.age = age
+        patient.medical_history = medical_history
+        for index in indexes:
+            index.add(patient)
+        self._persist("patients", UPDATE, patient.to_dict())
+        self._notify("patients", ChangeType.UPDATED, [patient])
+        return True
+
+    @reading
+    def search_patients(self, query: str, limit: int = 100) -> SearchResults:
+        # Ranked matches on words of the name and medical history; the last
+        # word also matches as a prefix. The result's `truncated` flag says
+        # that prefix had too many expansions to match them all.
+        if self.patient_index is None:
+            self._build_indexes("patients")
+        matches = self.patient_index.search(query, limit)
+        results = SearchResults(self._patients_by_id[number] for number, _ in matches)
+        results.truncated = matches.truncated
+        return results
+
+    @reading
+    def _build_indexes(self, collection: str):
+        # Builds the missing search indexes over `collection`. Runs under
+        # the read lock, so lookups go on meanwhile; iter_load_data() calls
+        # it on the loading thread so the first keystroke does not have to.
+        with self._build_lock:
+            if collection == "doctors":
+                if self._doctor_names is None:
+                    self._doctor_names = NamePrefixIndex(self.doctors)
+            elif collection == "patients":
+                if self.patient_index is None:
+                    self.patient_index = PatientSearchIndex(self.patients)
+                if self._patient_names is None:
+                    self._patient_names = NamePrefixIndex(self.patients)
 
     # Appointment Management
+    @writing
     def book_appointment(
-        self, doctor_id: str, patient_id: str, date: str
+        self,
+        doctor_id: str,
+        patient_id: str,
+        date: str,
+        start_time: str = DEFAULT_START_TIME,
+        duration: int = DEFAULT_DURATION,
     ) -> Optional[Appointment]:
         doctor = self.find_doctor_by_id(doctor_id)
         patient = self.find_patient_by_id(patient_id)
         if doctor and patient:
-            new_appointment = Appointment(doctor_id, patient_id, date)
-            self.appointments.append(new_appointment)
-            self.save_data()
+            self._check_slot(doctor.number, date, start_time, duration)
+            new_appointment = Appointment(
+                doctor_id, patient_id, date, start_time=start_time, duration=duration
+            )
+            self._insert_appointment(new_appointment)
+            self._persist("appointments", INSERT, new_appointment.to_dict())
+            self._notify("appointments", ChangeType.INSERTED, [new_appointment])
             return new_appointment
         return None
 
-    def list_appointments(self) -> List[Appointment]:
+    def list_appointments(self) -> ValuesView[Appointment]:
         return self.appointments
 
+    def find_appointment_by_id(self, appointment_id: str) -> Optional[Appointment]:
+        number = try_parse_id(appointment_model.ID_PREFIX, appointment_id)
+        return self._appointments_by_id.get(number)
+
+    @reading
+    def list_appointments_for_doctor(self, doctor_id: str) -> List[Appointment]:
+        if self._indexed_storage:
+            return self._query_storage(doctor_id=doctor_id)
+        number = try_parse_id(doctor_model.ID_PREFIX, doctor_id)
+        return list(self._appointments_by_doctor.get(number, {}).values())
+
+    @reading
+    def list_appointments_for_patient(self, patient_id: str) -> List[Appointment]:
+        if self._indexed_storage:
+            return self._query_storage(patient_id=patient_id)
+        number = try_parse_id(patient_model.ID_PREFIX, patient_id)
+        return list(self._appointments_by_patient.get(number, {}).values())
+
+    @reading
+    def list_appointments_on_date(self, date: str) -> List[Appointment]:
+        if self._indexed_storage:
+            return self._query_storage(date_from=date, date_to=date)
+        return list(self._appointments_by_date.get(parse_date(date), {}).values())
+
+    @reading
+    def query_appointments(
+        self,
+        doctor_id: Optional[str] = None,
+        patient_id: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[Appointment]:
+        # Appointments in [date_from, date_to] (either end open when None),
+        # ordered by date, start time and ID
+        if self._indexed_storage:
+            return self._query_storage(
+                doctor_id, patient_id, date_from, date_to, limit, offset
+            )
+        matches = self._iter_appointments(
+            doctor_id, patient_id, date_from, date_to, offset
+        )
+        return list(matches if limit is None else islice(matches, limit))
+
+    @reading
+    def count_appointments(
+        self,
+        doctor_id: Optional[str] = None,
+        patient_id: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+    ) -> int:
+        if self._indexed_storage:
+            filters = self._storage_filters(doctor_id, patient_id, date_from, date_to)
+            return self.storage.count_appointments(*filters) if filters else 0
+        if doctor_id is None and patient_id is None:
+            return sum(
+                len(self._appointments_by_date[ordinal])
+                for ordinal in self._date_range(date_from, date_to)
+            )
+        return sum(
+            1
+            for _ in self._iter_appointments(doctor_id, patient_id, date_from, date_to)
+        )
+
+    def _iter_appointments(
+        self,
+        doctor_id: Optional[str],
+        patient_id: Optional[str],
+        date_from: Optional[str],
+        date_to: Optional[str],
+        offset: int = 0,
+    ) -> Iterator[Appointment]:
+        if doctor_id is None and patient_id is None:
+            # Walk the sorted dates, skipping whole days that fall before
+            # `offset` and sorting only the days that are returned
+            for ordinal in self._date_range(date_from, date_to):
+                day = self._appointments_by_date[ordinal]
+                if offset >= len(day):
+                    offset -= len(day)
+                    continue
+                ordered = sorted(day.values(), key=appointment_order)
+                yield from ordered[offset:]
+                offset = 0
+            return
+
+        # A doctor's or patient's appointments are few; filter those instead
+        buckets = []
+        if doctor_id is not None:
+            number = try_parse_id(doctor_model.ID_PREFIX, doctor_id)
+            buckets.append(self._appointments_by_doctor.get(number, {}))
+        if patient_id is not None:
+            number = try_parse_id(patient_model.ID_PREFIX, patient_id)
+            buckets.append(self._appointments_by_patient.get(number, {}))
+        smallest = min(buckets, key=len)
+        low = parse_date(date_from) if date_from else None
+        high = parse_date(date_to) if date_to else None
+        matches = [
+            appointment
+            for appointment in smallest.values()
+            if all(appointment.number in bucket for bucket in buckets)
+            and (low is None or appointment.date_ordinal >= low)
+            and (high is None or appointment.date_ordinal <= high)
+        ]
+        matches.sort(key=appointment_order)
+        yield from matches[offset:]
+
+    def _query_storage(
+        self,
+        doctor_id: Optional[str] = None,
+        patient_id: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[Appointment]:
+        # The backend filters and orders; matches come from the loaded records.
+        # Changes still held by an open batch() are not visible to it yet.
+        filters = self._storage_filters(doctor_id, patient_id, date_from, date_to)
+        if not filters:
+            return []
+        by_id = self._appointments_by_id
+        matches = []
+        for appointment_id in self.storage.query_appointments(*filters, limit, offset):
+            appointment = by_id.get(
+                parse_id(appointment_model.ID_PREFIX, appointment_id)
+            )
+            if appointment is not None:
+                matches.append(appointment)
+        return matches
+
+    def _storage_filters(
+        self,
+        doctor_id: Optional[str],
+        patient_id: Optional[str],
+        date_from: Optional[str],
+        date_to: Optional[str],
+    ) -> Optional[tuple]:
+        # The stored forms of the filters ("D012" -> "D12"), or None when an
+        # ID cannot match anything
+        filters = []
+        for prefix, value in (
+            (doctor_model.ID_PREFIX, doctor_id),
+            (patient_model.ID_PREFIX, patient_id),
+        ):
+            if value is not None:
+                number = try_parse_id(prefix, value)
+                if number is None:
+                    return None
+                value = format_id(prefix, number)
+            filters.append(value)
+        for value in (date_from, date_to):
+            filters.append(format_date(parse_date(value)) if value else None)
+        return tuple(filters)
+
+    def _date_range(self, date_from: Optional[str], date_to: Optional[str]) -> list:
+        dates = self._appointment_dates
+        start = bisect_left(dates, parse_date(date_from)) if date_from else 0
+        end = bisect_right(dates, parse_date(date_to)) if date_to else len(dates)
+        return dates[start:end]
+
+    @writing
+    def update_appointment(
+        self,
+        appointment_id: str,
+        doctor_id: str,
+        patient_id: str,
+        date: str,
+        start_time: Optional[str] = None,
+        duration: Optional[int] = None,
+    ) -> bool:
+        appointment = self.find_appointment_by_id(appointment_id)
+        if not appointment:
+            return False
+        doctor = self.find_doctor_by_id(doctor_id)
+        if not doctor or not self.find_patient_by_id(patient_id):
+            return False
+
+        start_time = start_time if start_time is not None else appointment.start_time
+        duration = duration if duration is not None else appointment.duration
+        self._check_slot(
+            doctor.number, date, start_time, duration, ignore=appointment.number
+        )
+
+        self._unindex_appointment(appointment)
+        appointment.doctor_id = doctor_id
+        appointment.patient_id = patient_id
+        appointment.date = date
+        appointment.start_time = start_time
+        appointment.duration = duration
+        self._index_appointment(appointment)
+        self._persist("appointments", UPDATE, appointment.to_dict())
+        self._notify("appointments", ChangeType.UPDATED, [appointment])
+        return True
+
+    @writing
     def delete_appointment(self, appointment_id: str) -> bool:
-        for appointment in self.appointments:
-            if appointment.appointment_id == appointment_id:
-                self.appointments.remove(appointment)
-                self.save_data()
-                return True
-        return False
+        appointment = self.find_appointment_by_id(appointment_id)
+        if not appointment:
+            return False
+        self._unindex_appointment(appointment)
+        del self._appointments_by_id[appointment.number]
+        self._persist("appointments", DELETE, {"appointment_id": appointment_id})
+        self._persist_sequences()
+        self._notify("appointments", ChangeType.DELETED, [appointment])
+        if appointment.series_number:
+            self._discard_series_if_empty(appointment.series_number)
+        return True
+
+    # Recurring Series
+    @writing
+    def book_series(
+        self,
+        doctor_id: str,
+        patient_id: str,
+        start_date: str,
+        frequency: str,
+        interval: int = 1,
+        count: int = 0,
+        until: str = "",
+        start_time: str = DEFAULT_START_TIME,
+        duration: int = DEFAULT_DURATION,
+    ) -> Optional[AppointmentSeries]:
+        # Books every occurrence of the rule or none of them: the dates are
+        # expanded and checked against the doctor's schedule in one pass,
+        # and the series and its appointments are persisted together
+        doctor = self.find_doctor_by_id(doctor_id)
+        patient = self.find_patient_by_id(patient_id)
+        if not doctor or not patient:
+            return None
+        start_minute = parse_time(start_time)
+        validate_slot(start_minute, duration)
+        ordinals = occurrence_ordinals(
+            parse_date(start_date),
+            frequency,
+            interval,
+            count,
+            parse_date(until) if until else 0,
+        )
+        clashes = self.schedule.conflicts(
+            (doctor.number, ordinal, start_minute, duration) for ordinal in ordinals
+        )
+        if clashes:
+            dates = ", ".join(format_date(ordinals[position]) for position in clashes)
+            raise SlotConflictError(
+                f"The doctor is already booked at {start_time} on {dates}."
+            )
+
+        series = AppointmentSeries(
+            doctor_id,
+            patient_id,
+            start_date,
+            start_time,
+            duration,
+            frequency,
+            interval,
+            count,
+            until,
+        )
+        appointments = [
+            Appointment.from_fields(
+                Appointment.id_sequence.next(),
+                doctor.number,
+                patient.number,
+                ordinal,
+                start_minute,
+                duration,
+                series.number,
+            )
+            for ordinal in ordinals
+        ]
+        with self.batch():
+            self._insert_series(series)
+            self._persist("series", INSERT, series.to_dict())
+            self._notify("series", ChangeType.INSERTED, [series])
+            self.bulk_insert("appointments", appointments)
+        return series
+
+    def find_series_by_id(self, series_id: str) -> Optional[AppointmentSeries]:
+        number = try_parse_id(series_model.ID_PREFIX, series_id)
+        return self._series_by_id.get(number)
+
+    @reading
+    def list_series_appointments(self, series_id: str) -> List[Appointment]:
+        # The occurrences still booked, in date order
+        number = try_parse_id(series_model.ID_PREFIX, series_id)
+        occurrences = self._appointments_by_series.get(number, {})
+        return sorted(occurrences.values(), key=appointment_order)
+
+    @writing
+    def update_series(
+        self,
+        series_id: str,
+        doctor_id: Optional[str] = None,
+        patient_id: Optional[str] = None,
+        start_time: Optional[str] = None,
+        duration: Optional[int] = None,
+        from_date: Optional[str] = None,
+    ) -> bool:
+        # Moves every occurrence, or those on or after `from_date`, to
+        # another doctor, patient, start time or duration; None keeps each
+        # occurrence's own value, so single edits made earlier survive. The
+        # new slots are checked together and persisted in one pass.
+        series = self.find_series_by_id(series_id)
+        if not series:
+            return False
+        doctor = None
+        if doctor_id is not None:
+            doctor = self.find_doctor_by_id(doctor_id)
+            if not doctor:
+                return False
+        if patient_id is not None and not self.find_patient_by_id(patient_id):
+            return False
+        start_minute = parse_time(start_time) if start_time is not None else None
+
+        occurrences = self._series_occurrences(series, from_date)
+        moved = [
+            (
+                doctor.number if doctor else appointment.doctor_number,
+                appointment.date_ordinal,
+                start_minute if start_minute is not None else appointment.start_minute,
+                duration if duration is not None else appointment.duration,
+            )
+            for appointment in occurrences
+        ]
+        for _, _, minute, length in moved:
+            validate_slot(minute, length)
+        clashes = self.schedule.conflicts(
+            moved, ignore={appointment.number for appointment in occurrences}
+        )
+        if clashes:
+            dates = ", ".join(occurrences[position].date for position in clashes)
+            raise SlotConflictError(f"The doctor is already booked on {dates}.")
+
+        with self.batch():
+            for appointment, (doctor_number, _, minute, length) in zip(
+                occurrences, moved
+            ):
+                self._unindex_appointment(appointment)
+                appointment.doctor_number = doctor_number
+                if patient_id is not None:
+                    appointment.patient_id = patient_id
+                appointment.start_minute = minute
+                appointment.duration = length
+                self._index_appointment(appointment)
+                self._persist("appointments", UPDATE, appointment.to_dict())
+            if occurrences:
+                self._notify("appointments", ChangeType.UPDATED, occurrences)
+            # The rule itself follows only edits to the whole series
+            if not from_date or parse_date(from_date) <= series.start_ordinal:
+                if doctor is not None:
+                    series.doctor_number = doctor.number
+                if patient_id is not None:
+                    series.patient_id = patient_id
+                if start_minute is not None:
+                    series.start_minute = start_minute
+                if duration is not None:
+                    series.duration = duration
+                self._persist("series", UPDATE, series.to_dict())
+                self._notify("series", ChangeType.UPDATED, [series])
+        return True
+
+    @writing
+    def cancel_series(self, series_id: str, from_date: Optional[str] = None) -> bool:
+        # Deletes every occurrence, or those on or after `from_date`; in that
+        # case the series ends the day before and keeps its earlier visits
+        series = self.find_series_by_id(series_id)
+        if not series:
+            return False
+        occurrences = self._series_occurrences(series, from_date)
+        with self.batch():
+            self._remove_appointments(occurrences)
+            self._persist_sequences()
+            if from_date and series.number in self._appointments_by_series:
+                series.until_ordinal = parse_date(from_date) - 1
+                self._persist("series", UPDATE, series.to_dict())
+                self._notify("series", ChangeType.UPDATED, [series])
+            else:
+                self._discard_series_if_empty(series.number)
+        return True
+
+    def _series_occurrences(
+        self, series: AppointmentSeries, from_date: Optional[str]
+    ) -> List[Appointment]:
+        # Straight from the series index; no other appointment is looked at
+        occurrences = self._appointments_by_series.get(series.number, {}).values()
+        if from_date:
+            low = parse_date(from_date)
+            occurrences = [
+                appointment
+                for appointment in occurrences
+                if appointment.date_ordinal >= low
+            ]
+        return sorted(occurrences, key=appointment_order)
+
+    def _discard_series_if_empty(self, series_number: int):
+        # A series lives as long as it has occurrences
+        if series_number in self._appointments_by_series:
+            return
+        series = self._series_by_id.pop(series_number, None)
+        if series is None:
+            return
+        self._persist("series", DELETE, {"series_id": series.series_id})
+        self._persist_sequences()
+        self._notify("series", ChangeType.DELETED, [series])
+
+    # Scheduling
+    @reading
+    def is_slot_free(
+        self,
+        doctor_id: str,
+        date: str,
+        start_time: str,
+        duration: int = DEFAULT_DURATION,
+        ignore_appointment_id: Optional[str] = None,
+    ) -> bool:
+        doctor = self.find_doctor_by_id(doctor_id)
+        if not doctor:
+            return False
+        return self.schedule.is_free(
+            doctor.number,
+            parse_date(date),
+            parse_time(start_time),
+            duration,
+            self._appointment_number(ignore_appointment_id),
+        )
+
+    @reading
+    def free_slots(
+        self,
+        doctor_id: str,
+        date: str,
+        duration: int = DEFAULT_DURATION,
+        ignore_appointment_id: Optional[str] = None,
+    ) -> List[str]:
+        # Start times ("HH:MM") at which the doctor is free for `duration`
+        # without running outside clinic hours
+        doctor = self.find_doctor_by_id(doctor_id)
+        if not doctor:
+            return []
+        return self.schedule.free_slots(
+            doctor.number,
+            parse_date(date),
+            duration,
+            self._appointment_number(ignore_appointment_id),
+        )
+
+    def _appointment_number(self, appointment_id: Optional[str]) -> Optional[int]:
+        if appointment_id is None:
+            return None
+        return try_parse_id(appointment_model.ID_PREFIX, appointment_id)
+
+    def _check_slot(
+        self,
+        doctor_number: int,
+        date: str,
+        start_time: str,
+        duration: int,
+        ignore: Optional[int] = None,
+    ):
+        start_minute = parse_time(start_time)
+        validate_slot(start_minute, duration)
+        if not self.schedule.is_free(
+            doctor_number, parse_date(date), start_minute, duration, ignore
+        ):
+            raise SlotConflictError(
+                f"The doctor is already booked at {start_time} on {date}."
+            )
+
+    # Bulk Operations
+    @writing
+    def bulk_insert(self, collection: str, records: list):
+        # Adds already-validated model objects to a collection with a single
+        # change event; wrap calls in batch() to persist them together
+        if not records:
+            return
+        insert = {
+            "doctors": self._insert_doctor,
+            "patients": self._insert_patient,
+            "appointments": self._insert_appointment,
+            "series": self._insert_series,
+        }[collection]
+        for record in records:
+            insert(record)
+        for record in records:
+            self._persist(collection, INSERT, record.to_dict())
+        self._notify(collection, ChangeType.INSERTED, records)
+
+    @contextmanager
+    def batch(self):
+        # Persist every change made inside the block in one pass per
+        # collection when the outermost batch exits. The block holds the
+        # write lock throughout.
+        with self.lock.write():
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    batched, self._batched = self._batched, {}
+                    for collection, changes in batched.items():
+                        self.storage.apply(
+                            collection,
+                            changes,
+                            lambda collection=collection: self._collection_records(
+                                collection
+                            ),
+                        )
+                    if self._sequences_dirty:
+                        self._persist_sequences()
+
+    # Completion
+    def _complete(
+        self,
+        text: str,
+        id_prefix: str,
+        max_number: int,
+        by_id: dict,
+        names: NamePrefixIndex,
+        limit: int,
+    ) -> list:
+        # ID matches first ("P12" -> P12, P120..P129, P1200..), then names
+        text = text.strip()
+        numbers = {}
+        digits = text[len(id_prefix) :] if text[:1].upper() == id_prefix else text
+        if digits.isdigit() and digits[0] != "0":
+            low = high = int(digits)
+            while low <= max_number and len(numbers) < limit:
+                for number in range(low, min(high, max_number) + 1):
+                    if number in by_id:
+                        numbers[number] = None
+                        if len(numbers) == limit:
+                            break
+                low, high = low * 10, high * 10 + 9
+        if len(numbers) < limit:
+            for number in names.search(text, limit):
+                numbers.setdefault(number, None)
+        return [by_id[number] for number in list(numbers)[:limit]]
+
+    # Diagnostics
+    @writing
+    def enable_metrics(self) -> Metrics:
+        if self.metrics is None:
+            self.metrics = Metrics()
+            self.metrics.instrument(self, INSTRUMENTED_OPERATIONS)
+            for collection in COLLECTIONS:
+                self.metrics.add_gauge(
+                    f"{collection}.records",
+                    lambda collection=collection: len(getattr(self, collection)),
+                )
+            self.metrics.add_gauge(
+                "storage.bytes_written", lambda: self.storage.bytes_written
+            )
+        return self.metrics
+
+    # Analytics
+    @writing
+    def enable_columnar(self):
+        # Imported here so numpy stays optional
+        from management.columnar import AppointmentColumns
+
+        if self.columns is None:
+            self.columns = AppointmentColumns(self)
+        return self.columns
+
+    # Index Maintenance
+    def _insert_doctor(self, doctor: Doctor):
+        self._doctors_by_id[doctor.number] = doctor
+        self._doctor_rows.append(doctor)
+        if self._doctor_names is not None:
+            self._doctor_names.add(doctor)
+
+    def _insert_patient(self, patient: Patient):
+        self._patients_by_id[patient.number] = patient
+        self._patient_rows.append(patient)
+        if self.patient_index is not None:
+            self.patient_index.add(patient)
+        if self._patient_names is not None:
+            self._patient_names.add(patient)
+
+    def _insert_appointment(self, appointment: Appointment):
+        self._appointments_by_id[appointment.number] = appointment
+        self._index_appointment(appointment)
+
+    def _insert_series(self, series: AppointmentSeries):
+        self._series_by_id[series.number] = series
+
+    def _remove_appointments(self, appointments: List[Appointment]):
+        # One dict deletion per appointment, however many there are in all
+        if not appointments:
+            return
+        for appointment in appointments:
+            self._unindex_appointment(appointment)
+            del self._appointments_by_id[appointment.number]
+            self._persist(
+                "appointments", DELETE, {"appointment_id": appointment.appointment_id}
+            )
+        self._notify("appointments", ChangeType.DELETED, appointments)
+
+    def _index_appointment(self, appointment: Appointment):
+        number = appointment.number
+        if not self._indexed_storage:
+            self._appointments_by_doctor.setdefault(appointment.doctor_number, {})[
+                number
+            ] = appointment
+            self._appointments_by_patient.setdefault(appointment.patient_number, {})[
+                number
+            ] = appointment
+            day = self._appointments_by_date.get(appointment.date_ordinal)
+            if day is None:
+                day = self._appointments_by_date[appointment.date_ordinal] = {}
+                insort(self._appointment_dates, appointment.date_ordinal)
+            day[number] = appointment
+        if appointment.series_number:
+            self._appointments_by_series.setdefault(appointment.series_number, {})[
+                number
+            ] = appointment
+        self.schedule.add(appointment)
+
+    def _unindex_appointment(self, appointment: Appointment):
+        self.schedule.remove(appointment)
+        number = appointment.number
+        for index, key in (
+            (self._appointments_by_doctor, appointment.doctor_number),
+            (self._appointments_by_patient, appointment.patient_number),
+            (self._appointments_by_date, appointment.date_ordinal),
+            (self._appointments_by_series, appointment.series_number),
+        ):
+            bucket = index.get(key)
+            if bucket is not None:
+                bucket.pop(number, None)
+                if not bucket:
+                    del index[key]
+        if self._indexed_storage:
+            return
+        if appointment.date_ordinal not in self._appointments_by_date:
+            dates = self._appointment_dates
+            position = bisect_left(dates, appointment.date_ordinal)
+            if position < len(dates) and dates[position] == appointment.date_ordinal:
+                del dates[position]
 
     # Data Persistence
+    def _persist(self, collection: str, op: str, record: dict):
+        if self._batch_depth:
+            self._batched.setdefault(collection, []).append((op, record))
+            return
+        self.storage.apply(
+            collection, [(op, record)], lambda: self._collection_records(collection)
+        )
+
+    def _persist_sequences(self):
+        if self._batch_depth:
+            self._sequences_dirty = True
+            return
+        self._sequences_dirty = False
+        self.storage.save_sequences(
+            {
+                collection: sequence.value
+                for collection, sequence in ID_SEQUENCES.items()
+            }
+        )
+
+    def _collection_records(self, collection: str) -> List[dict]:
+        # Persistence may run on another thread, e.g. WriteBehindStorage
+        with self.lock.read():
+            return [record.to_dict() for record in getattr(self, collection)]
+
+    @reading
     def save_data(self):
-        # Save Doctors
-        with open("doctors.json", "w") as f:
-            json.dump([doctor.to_dict() for doctor in self.doctors], f, indent=4)
-
-        # Save Patients
-        with open("patients.json", "w") as f:
-            json.dump([patient.to_dict() for patient in self.patients], f, indent=4)
-
-        # Save Appointments
-        with open("appointments.json", "w") as f:
-            json.dump(
-                [appointment.to_dict() for appointment in self.appointments],
-                f,
-                indent=4,
+        written = self.storage.bytes_written
+        for collection in COLLECTIONS:
+            self.storage.save(collection, self._collection_records(collection))
+        self._persist_sequences()
+        # Deferred writes land later, in the storage.bytes_written gauge
+        if self.metrics is not None and not self.storage.writes_behind:
+            self.metrics.increment(
+                "save_data.bytes_written", self.storage.bytes_written - written
             )
 
-    def load_data(self):
-        # Load Doctors
-        if os.path.exists("doctors.json"):
-            with open("doctors.json", "r") as f:
-                doctors_data = json.load(f)
-                for doc_dict in doctors_data:
-                    doctor = Doctor.from_dict(doc_dict)
-                    self.doctors.append(doctor)
-
-        # Load Patients
-        if os.path.exists("patients.json"):
-            with open("patients.json", "r") as f:
-                patients_data = json.load(f)
-                for pat_dict in patients_data:
-                    patient = Patient.from_dict(pat_dict)
-                    self.patients.append(patient)
-
-        # Load Appointments
-        if os.path.exists("appointments.json"):
-            with open("appointments.json", "r") as f:
-                appointments_data = json.load(f)
-                for app_dict in appointments_data:
-                    appointment = Appointment.from_dict(app_dict)
-                    self.appointments.append(appointment)
+    def load_data(self, build_indexes: bool = False):
+        for _ in self.iter_load_data(build_indexes=build_indexes):
+            pass
+
+    def iter_load_data(
+        self, chunk_size: int = LOAD_CHUNK_SIZE, build_indexes: bool = False
+    ) -> Iterator[LoadProgress]:
+        # Records are streamed from storage and turned into objects as they
+        # arrive, yielding progress every `chunk_size` records. Each chunk is
+        # parsed outside the lock and inserted under the write lock. With
+        # `build_indexes`, the search indexes over doctors and patients are
+        # built right after each is loaded instead of on first use.
+        loaders = (
+            ("doctors", Doctor.from_dict, self._insert_doctor),
+            ("patients", Patient.from_dict, self._insert_patient),
+            ("appointments", Appointment.from_dict, self._insert_appointment),
+            ("series", AppointmentSeries.from_dict, self._insert_series),
+        )
+        for collection, from_dict, insert in loaders:
+            total = self.storage.count(collection)
+            loaded = 0
+            yield LoadProgress(collection, loaded, total)
+            records = self.storage.load_objects(collection, from_dict)
+            while True:
+                chunk = list(islice(records, chunk_size))
+                if not chunk:
+                    break
+                with self.lock.write():
+                    for record in chunk:
+                        insert(record)
+                loaded += len(chunk)
+                yield LoadProgress(collection, loaded, total)
+            if build_indexes and collection in ("doctors", "patients"):
+                yield LoadProgress(collection, loaded, total, indexing=True)
+                self._build_indexes(collection)
+        for collection, value in self.storage.load_sequences().items():
+            if collection in ID_SEQUENCES:
+                ID_SEQUENCES[collection].advance(value)
+        # Loaded records raise no change events; a mirror enabled while
+        # loading has only seen part of them
+        if self.columns is not None:
+            with self.lock.write():
+                self.columns.rebuild()
+        yield LoadProgress("", 0, None, done=True)
@@ -0,0 +1,157 @@
+# management/locking.py
+import threading
+from functools import wraps
+from typing import Dict
+
+get_ident = threading.get_ident
+
+
+class ReadWriteLock:
+    # Any number of readers or a single writer. Waiting writers block new
+    # readers so a steady stream of reads cannot starve them. Both sides are
+    # reentrant and the writing thread may also read, so locked methods can
+    # call each other; upgrading a read to a write would deadlock and raises.
+    def __init__(self):
+        self._mutex = threading.Lock()
+        self._no_readers = threading.Condition(self._mutex)  # writers wait
+        self._no_writer = threading.Condition(self._mutex)  # readers wait
+        self._waiting_readers = 0
+        self._waiting_writers = 0
+        self._writer = None  # ident of the thread holding the write lock
+        self._write_depth = 0
+        # Read depth per reading thread; a thread is a reader while it has
+        # an entry, so uncontended reads need no mutex
+        self._depths: Dict[int, int] = {}
+        self._read_guard = _ReadGuard(self)
+        self._write_guard = _WriteGuard(self)
+
+    def read(self):
+        return self._read_guard
+
+    def write(self):
+        return self._write_guard
+
+    def acquire_read(self):
+        me = get_ident()
+        if self._writer == me:
+            # The writer excludes everyone else already
+            self._write_depth += 1
+            return
+        depths = self._depths
+        depth = depths.get(me)
+        if depth:
+            depths[me] = depth + 1
+            return
+        while True:
+            # Announce the read first, then back off if a writer holds or
+            # wants the lock; writers announce themselves before they look
+            # at the readers, so one side always sees the other
+            depths[me] = 1
+            if self._writer is None and not self._waiting_writers:
+                return
+            del depths[me]
+            with self._mutex:
+                self._no_readers.notify()
+                self._waiting_readers += 1
+                try:
+                    while self._writer is not None or self._waiting_writers:
+                        self._no_writer.wait()
+                finally:
+                    self._waiting_readers -= 1
+
+    def release_read(self):
+        me = get_ident()
+        if self._writer == me:
+            self.release_write()
+            return
+        depth = self._depths[me] - 1
+        if depth:
+            self._depths[me] = depth
+            return
+        del self._depths[me]
+        if self._waiting_writers:
+            with self._mutex:
+                self._no_readers.notify()
+
+    def acquire_write(self):
+        me = get_ident()
+        if self._writer == me:
+            self._write_depth += 1
+            return
+        if me in self._depths:
+            raise RuntimeError("Cannot upgrade a read lock to a write lock.")
+        with self._mutex:
+            self._waiting_writers += 1
+            try:
+                while self._writer is not None or self._depths:
+                    self._no_readers.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = me
+            self._write_depth = 1
+
+    def release_write(self):
+        self._write_depth -= 1
+        if self._write_depth:
+            return
+        with self._mutex:
+            self._writer = None
+            if self._waiting_writers:
+                self._no_readers.notify()
+            elif self._waiting_readers:
+                self._no_writer.notify_all()
+
+
+class _ReadGuard:
+    __slots__ = ("_lock",)
+
+    def __init__(self, lock: ReadWriteLock):
+        self._lock = lock
+
+    def __enter__(self):
+        self._lock.acquire_read()
+
+    def __exit__(self, exc_type, exc, tb):
+        self._lock.release_read()
+        return False
+
+
+class _WriteGuard:
+    __slots__ = ("_lock",)
+
+    def __init__(self, lock: ReadWriteLock):
+        self._lock = lock
+
+    def __enter__(self):
+        self._lock.acquire_write()
+
+    def __exit__(self, exc_type, exc, tb):
+        self._lock.release_write()
+        return False
+
+
+def reading(method):
+    # Runs a method of an object with a `lock` attribute under its read lock
+    @wraps(method)
+    def locked(self, *args, **kwargs):
+        lock = self.lock
+        lock.acquire_read()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            lock.release_read()
+
+    return locked
+
+
+def writing(method):
+    @wraps(method)
+    def locked(self, *args, **kwargs):
+        lock = self.lock
+        lock.acquire_write()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            lock.release_write()
+
+    return locked
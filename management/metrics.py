@@ -0,0 +1,145 @@
+# management/metrics.py
+import inspect
+import json
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+from typing import Callable, Dict, Iterable, Optional
+
+# Upper bounds of the latency histogram buckets, in milliseconds; the last
+# bucket takes everything slower
+LATENCY_BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, 5000)
+
+
+def _positional_count(func: Callable) -> Optional[int]:
+    # How many positional arguments `func` takes, or None for any number
+    count = 0
+    for parameter in inspect.signature(func).parameters.values():
+        if parameter.kind == parameter.VAR_POSITIONAL:
+            return None
+        if parameter.kind in (
+            parameter.POSITIONAL_ONLY,
+            parameter.POSITIONAL_OR_KEYWORD,
+        ):
+            count += 1
+    return count
+
+
+class Histogram:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def observe(self, seconds: float):
+        milliseconds = seconds * 1000
+        self.count += 1
+        self.total += milliseconds
+        if milliseconds > self.max:
+            self.max = milliseconds
+        self.buckets[bisect_left(LATENCY_BUCKETS_MS, milliseconds)] += 1
+
+    def percentile(self, fraction: float) -> float:
+        # Upper bound of the bucket holding the given fraction of calls
+        wanted = fraction * self.count
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS_MS, self.buckets):
+            seen += count
+            if seen >= wanted:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {
+            "calls": self.count,
+            "total_ms": self.total,
+            "mean_ms": self.total / self.count if self.count else 0.0,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "max_ms": self.max,
+            "buckets": {
+                **{
+                    f"<={bound}ms": count
+                    for bound, count in zip(LATENCY_BUCKETS_MS, self.buckets)
+                },
+                f">{LATENCY_BUCKETS_MS[-1]}ms": self.buckets[-1],
+            },
+        }
+
+
+class Metrics:
+    # Call counts and latency histograms per operation, plus counters and
+    # gauges read when a snapshot is taken. Nothing is measured until
+    # instrument() wraps an object's methods, so code running without
+    # metrics pays nothing.
+    def __init__(self):
+        self.histograms: Dict[str, Histogram] = {}
+        self.counters: Dict[str, int] = {}
+        self.gauges: Dict[str, Callable[[], int]] = {}
+        self.started = time.time()
+        # Operations may be timed on several threads at once
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, seconds: float):
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(seconds)
+
+    def increment(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def add_gauge(self, name: str, read: Callable[[], int]):
+        self.gauges[name] = read
+
+    def timed(self, name: str, func: Callable, slot: bool = False) -> Callable:
+        # A Qt signal calls a slot with as many of its arguments as the slot
+        # takes, but cannot tell that through this wrapper; a `slot` wrapper
+        # drops the positional arguments `func` has no parameters for
+        accepted = _positional_count(func) if slot else None
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if accepted is not None:
+                args = args[:accepted]
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.observe(name, time.perf_counter() - start)
+
+        return wrapper
+
+    def instrument(
+        self, target, names: Iterable[str], prefix: str = "", slots: bool = False
+    ):
+        # Shadow the bound methods on this instance only; other instances
+        # and the class itself are untouched. Pass `slots` for methods
+        # connected to Qt signals.
+        for name in names:
+            setattr(
+                target,
+                name,
+                self.timed(prefix + name, getattr(target, name), slots),
+            )
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            operations = {
+                name: histogram.to_dict()
+                for name, histogram in sorted(self.histograms.items())
+            }
+            counters = dict(sorted(self.counters.items()))
+        return {
+            "uptime_seconds": time.time() - self.started,
+            "operations": operations,
+            "counters": counters,
+            "gauges": {name: read() for name, read in sorted(self.gauges.items())},
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=4)
@@ -0,0 +1,156 @@
+# management/profiling.py
+import cProfile
+import json
+import os
+import pstats
+import re
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+TRACEBACK_FRAMES = 10
+TOP_ALLOCATIONS = 25
+
+
+class PhaseStats:
+    def __init__(self, name: str):
+        self.name = name
+        self.profile = cProfile.Profile()
+        self.runs = 0
+        self.profiled_runs = 0  # runs cProfile saw; see Profiler.phase
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.allocated_bytes = 0  # net growth of traced memory
+        self.peak_bytes = 0
+        self.top_allocations: List[str] = []
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "runs": self.runs,
+            "profiled_runs": self.profiled_runs,
+            "wall_seconds": self.wall_seconds,
+            "cpu_seconds": self.cpu_seconds,
+            "allocated_bytes": self.allocated_bytes,
+            "peak_bytes": self.peak_bytes,
+            "top_allocations": self.top_allocations,
+        }
+
+
+class Profiler:
+    # cProfile and tracemalloc over named phases of a run (startup,
+    # load_data, first paint, user actions...). Each phase has its own
+    # cProfile, re-entered phases accumulate, and an inner phase pauses the
+    # outer one so time is not counted twice. Phases started with
+    # snapshot=True also record their top allocation sites, which is too
+    # slow to do for every click. Phases may run on several threads, but
+    # only one thread at a time runs cProfile (on Python 3.12+ a second
+    # active profiler raises): a phase started while another thread is
+    # profiling is timed without it. tracemalloc figures cover the whole
+    # process. write_reports() saves everything to `output_dir` for offline
+    # analysis with pstats or snakeviz.
+    def __init__(self, output_dir: str):
+        self.output_dir = output_dir
+        self.phases: Dict[str, PhaseStats] = {}
+        # Per-thread stack of open phases as (stats, profiled, owner) where
+        # owner marks the phase that claimed cProfile for its thread
+        self._local = threading.local()
+        self._owner_lock = threading.Lock()
+        self._owner = None  # ident of the thread running cProfile
+        tracemalloc.start(TRACEBACK_FRAMES)
+
+    @property
+    def _stack(self) -> List[Tuple[PhaseStats, bool, bool]]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def phase(self, name: str, snapshot: bool = False):
+        stats = self.phases.get(name)
+        if stats is None:
+            stats = self.phases[name] = PhaseStats(name)
+        stack = self._stack
+        me = threading.get_ident()
+        with self._owner_lock:
+            owner = self._owner is None
+            if owner:
+                self._owner = me
+            profiled = self._owner == me
+        if stack and stack[-1][1]:
+            stack[-1][0].profile.disable()
+        stack.append((stats, profiled, owner))
+
+        before = tracemalloc.take_snapshot() if snapshot else None
+        tracemalloc.reset_peak()
+        memory_start, _ = tracemalloc.get_traced_memory()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        if profiled:
+            stats.profile.enable()
+        try:
+            yield stats
+        finally:
+            if profiled:
+                stats.profile.disable()
+                stats.profiled_runs += 1
+            stats.runs += 1
+            stats.wall_seconds += time.perf_counter() - wall_start
+            stats.cpu_seconds += time.process_time() - cpu_start
+            memory_end, peak = tracemalloc.get_traced_memory()
+            stats.allocated_bytes += memory_end - memory_start
+            stats.peak_bytes = max(stats.peak_bytes, peak)
+            if before is not None:
+                difference = tracemalloc.take_snapshot().compare_to(before, "lineno")
+                stats.top_allocations = [
+                    str(line) for line in difference[:TOP_ALLOCATIONS]
+                ]
+            stack.pop()
+            if owner:
+                with self._owner_lock:
+                    self._owner = None
+            elif stack and stack[-1][1]:
+                stack[-1][0].profile.enable()
+
+    def write_reports(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        summary = []
+        for index, stats in enumerate(self.phases.values(), 1):
+            base = os.path.join(
+                self.output_dir, f"{index:02d}-{_file_name(stats.name)}"
+            )
+            try:
+                stats.profile.dump_stats(base + ".prof")
+            except TypeError:
+                continue  # the phase never ran any Python code
+            with open(base + ".txt", "w") as f:
+                report = pstats.Stats(stats.profile, stream=f)
+                report.sort_stats("cumulative").print_stats(40)
+            summary.append(stats.to_dict())
+
+        # Whatever is still allocated at exit, by allocation site
+        snapshot = tracemalloc.take_snapshot()
+        top = snapshot.statistics("lineno")[:TOP_ALLOCATIONS]
+        with open(os.path.join(self.output_dir, "allocations.txt"), "w") as f:
+            current, peak = tracemalloc.get_traced_memory()
+            f.write(f"Traced memory at exit: {current:,} bytes, peak {peak:,}\n\n")
+            for line in top:
+                f.write(f"{line}\n")
+
+        with open(os.path.join(self.output_dir, "phases.json"), "w") as f:
+            json.dump(summary, f, indent=4)
+
+    def stop(self):
+        while self._stack:
+            stats, profiled, _ = self._stack.pop()
+            if profiled:
+                stats.profile.disable()
+        self._owner = None
+        tracemalloc.stop()
+
+
+def _file_name(name: str) -> str:
+    return re.sub(r"[^\w.-]+", "_", name).strip("_")[:60] or "phase"
@@ -0,0 +1,138 @@
+# management/scheduling.py
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from models.appointment import Appointment
+from models.fields import format_time
+
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+DURATIONS = (15, 30, 45, 60, 90, 120)
+
+# Clinic hours, in minutes since midnight; free_slots() only offers
+# appointments that start and end within them
+CLINIC_OPENS = 8 * 60
+CLINIC_CLOSES = 18 * 60
+
+
+class SlotConflictError(ValueError):
+    pass
+
+
+def validate_slot(start_minute: int, duration: int):
+    if start_minute % SLOT_MINUTES or duration % SLOT_MINUTES or duration <= 0:
+        raise ValueError(
+            f"Appointments must start and last in {SLOT_MINUTES}-minute steps."
+        )
+    if start_minute + duration > 24 * 60:
+        raise ValueError("Appointments cannot run past midnight.")
+
+
+def slot_mask(start_minute: int, duration: int) -> int:
+    # Bit i set <=> slot i (i * SLOT_MINUTES minutes after midnight) is used
+    first = start_minute // SLOT_MINUTES
+    count = duration // SLOT_MINUTES
+    return ((1 << count) - 1) << first
+
+
+class DoctorSchedule:
+    # Per-doctor, per-day occupancy bitmaps: one int of SLOTS_PER_DAY bits for
+    # each (doctor number, date ordinal) with bookings. Conflict checks are a
+    # single AND; free-slot queries scan at most SLOTS_PER_DAY bits.
+    def __init__(self):
+        self._masks: Dict[Tuple[int, int], int] = {}
+        # Masks of the individual appointments behind each day bitmap, so a
+        # removal can rebuild the day even when legacy bookings overlap
+        self._bookings: Dict[Tuple[int, int], Dict[int, int]] = {}
+
+    def add(self, appointment: Appointment):
+        key = (appointment.doctor_number, appointment.date_ordinal)
+        mask = slot_mask(appointment.start_minute, appointment.duration)
+        self._bookings.setdefault(key, {})[appointment.number] = mask
+        self._masks[key] = self._masks.get(key, 0) | mask
+
+    def remove(self, appointment: Appointment):
+        key = (appointment.doctor_number, appointment.date_ordinal)
+        bookings = self._bookings.get(key)
+        if not bookings or bookings.pop(appointment.number, None) is None:
+            return
+        if not bookings:
+            del self._bookings[key]
+            del self._masks[key]
+            return
+        combined = 0
+        for mask in bookings.values():
+            combined |= mask
+        self._masks[key] = combined
+
+    def occupied(
+        self, doctor_number: int, date_ordinal: int, ignore: Optional[int] = None
+    ) -> int:
+        key = (doctor_number, date_ordinal)
+        if ignore is not None and ignore in self._bookings.get(key, {}):
+            combined = 0
+            for number, mask in self._bookings[key].items():
+                if number != ignore:
+                    combined |= mask
+            return combined
+        return self._masks.get(key, 0)
+
+    def is_free(
+        self,
+        doctor_number: int,
+        date_ordinal: int,
+        start_minute: int,
+        duration: int,
+        ignore: Optional[int] = None,
+    ) -> bool:
+        occupied = self.occupied(doctor_number, date_ordinal, ignore)
+        return not occupied & slot_mask(start_minute, duration)
+
+    def conflicts(
+        self,
+        bookings: Iterable[Tuple[int, int, int, int]],
+        ignore: Set[int] = frozenset(),
+    ) -> List[int]:
+        # Positions of the (doctor number, date ordinal, start minute,
+        # duration) bookings that clash with the schedule or with an earlier
+        # booking in the list, checked together in one pass. Appointments
+        # in `ignore` are treated as gone, e.g. the ones being moved.
+        taken: Dict[Tuple[int, int], int] = {}
+        clashes = []
+        for position, booking in enumerate(bookings):
+            doctor_number, date_ordinal, start_minute, duration = booking
+            key = (doctor_number, date_ordinal)
+            occupied = taken.get(key)
+            if occupied is None:
+                occupied = self._masks.get(key, 0)
+                bookings_that_day = self._bookings.get(key, {})
+                if ignore and not ignore.isdisjoint(bookings_that_day):
+                    occupied = 0
+                    for number, mask in bookings_that_day.items():
+                        if number not in ignore:
+                            occupied |= mask
+            mask = slot_mask(start_minute, duration)
+            if occupied & mask:
+                clashes.append(position)
+            else:
+                occupied |= mask
+            taken[key] = occupied
+        return clashes
+
+    def free_slots(
+        self,
+        doctor_number: int,
+        date_ordinal: int,
+        duration: int,
+        ignore: Optional[int] = None,
+        opens: int = CLINIC_OPENS,
+        closes: int = CLINIC_CLOSES,
+    ) -> List[str]:
+        occupied = self.occupied(doctor_number, date_ordinal, ignore)
+        wanted = slot_mask(0, duration)
+        first_start = -(-opens // SLOT_MINUTES)
+        last_start = (closes - duration) // SLOT_MINUTES
+        return [
+            format_time(slot * SLOT_MINUTES)
+            for slot in range(first_start, last_start + 1)
+            if not occupied & (wanted << slot)
+        ]
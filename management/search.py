@@ -0,0 +1,287 @@
+# management/search.py
+import heapq
+import math
+import re
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+from models.patient import Patient
+
+NAME_WEIGHT = 2.0
+HISTORY_WEIGHT = 1.0
+# How many vocabulary terms a trailing prefix may expand to; results for a
+# shorter prefix are marked truncated
+MAX_PREFIX_TERMS = 64
+# NamePrefixIndex chunks hold between this many and twice this many keys
+NAME_CHUNK_SIZE = 1024
+
+_TOKEN = re.compile(r"[^\W_]+")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower()) if text else []
+
+
+class SearchResults(list):
+    # Ranked matches. `truncated` is set when the last word of the query is
+    # the prefix of more than MAX_PREFIX_TERMS words and only the first
+    # MAX_PREFIX_TERMS of them, alphabetically, were matched; typing more
+    # of the word narrows it down.
+    truncated = False
+
+
+def name_keys(name: str) -> Tuple[str, ...]:
+    words = tokenize(name)
+    return tuple(" ".join(words[start:]) for start in range(len(words)))
+
+
+class PatientSearchIndex:
+    # Inverted index from lower-cased words to patient numbers, with separate
+    # postings for names and medical histories so name hits rank higher.
+    # Queries intersect the postings of their words instead of scanning the
+    # patients; the last word of a query also matches as a prefix, through a
+    # sorted vocabulary and bisect, for search-as-you-type.
+    def __init__(self, patients: Iterable[Patient] = ()):
+        self._names: Dict[str, Set[int]] = {}
+        self._histories: Dict[str, Set[int]] = {}
+        self._terms: List[str] = []
+        self._size = 0
+
+        # Names and histories repeat a lot (they are interned); tokenize
+        # each distinct text once
+        cache: Dict[str, Tuple[str, ...]] = {}
+        for patient in patients:
+            for postings, text in (
+                (self._names, patient.name),
+                (self._histories, patient.medical_history),
+            ):
+                tokens = cache.get(text)
+                if tokens is None:
+                    tokens = cache[text] = tuple(set(tokenize(text)))
+                self._post(postings, tokens, patient.number)
+            self._size += 1
+        self._terms = sorted(self._names.keys() | self._histories.keys())
+
+    def __len__(self) -> int:
+        return self._size
+
+    # Maintenance
+    def add(self, patient: Patient):
+        name_terms = tokenize(patient.name)
+        history_terms = tokenize(patient.medical_history)
+        for term in set(name_terms + history_terms):
+            if term not in self._names and term not in self._histories:
+                insort(self._terms, term)
+        self._post(self._names, name_terms, patient.number)
+        self._post(self._histories, history_terms, patient.number)
+        self._size += 1
+
+    def remove(self, patient: Patient):
+        # Must be called before the patient's name or history change
+        for postings, text in (
+            (self._names, patient.name),
+            (self._histories, patient.medical_history),
+        ):
+            for term in set(tokenize(text)):
+                numbers = postings.get(term)
+                if numbers is None:
+                    continue
+                numbers.discard(patient.number)
+                if not numbers:
+                    del postings[term]
+                    if term not in self._names and term not in self._histories:
+                        position = bisect_left(self._terms, term)
+                        if (
+                            position < len(self._terms)
+                            and self._terms[position] == term
+                        ):
+                            del self._terms[position]
+        self._size -= 1
+
+    def _post(self, postings: Dict[str, Set[int]], terms: Iterable[str], number: int):
+        for term in terms:
+            numbers = postings.get(term)
+            if numbers is None:
+                numbers = postings[term] = set()
+            numbers.add(number)
+
+    # Queries
+    def search(self, query: str, limit: int = 100) -> SearchResults:
+        # Patients matching every word of the query, best first, as
+        # (patient number, score) pairs. Each word scores its inverse
+        # document frequency, weighted by whether it hit the name or the
+        # medical history.
+        results = SearchResults()
+        terms = tokenize(query)
+        if not terms:
+            return results
+        prefix = terms[-1] if not query[-1:].isspace() else None
+        if prefix is not None:
+            terms = terms[:-1]
+
+        matches = [self._exact(term) for term in dict.fromkeys(terms)]
+        if prefix is not None:
+            expansions = self._expand(prefix)
+            results.truncated = len(expansions) > MAX_PREFIX_TERMS
+            matches.append(self._prefixed(expansions[:MAX_PREFIX_TERMS]))
+        if any(not names and not histories for names, histories, _ in matches):
+            return results
+
+        # Intersect starting from the rarest word
+        matches.sort(key=lambda match: len(match[0]) + len(match[1]))
+        names, histories, _ = matches[0]
+        candidates = names | histories
+        for names, histories, _ in matches[1:]:
+            candidates = (candidates & names) | (candidates & histories)
+            if not candidates:
+                return results
+
+        # Every candidate's score depends only on which postings it is in,
+        # so split the candidates into groups of equal score with set
+        # operations and only order numbers within the best groups
+        groups = [(0.0, candidates)]
+        for names, histories, idf in matches:
+            split = []
+            for score, numbers in groups:
+                in_name = numbers & names
+                for bonus, part in (
+                    (NAME_WEIGHT + HISTORY_WEIGHT, in_name & histories),
+                    (NAME_WEIGHT, in_name - histories),
+                    (HISTORY_WEIGHT, (numbers - in_name) & histories),
+                ):
+                    if part:
+                        split.append((score + bonus * idf, part))
+            groups = split
+
+        for score, numbers in sorted(groups, key=lambda group: -group[0]):
+            wanted = limit - len(results)
+            if wanted <= 0:
+                break
+            results.extend(
+                (number, score) for number in heapq.nsmallest(wanted, numbers)
+            )
+        return results
+
+    def _exact(self, term: str) -> Tuple[Set[int], Set[int], float]:
+        names = self._names.get(term, set())
+        histories = self._histories.get(term, set())
+        return names, histories, self._idf(len(names) + len(histories))
+
+    def _expand(self, prefix: str) -> List[str]:
+        # Vocabulary terms starting with `prefix`, one more than
+        # MAX_PREFIX_TERMS at most, so callers can tell there are more
+        position = bisect_left(self._terms, prefix)
+        expansions = []
+        for term in self._terms[position : position + MAX_PREFIX_TERMS + 1]:
+            if not term.startswith(prefix):
+                break
+            expansions.append(term)
+        return expansions
+
+    def _prefixed(self, expansions: List[str]) -> Tuple[Set[int], Set[int], float]:
+        if len(expansions) == 1:
+            return self._exact(expansions[0])
+        names: Set[int] = set()
+        histories: Set[int] = set()
+        for term in expansions:
+            names |= self._names.get(term, set())
+            histories |= self._histories.get(term, set())
+        return names, histories, self._idf(len(names) + len(histories))
+
+    def _idf(self, frequency: int) -> float:
+        return math.log(1 + self._size / (1 + frequency))
+
+
+class NamePrefixIndex:
+    # Sorted lower-cased name keys (the full name and the name from each
+    # later word on, so "smi" finds "John Smith") with the record number of
+    # each. They are kept in chunks of NAME_CHUNK_SIZE to twice that, with
+    # the first key of every chunk in a separate list: lookups bisect that
+    # list and then one chunk, and an add or remove shifts one chunk
+    # instead of the whole array.
+    def __init__(self, records: Iterable = ()):
+        cache: Dict[str, Tuple[str, ...]] = {}
+        pairs = []
+        for record in records:
+            keys = cache.get(record.name)
+            if keys is None:
+                keys = cache[record.name] = name_keys(record.name)
+            pairs.extend((key, record.number) for key in keys)
+        pairs.sort()
+        self._size = len(pairs)
+        # (keys, numbers) per chunk; there is always at least one chunk
+        self._chunks: List[Tuple[List[str], List[int]]] = [
+            (
+                [key for key, _ in pairs[start : start + NAME_CHUNK_SIZE]],
+                [number for _, number in pairs[start : start + NAME_CHUNK_SIZE]],
+            )
+            for start in range(0, len(pairs), NAME_CHUNK_SIZE)
+        ] or [([], [])]
+        self._firsts: List[str] = [keys[0] if keys else "" for keys, _ in self._chunks]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, record):
+        for key in name_keys(record.name):
+            # After any equal keys, like insertion order
+            index = max(bisect_right(self._firsts, key) - 1, 0)
+            keys, numbers = self._chunks[index]
+            position = bisect_right(keys, key)
+            keys.insert(position, key)
+            numbers.insert(position, record.number)
+            self._firsts[index] = keys[0]
+            if len(keys) > 2 * NAME_CHUNK_SIZE:
+                self._split(index)
+            self._size += 1
+
+    def remove(self, record):
+        # Must be called before the record's name changes
+        for key in name_keys(record.name):
+            for index, position in self._positions(key):
+                keys, numbers = self._chunks[index]
+                if keys[position] != key:
+                    break
+                if numbers[position] == record.number:
+                    del keys[position]
+                    del numbers[position]
+                    self._size -= 1
+                    if keys:
+                        self._firsts[index] = keys[0]
+                    elif len(self._chunks) > 1:
+                        del self._chunks[index]
+                        del self._firsts[index]
+                    break
+
+    def search(self, prefix: str, limit: int = 50) -> List[int]:
+        # Numbers of the records with a name key starting with `prefix`, in
+        # key order, each at most once
+        prefix = " ".join(tokenize(prefix))
+        if not prefix:
+            return []
+        found = {}
+        for index, position in self._positions(prefix):
+            keys, numbers = self._chunks[index]
+            if len(found) >= limit or not keys[position].startswith(prefix):
+                break
+            found.setdefault(numbers[position], None)
+        return list(found)
+
+    def _positions(self, key: str) -> Iterator[Tuple[int, int]]:
+        # (chunk, position) of every key from the first one >= `key` on
+        index = max(bisect_left(self._firsts, key) - 1, 0)
+        position = bisect_left(self._chunks[index][0], key)
+        for index in range(index, len(self._chunks)):
+            keys = self._chunks[index][0]
+            while position < len(keys):
+                yield index, position
+                position += 1
+            position = 0
+
+    def _split(self, index: int):
+        keys, numbers = self._chunks[index]
+        half = len(keys) // 2
+        self._chunks.insert(index + 1, (keys[half:], numbers[half:]))
+        del keys[half:]
+        del numbers[half:]
+        self._firsts.insert(index + 1, self._chunks[index + 1][0][0])
@@ -0,0 +1,34 @@
+# management/startup.py
+import json
+import time
+from typing import List, Tuple
+
+
+class StartupTimer:
+    # Wall-clock milestones of one application start (imports done, window
+    # shown, data loaded...), each with the time since the previous one and
+    # since the timer was created. Cheap enough to leave on; the report is
+    # only written when asked for.
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._last = self.started
+        self.milestones: List[Tuple[str, float, float]] = []
+
+    def mark(self, name: str):
+        now = time.perf_counter()
+        self.milestones.append((name, now - self._last, now - self.started))
+        self._last = now
+
+    def to_dict(self) -> dict:
+        return {
+            "total_seconds": self._last - self.started,
+            "milestones": [
+                {"name": name, "seconds": seconds, "elapsed_seconds": elapsed}
+                for name, seconds, elapsed in self.milestones
+            ],
+        }
+
+    def write(self, path: str):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=4)
+            f.write("\n")
@@ -1,37 +1,152 @@
 # models/appointment.py
+from models.doctor import ID_PREFIX as DOCTOR_PREFIX
+from models.fields import (
+    format_date,
+    format_id,
+    format_time,
+    parse_date,
+    parse_id,
+    parse_time,
+)
+from models.patient import ID_PREFIX as PATIENT_PREFIX
+from models.sequence import IdSequence
+from models.series import ID_PREFIX as SERIES_PREFIX
+
+ID_PREFIX = "A"
+
+# Used for records saved before appointments had a time slot
+DEFAULT_START_TIME = "09:00"
+DEFAULT_DURATION = 30  # minutes
 
 
 class Appointment:
-    _appointment_counter = 0  # Static member to keep track of appointment IDs
+    __slots__ = (
+        "number",
+        "doctor_number",
+        "patient_number",
+        "date_ordinal",
+        "start_minute",
+        "duration",
+        "series_number",  # 0 unless the appointment is part of a series
+    )
+
+    id_sequence = IdSequence()  # Shared by all appointments
 
     def __init__(
-        self, doctor_id: str, patient_id: str, date: str, appointment_id: str = None
+        self,
+        doctor_id: str,
+        patient_id: str,
+        date: str,
+        appointment_id: str = None,
+        start_time: str = DEFAULT_START_TIME,
+        duration: int = DEFAULT_DURATION,
+        series_id: str = "",
     ):
         if appointment_id:
-            self.appointment_id = appointment_id
-            current_id_num = int(appointment_id[1:])
-            if current_id_num > Appointment._appointment_counter:
-                Appointment._appointment_counter = current_id_num
+            self.number = parse_id(ID_PREFIX, appointment_id)
+            Appointment.id_sequence.advance(self.number)
         else:
-            Appointment._appointment_counter += 1
-            self.appointment_id = f"A{Appointment._appointment_counter}"
+            self.number = Appointment.id_sequence.next()
         self.doctor_id = doctor_id
         self.patient_id = patient_id
         self.date = date
+        self.start_time = start_time
+        self.duration = duration
+        self.series_id = series_id
+
+    @property
+    def appointment_id(self) -> str:
+        return format_id(ID_PREFIX, self.number)
+
+    @property
+    def doctor_id(self) -> str:
+        return format_id(DOCTOR_PREFIX, self.doctor_number)
+
+    @doctor_id.setter
+    def doctor_id(self, value: str):
+        self.doctor_number = parse_id(DOCTOR_PREFIX, value)
+
+    @property
+    def patient_id(self) -> str:
+        return format_id(PATIENT_PREFIX, self.patient_number)
+
+    @patient_id.setter
+    def patient_id(self, value: str):
+        self.patient_number = parse_id(PATIENT_PREFIX, value)
+
+    @property
+    def date(self) -> str:
+        return format_date(self.date_ordinal)
+
+    @date.setter
+    def date(self, value: str):
+        self.date_ordinal = parse_date(value)
+
+    @property
+    def series_id(self) -> str:
+        return (
+            format_id(SERIES_PREFIX, self.series_number) if self.series_number else ""
+        )
+
+    @series_id.setter
+    def series_id(self, value: str):
+        self.series_number = parse_id(SERIES_PREFIX, value) if value else 0
+
+    @property
+    def start_time(self) -> str:
+        return format_time(self.start_minute)
+
+    @start_time.setter
+    def start_time(self, value: str):
+        self.start_minute = parse_time(value)
+
+    @property
+    def end_time(self) -> str:
+        return format_time(self.start_minute + self.duration)
 
     def display_info(self):
         print(
             f"Appointment ID: {self.appointment_id}, Doctor ID: {self.doctor_id}, "
-            f"Patient ID: {self.patient_id}, Date: {self.date}"
+            f"Patient ID: {self.patient_id}, Date: {self.date}, "
+            f"Time: {self.start_time}-{self.end_time}"
         )
 
     def to_dict(self):
-        return {
+        record = {
             "appointment_id": self.appointment_id,
             "doctor_id": self.doctor_id,
             "patient_id": self.patient_id,
             "date": self.date,
+            "start_time": self.start_time,
+            "duration": self.duration,
         }
+        # Left out for standalone appointments, like records that predate
+        # series
+        if self.series_number:
+            record["series_id"] = self.series_id
+        return record
+
+    @staticmethod
+    def from_fields(
+        number: int,
+        doctor_number: int,
+        patient_number: int,
+        date_ordinal: int,
+        start_minute: int,
+        duration: int,
+        series_number: int = 0,
+    ):
+        # Fast path for storage that already holds numeric IDs and ordinals
+        appointment = Appointment.__new__(Appointment)
+        appointment.number = number
+        appointment.doctor_number = doctor_number
+        appointment.patient_number = patient_number
+        appointment.date_ordinal = date_ordinal
+        appointment.start_minute = start_minute
+        appointment.duration = duration
+        appointment.series_number = series_number
+        Appointment.id_sequence.advance(number)
+        return appointment
 
     @staticmethod
     def from_dict(data: dict):
@@ -40,4 +155,7 @@ class Appointment:
             patient_id=data["patient_id"],
             date=data["date"],
             appointment_id=data["appointment_id"],
+            start_time=data.get("start_time", DEFAULT_START_TIME),
+            duration=data.get("duration", DEFAULT_DURATION),
+            series_id=data.get("series_id", ""),
         )
@@ -1,7 +1,11 @@
 # models/doctor.py
 from enum import Enum
 
+from models.fields import format_id, parse_id
 from models.human import Human
+from models.sequence import IdSequence
+
+ID_PREFIX = "D"
 
 
 class Specialization(Enum):
@@ -13,7 +17,9 @@ class Specialization(Enum):
 
 
 class Doctor(Human):
-    _doc_counter = 0  # Static member to keep track of doctor IDs
+    __slots__ = ("number", "specialization", "password")
+
+    id_sequence = IdSequence()  # Shared by all doctors
 
     def __init__(
         self,
@@ -25,16 +31,17 @@ class Doctor(Human):
     ):
         super().__init__(name, age)
         if id:
-            self.id = id
-            current_id_num = int(id[1:])
-            if current_id_num > Doctor._doc_counter:
-                Doctor._doc_counter = current_id_num
+            self.number = parse_id(ID_PREFIX, id)
+            Doctor.id_sequence.advance(self.number)
         else:
-            Doctor._doc_counter += 1
-            self.id = f"D{Doctor._doc_counter}"
+            self.number = Doctor.id_sequence.next()
         self.specialization = specialization
         self.password = password  # In a real system, passwords should be hashed
 
+    @property
+    def id(self) -> str:
+        return format_id(ID_PREFIX, self.number)
+
     def display_info(self):
         print(
             f"Doctor ID: {self.id}, Name: {self.name}, Age: {self.age}, "
@@ -50,6 +57,23 @@ class Doctor(Human):
             "password": self.password,
         }
 
+    @staticmethod
+    def from_fields(
+        number: int,
+        name: str,
+        age: int,
+        specialization: Specialization,
+        password: str,
+    ):
+        # Fast path for storage that already holds the numeric ID
+        doctor = Doctor.__new__(Doctor)
+        Human.__init__(doctor, name, age)
+        doctor.number = number
+        doctor.specialization = specialization
+        doctor.password = password
+        Doctor.id_sequence.advance(number)
+        return doctor
+
     @staticmethod
     def from_dict(data: dict):
         specialization = Specialization(data["specialization"])
@@ -0,0 +1,54 @@
+# models/fields.py
+import sys
+from datetime import date as _date
+
+# Records keep IDs as plain integers and dates as proleptic Gregorian
+# ordinals; the "D12" / "2024-12-21" string forms only exist at the edges
+# (UI, JSON, storage).
+
+
+def format_id(prefix: str, number: int) -> str:
+    return f"{prefix}{number}"
+
+
+def parse_id(prefix: str, value: str) -> int:
+    if isinstance(value, str) and value.startswith(prefix):
+        number = value[len(prefix) :]
+        if number.isdigit():
+            return int(number)
+    raise ValueError(f"Invalid ID {value!r}: expected {prefix!r} and a number.")
+
+
+def try_parse_id(prefix: str, value: str):
+    try:
+        return parse_id(prefix, value)
+    except ValueError:
+        return None
+
+
+def format_date(ordinal: int) -> str:
+    return _date.fromordinal(ordinal).isoformat()
+
+
+def parse_date(value: str) -> int:
+    return _date.fromisoformat(value).toordinal()
+
+
+def format_time(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def parse_time(value: str) -> int:
+    # "HH:MM" -> minutes since midnight
+    hours, _, minutes = value.partition(":")
+    if not (hours.isdigit() and minutes.isdigit()):
+        raise ValueError(f"Invalid time {value!r}: expected HH:MM.")
+    total = int(hours) * 60 + int(minutes)
+    if int(minutes) >= 60 or total >= 24 * 60:
+        raise ValueError(f"Invalid time {value!r}.")
+    return total
+
+
+def intern_text(value: str) -> str:
+    # Names and histories repeat a lot across records; share one copy
+    return sys.intern(value) if isinstance(value, str) else value
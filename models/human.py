@@ -1,10 +1,24 @@
 # models/human.py
 from abc import ABC, abstractmethod
 
+from models.fields import intern_text
+
+
+def check_name(value: str):
+    if not value:
+        raise ValueError("Name cannot be empty.")
+
+
+def check_age(value: int):
+    if value <= 0:
+        raise ValueError("Age must be positive.")
+
 
 class Human(ABC):
+    __slots__ = ("_name", "_age")
+
     def __init__(self, name: str, age: int):
-        self._name = name
+        self._name = intern_text(name)
         self._age = age
 
     @property
@@ -13,9 +27,8 @@ class Human(ABC):
 
     @name.setter
     def name(self, value: str):
-        if not value:
-            raise ValueError("Name cannot be empty.")
-        self._name = value
+        check_name(value)
+        self._name = intern_text(value)
 
     @property
     def age(self) -> int:
@@ -23,8 +36,7 @@ class Human(ABC):
 
     @age.setter
     def age(self, value: int):
-        if value <= 0:
-            raise ValueError("Age must be positive.")
+        check_age(value)
         self._age = value
 
     @abstractmethod
@@ -1,24 +1,39 @@
 # models/patient.py
+from models.fields import format_id, intern_text, parse_id
 from models.human import Human
+from models.sequence import IdSequence
+
+ID_PREFIX = "P"
 
 
 class Patient(Human):
-    _patient_counter = 0  # Static member to keep track of patient IDs
+    __slots__ = ("number", "_medical_history")
+
+    id_sequence = IdSequence()  # Shared by all patients
 
     def __init__(
         self, name: str, age: int, medical_history: str, patient_id: str = None
     ):
         super().__init__(name, age)
         if patient_id:
-            self.patient_id = patient_id
-            current_id_num = int(patient_id[1:])
-            if current_id_num > Patient._patient_counter:
-                Patient._patient_counter = current_id_num
+            self.number = parse_id(ID_PREFIX, patient_id)
+            Patient.id_sequence.advance(self.number)
         else:
-            Patient._patient_counter += 1
-            self.patient_id = f"P{Patient._patient_counter}"
+            self.number = Patient.id_sequence.next()
         self.medical_history = medical_history
 
+    @property
+    def patient_id(self) -> str:
+        return format_id(ID_PREFIX, self.number)
+
+    @property
+    def medical_history(self) -> str:
+        return self._medical_history
+
+    @medical_history.setter
+    def medical_history(self, value: str):
+        self._medical_history = intern_text(value)
+
     def display_info(self):
         print(
             f"Patient ID: {self.patient_id}, Name: {self.name}, Age: {self.age}, "
@@ -33,6 +48,16 @@ class Patient(Human):
             "medical_history": self.medical_history,
         }
 
+    @staticmethod
+    def from_fields(number: int, name: str, age: int, medical_history: str):
+        # Fast path for storage that already holds the numeric ID
+        patient = Patient.__new__(Patient)
+        Human.__init__(patient, name, age)
+        patient.number = number
+        patient._medical_history = intern_text(medical_history)
+        Patient.id_sequence.advance(number)
+        return patient
+
     @staticmethod
     def from_dict(data: dict):
         return Patient(
@@ -0,0 +1,28 @@
+# models/sequence.py
+import threading
+
+
+class IdSequence:
+    # Thread-safe source of the numeric part of record IDs. Loaded records
+    # advance it past their own number so new IDs never collide with them.
+    def __init__(self, value: int = 0):
+        self._lock = threading.Lock()
+        self._value = value
+
+    @property
+    def value(self) -> int:
+        # The highest number handed out or seen so far
+        return self._value
+
+    def next(self) -> int:
+        with self._lock:
+            self._value += 1
+            return self._value
+
+    def advance(self, number: int):
+        # Plain reads are enough to skip the lock in the common case of
+        # loading records below the current value
+        if number > self._value:
+            with self._lock:
+                if number > self._value:
+                    self._value = number
@@ -0,0 +1,238 @@
+# models/series.py
+from calendar import monthrange
+from datetime import MAXYEAR
+from datetime import date as _date
+from typing import List
+
+from models.doctor import ID_PREFIX as DOCTOR_PREFIX
+from models.fields import (
+    format_date,
+    format_id,
+    format_time,
+    parse_date,
+    parse_id,
+    parse_time,
+)
+from models.patient import ID_PREFIX as PATIENT_PREFIX
+from models.sequence import IdSequence
+
+ID_PREFIX = "S"
+
+WEEKLY = "weekly"
+MONTHLY = "monthly"
+FREQUENCIES = (WEEKLY, MONTHLY)
+MAX_OCCURRENCES = 520  # ten years of weekly visits
+
+
+def occurrence_ordinals(
+    first_ordinal: int, frequency: str, interval: int, count: int, until_ordinal: int
+) -> List[int]:
+    # Dates (as ordinals) of a recurrence rule in the spirit of RFC 5545's
+    # RRULE: every `interval` weeks or months from the first date, stopping
+    # after `count` occurrences or after `until`, whichever comes first (0
+    # leaves either open, but not both). Monthly dates keep the day of the
+    # month and skip months without it, e.g. the 31st.
+    if frequency not in FREQUENCIES:
+        raise ValueError(
+            f"Unknown frequency {frequency!r}: use {' or '.join(FREQUENCIES)}."
+        )
+    if interval < 1:
+        raise ValueError("The interval must be at least 1.")
+    if count < 0:
+        raise ValueError("The count cannot be negative.")
+    if not count and not until_ordinal:
+        raise ValueError("A series needs a count or an end date.")
+    if until_ordinal and until_ordinal < first_ordinal:
+        raise ValueError("A series cannot end before it starts.")
+
+    limit = count or MAX_OCCURRENCES + 1
+    ordinals = []
+    if frequency == WEEKLY:
+        ordinal = first_ordinal
+        while len(ordinals) < limit and (not until_ordinal or ordinal <= until_ordinal):
+            ordinals.append(ordinal)
+            ordinal += 7 * interval
+    else:
+        first = _date.fromordinal(first_ordinal)
+        months = first.year * 12 + first.month - 1
+        while len(ordinals) < limit:
+            year, month = divmod(months, 12)
+            months += interval
+            if year > MAXYEAR:
+                break
+            if first.day > monthrange(year, month + 1)[1]:
+                continue
+            ordinal = _date(year, month + 1, first.day).toordinal()
+            if until_ordinal and ordinal > until_ordinal:
+                break
+            ordinals.append(ordinal)
+    if len(ordinals) > MAX_OCCURRENCES:
+        raise ValueError(f"A series can have at most {MAX_OCCURRENCES} occurrences.")
+    return ordinals
+
+
+class AppointmentSeries:
+    # A recurrence rule for one doctor and patient. Its occurrences are
+    # ordinary Appointment records carrying the series number, so a single
+    # occurrence can still be moved or cancelled on its own.
+    __slots__ = (
+        "number",
+        "doctor_number",
+        "patient_number",
+        "start_ordinal",
+        "start_minute",
+        "duration",
+        "frequency",
+        "interval",
+        "count",
+        "until_ordinal",
+    )
+
+    id_sequence = IdSequence()  # Shared by all series
+
+    def __init__(
+        self,
+        doctor_id: str,
+        patient_id: str,
+        start_date: str,
+        start_time: str,
+        duration: int,
+        frequency: str,
+        interval: int = 1,
+        count: int = 0,
+        until: str = "",
+        series_id: str = None,
+    ):
+        if series_id:
+            self.number = parse_id(ID_PREFIX, series_id)
+            AppointmentSeries.id_sequence.advance(self.number)
+        else:
+            self.number = AppointmentSeries.id_sequence.next()
+        self.doctor_id = doctor_id
+        self.patient_id = patient_id
+        self.start_date = start_date
+        self.start_time = start_time
+        self.duration = duration
+        self.frequency = frequency
+        self.interval = interval
+        self.count = count
+        self.until = until
+
+    @property
+    def series_id(self) -> str:
+        return format_id(ID_PREFIX, self.number)
+
+    @property
+    def doctor_id(self) -> str:
+        return format_id(DOCTOR_PREFIX, self.doctor_number)
+
+    @doctor_id.setter
+    def doctor_id(self, value: str):
+        self.doctor_number = parse_id(DOCTOR_PREFIX, value)
+
+    @property
+    def patient_id(self) -> str:
+        return format_id(PATIENT_PREFIX, self.patient_number)
+
+    @patient_id.setter
+    def patient_id(self, value: str):
+        self.patient_number = parse_id(PATIENT_PREFIX, value)
+
+    @property
+    def start_date(self) -> str:
+        return format_date(self.start_ordinal)
+
+    @start_date.setter
+    def start_date(self, value: str):
+        self.start_ordinal = parse_date(value)
+
+    @property
+    def start_time(self) -> str:
+        return format_time(self.start_minute)
+
+    @start_time.setter
+    def start_time(self, value: str):
+        self.start_minute = parse_time(value)
+
+    @property
+    def until(self) -> str:
+        # "" when the series ends by count only
+        return format_date(self.until_ordinal) if self.until_ordinal else ""
+
+    @until.setter
+    def until(self, value: str):
+        self.until_ordinal = parse_date(value) if value else 0
+
+    def occurrence_ordinals(self) -> List[int]:
+        return occurrence_ordinals(
+            self.start_ordinal,
+            self.frequency,
+            self.interval,
+            self.count,
+            self.until_ordinal,
+        )
+
+    def display_info(self):
+        ends = f"{self.count} times" if self.count else f"until {self.until}"
+        print(
+            f"Series ID: {self.series_id}, Doctor ID: {self.doctor_id}, "
+            f"Patient ID: {self.patient_id}, {self.frequency} every "
+            f"{self.interval} from {self.start_date} at {self.start_time}, {ends}"
+        )
+
+    def to_dict(self):
+        return {
+            "series_id": self.series_id,
+            "doctor_id": self.doctor_id,
+            "patient_id": self.patient_id,
+            "start_date": self.start_date,
+            "start_time": self.start_time,
+            "duration": self.duration,
+            "frequency": self.frequency,
+            "interval": self.interval,
+            "count": self.count,
+            "until": self.until,
+        }
+
+    @staticmethod
+    def from_fields(
+        number: int,
+        doctor_number: int,
+        patient_number: int,
+        start_ordinal: int,
+        start_minute: int,
+        duration: int,
+        frequency: str,
+        interval: int,
+        count: int,
+        until_ordinal: int,
+    ):
+        # Fast path for storage that already holds numeric IDs and ordinals
+        series = AppointmentSeries.__new__(AppointmentSeries)
+        series.number = number
+        series.doctor_number = doctor_number
+        series.patient_number = patient_number
+        series.start_ordinal = start_ordinal
+        series.start_minute = start_minute
+        series.duration = duration
+        series.frequency = frequency
+        series.interval = interval
+        series.count = count
+        series.until_ordinal = until_ordinal
+        AppointmentSeries.id_sequence.advance(number)
+        return series
+
+    @staticmethod
+    def from_dict(data: dict):
+        return AppointmentSeries(
+            doctor_id=data["doctor_id"],
+            patient_id=data["patient_id"],
+            start_date=data["start_date"],
+            start_time=data["start_time"],
+            duration=data["duration"],
+            frequency=data["frequency"],
+            interval=data.get("interval", 1),
+            count=data.get("count", 0),
+            until=data.get("until", ""),
+            series_id=data["series_id"],
+        )
@@ -0,0 +1,39 @@
+# storage/backends.py
+import os
+
+from storage.base import COLLECTIONS, Storage
+from storage.json_storage import JournalStorage, JsonStorage
+
+STORAGE_BACKENDS = ("json", "journal", "sqlite", "binary")
+
+
+def create_storage(kind: str = "json", data_dir: str = ".") -> Storage:
+    if kind == "json":
+        return JsonStorage(data_dir)
+    if kind == "journal":
+        return JournalStorage(data_dir)
+    if kind == "sqlite":
+        from storage.sqlite_storage import SqliteStorage
+
+        storage = SqliteStorage(os.path.join(data_dir, "hospital.db"))
+        # First run against an existing JSON install: import it once
+        if storage.is_empty():
+            copy_storage(JsonStorage(data_dir), storage)
+        return storage
+    if kind == "binary":
+        from storage.binary_storage import BinaryStorage
+
+        storage = BinaryStorage(data_dir)
+        if not storage.exists():
+            copy_storage(JsonStorage(data_dir), storage)
+        return storage
+    raise ValueError(f"Unknown storage backend: {kind}")
+
+
+def copy_storage(source: Storage, target: Storage):
+    # Used to import from and export to the JSON files
+    for collection in COLLECTIONS:
+        target.save(collection, source.load(collection))
+    sequences = source.load_sequences()
+    if sequences:
+        target.save_sequences(sequences)
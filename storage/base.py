@@ -0,0 +1,108 @@
+# storage/base.py
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from models.appointment import DEFAULT_DURATION, DEFAULT_START_TIME
+
+INSERT = "insert"
+UPDATE = "update"
+DELETE = "delete"
+
+# Primary-key field of each persisted collection
+COLLECTION_KEYS = {
+    "doctors": "id",
+    "patients": "patient_id",
+    "appointments": "appointment_id",
+    "series": "series_id",
+}
+COLLECTIONS = tuple(COLLECTION_KEYS)
+
+# Fields added after the first release; older records may lack them
+FIELD_DEFAULTS = {
+    "doctors": {},
+    "patients": {},
+    "appointments": {
+        "start_time": DEFAULT_START_TIME,
+        "duration": DEFAULT_DURATION,
+        "series_id": "",
+    },
+    "series": {},
+}
+
+# A single mutation: (INSERT | UPDATE | DELETE, record dict). Deletes only need
+# the primary key in the record.
+Change = Tuple[str, dict]
+
+
+class Storage(ABC):
+    # Bytes this backend has written to disk so far, where it can tell
+    bytes_written = 0
+    # True for backends that implement query_appointments() and
+    # count_appointments() over their own indexes
+    indexed_queries = False
+    # True for backends whose save() and apply() return before the data is
+    # written, so bytes_written lags behind them
+    writes_behind = False
+
+    @abstractmethod
+    def load(self, collection: str) -> Iterator[dict]:
+        pass
+
+    def load_objects(self, collection: str, from_dict: Callable[[dict], object]):
+        # Model objects for a collection; backends that store typed fields can
+        # override this to skip the dict round trip
+        return map(from_dict, self.load(collection))
+
+    @abstractmethod
+    def save(self, collection: str, records: Iterable[dict]):
+        # Replace the whole collection
+        pass
+
+    @abstractmethod
+    def apply(
+        self,
+        collection: str,
+        changes: List[Change],
+        records: Callable[[], Iterable[dict]],
+    ):
+        # Persist a batch of mutations. `records` returns the full collection
+        # for backends that can only rewrite everything.
+        pass
+
+    def load_sequences(self) -> Dict[str, int]:
+        # Highest ID number handed out per collection. Loaded records restore
+        # the sequences too; this only matters once the newest record of a
+        # collection has been deleted, so its ID is not handed out again.
+        return {}
+
+    def save_sequences(self, sequences: Dict[str, int]):
+        pass
+
+    def count(self, collection: str) -> Optional[int]:
+        # Number of stored records, if the backend can tell without loading
+        return None
+
+    def query_appointments(
+        self,
+        doctor_id: Optional[str] = None,
+        patient_id: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[str]:
+        # IDs of the matching appointments ordered by date, start time and ID;
+        # only called when `indexed_queries` is set
+        raise NotImplementedError
+
+    def count_appointments(
+        self,
+        doctor_id: Optional[str] = None,
+        patient_id: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+    ) -> int:
+        raise NotImplementedError
+
+    def close(self):
+        pass
@@ -0,0 +1,354 @@
+# storage/binary_storage.py
+import mmap
+import os
+import struct
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+from models.appointment import ID_PREFIX as APPOINTMENT_PREFIX
+from models.appointment import Appointment
+from models.doctor import ID_PREFIX as DOCTOR_PREFIX
+from models.doctor import Doctor, Specialization
+from models.fields import (
+    format_date,
+    format_id,
+    format_time,
+    parse_date,
+    parse_id,
+    parse_time,
+)
+from models.patient import ID_PREFIX as PATIENT_PREFIX
+from models.patient import Patient
+from models.series import ID_PREFIX as SERIES_PREFIX
+from models.series import AppointmentSeries
+from storage.base import FIELD_DEFAULTS, Change, Storage
+from storage.json_storage import SEQUENCES_FILE, read_sequences, write_sequences
+
+# Snapshot file layout (little-endian), one file per collection:
+#   header  magic, version, record count, record size, heap offset, heap size
+#   records fixed-width rows, `count` of them
+#   heap    UTF-8 string bytes; rows reference strings as (offset, length)
+MAGIC = b"HMS1"
+VERSION = 3
+HEADER = struct.Struct("<4sIIIQQ")
+MAX_RECORDS = (1 << 32) - 1  # the header's record count is 32 bits
+
+SPECIALIZATIONS = list(Specialization)
+_SPEC_CODES = {spec.value: code for code, spec in enumerate(SPECIALIZATIONS)}
+
+
+class _Layout:
+    # How one collection maps to a fixed-width row. `fields` lists
+    # (name, kind) where kind is "id:<prefix>", "int", "str", "date", "time" or
+    # "spec";
+    # "str" takes two row slots (offset, length). A "?" in front of an id or
+    # date kind makes it optional: "" is stored as 0, which no ID or date
+    # ordinal uses. `build` turns a raw row into a model object without going
+    # through a dict.
+    # Each slot holds an unsigned integer of the width its format code gives
+    # (B 0..255, H 0..65535, I 0..4294967295), which bounds e.g. an age or
+    # series interval to 65535 and a collection's string heap to 4 GiB;
+    # write_snapshot() refuses values outside those ranges.
+    def __init__(self, fmt: str, fields: List[Tuple[str, str]], build: Callable):
+        self.row = struct.Struct(fmt)
+        self.fields = fields
+        self.build = build
+        self.slots = []
+        for name, kind in fields:
+            if kind == "str":
+                self.slots += [f"{name} (heap offset)", f"{name} (length)"]
+            else:
+                self.slots.append(name)
+        self.limits = [
+            (1 << (8 * struct.calcsize(code))) - 1 for code in fmt[1:] if code != "x"
+        ]
+
+    def pack(self, values: list, record: dict) -> bytes:
+        try:
+            return self.row.pack(*values)
+        except struct.error:
+            for slot, value, limit in zip(self.slots, values, self.limits):
+                if not 0 <= value <= limit:
+                    key = record.get(self.fields[0][0], "")
+                    raise ValueError(
+                        f"Cannot store {slot} = {value} of {key} in a binary "
+                        f"snapshot: it must be between 0 and {limit}."
+                    ) from None
+            raise
+
+
+LAYOUTS = {
+    "doctors": _Layout(
+        "<IHBxIIII",
+        [
+            ("id", "id:" + DOCTOR_PREFIX),
+            ("age", "int"),
+            ("specialization", "spec"),
+            ("name", "str"),
+            ("password", "str"),
+        ],
+        lambda table, row: Doctor.from_fields(
+            row[0],
+            table.string(row[3], row[4]),
+            row[1],
+            SPECIALIZATIONS[row[2]],
+            table.string(row[5], row[6]),
+        ),
+    ),
+    "patients": _Layout(
+        "<IHxxIIII",
+        [
+            ("patient_id", "id:" + PATIENT_PREFIX),
+            ("age", "int"),
+            ("name", "str"),
+            ("medical_history", "str"),
+        ],
+        lambda table, row: Patient.from_fields(
+            row[0], table.string(row[2], row[3]), row[1], table.string(row[4], row[5])
+        ),
+    ),
+    "appointments": _Layout(
+        "<IIIIHHI",
+        [
+            ("appointment_id", "id:" + APPOINTMENT_PREFIX),
+            ("doctor_id", "id:" + DOCTOR_PREFIX),
+            ("patient_id", "id:" + PATIENT_PREFIX),
+            ("date", "date"),
+            ("start_time", "time"),
+            ("duration", "int"),
+            ("series_id", "?id:" + SERIES_PREFIX),
+        ],
+        lambda table, row: Appointment.from_fields(*row),
+    ),
+    "series": _Layout(
+        "<IIIIHHIIHHI",
+        [
+            ("series_id", "id:" + SERIES_PREFIX),
+            ("doctor_id", "id:" + DOCTOR_PREFIX),
+            ("patient_id", "id:" + PATIENT_PREFIX),
+            ("start_date", "date"),
+            ("start_time", "time"),
+            ("duration", "int"),
+            ("frequency", "str"),
+            ("interval", "int"),
+            ("count", "int"),
+            ("until", "?date"),
+        ],
+        lambda table, row: AppointmentSeries.from_fields(
+            *row[:6], table.string(row[6], row[7]), *row[8:]
+        ),
+    ),
+}
+
+
+class SnapshotTable:
+    # Read-only view over a memory-mapped snapshot. Nothing is decoded up
+    # front; rows are unpacked and strings decoded when they are accessed.
+    def __init__(self, path: str, layout: _Layout):
+        self.layout = layout
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, row_size, heap_offset, heap_size = HEADER.unpack_from(
+            self._mmap, 0
+        )
+        if magic != MAGIC or version != VERSION or row_size != layout.row.size:
+            self.close()
+            raise ValueError(f"{path} is not a compatible snapshot.")
+        self._count = count
+        self._heap_offset = heap_offset
+        # Strings are deduplicated in the heap; decode each one only once
+        self._strings: Dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> dict:
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        offset = HEADER.size + index * self.layout.row.size
+        return self._decode(self.layout.row.unpack_from(self._mmap, offset))
+
+    def __iter__(self) -> Iterator[dict]:
+        for values in self.rows():
+            yield self._decode(values)
+
+    def rows(self) -> Iterator[tuple]:
+        # Raw row tuples straight from the mapping
+        end = HEADER.size + self._count * self.layout.row.size
+        rows = memoryview(self._mmap)[HEADER.size : end]
+        try:
+            yield from self.layout.row.iter_unpack(rows)
+        finally:
+            rows.release()
+
+    def objects(self) -> Iterator:
+        build = self.layout.build
+        for values in self.rows():
+            yield build(self, values)
+
+    def string(self, offset: int, length: int) -> str:
+        # An empty string shares its offset with the next string in the
+        # heap, so it must not go through the offset-keyed cache
+        if not length:
+            return ""
+        value = self._strings.get(offset)
+        if value is None:
+            start = self._heap_offset + offset
+            value = self._mmap[start : start + length].decode("utf-8")
+            self._strings[offset] = value
+        return value
+
+    def _decode(self, values: tuple) -> dict:
+        record = {}
+        position = 0
+        for name, kind in self.layout.fields:
+            if kind == "str":
+                record[name] = self.string(values[position], values[position + 1])
+                position += 2
+                continue
+            value = values[position]
+            position += 1
+            if kind[0] == "?":
+                if not value:
+                    record[name] = ""
+                    continue
+                kind = kind[1:]
+            if kind == "int":
+                record[name] = value
+            elif kind == "date":
+                record[name] = format_date(value)
+            elif kind == "time":
+                record[name] = format_time(value)
+            elif kind == "spec":
+                record[name] = SPECIALIZATIONS[value].value
+            else:
+                record[name] = format_id(kind[3:], value)
+        return record
+
+    def close(self):
+        self._mmap.close()
+        self._file.close()
+
+
+def write_snapshot(
+    path: str, layout: _Layout, records: Iterable[dict], defaults: dict
+) -> int:
+    heap = bytearray()
+    heap_offsets: Dict[str, Tuple[int, int]] = {}
+    rows = bytearray()
+
+    for record in records:
+        values = []
+        for name, kind in layout.fields:
+            value = record[name] if name in record else defaults[name]
+            if kind[0] == "?":
+                if not value:
+                    values.append(0)
+                    continue
+                kind = kind[1:]
+            if kind == "str":
+                # Repeated strings are stored once
+                location = heap_offsets.get(value)
+                if location is None:
+                    encoded = value.encode("utf-8")
+                    location = (len(heap), len(encoded))
+                    heap_offsets[value] = location
+                    heap += encoded
+                values.extend(location)
+            elif kind == "int":
+                values.append(value)
+            elif kind == "date":
+                values.append(parse_date(value))
+            elif kind == "time":
+                values.append(parse_time(value))
+            elif kind == "spec":
+                values.append(_SPEC_CODES[value])
+            else:
+                values.append(parse_id(kind[3:], value))
+        rows += layout.pack(values, record)
+
+    count = len(rows) // layout.row.size
+    if count > MAX_RECORDS:
+        raise ValueError(
+            f"Cannot store {count:,} records in a binary snapshot: "
+            f"the limit is {MAX_RECORDS:,}."
+        )
+    heap_offset = HEADER.size + len(rows)
+    header = HEADER.pack(MAGIC, VERSION, count, layout.row.size, heap_offset, len(heap))
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(rows)
+        f.write(heap)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return len(header) + len(rows) + len(heap)
+
+
+class BinaryStorage(Storage):
+    # Memory-mapped snapshot per collection (doctors.bin, ...). Every write
+    # rewrites the collection's snapshot, so it pairs with WriteBehindStorage
+    # to coalesce bursts. JSON stays available for export/import.
+    # load_data() still builds every model object, straight from the raw
+    # rows with no text parsing; decoding on access is only what
+    # open_table() offers to callers that read a few records.
+    def __init__(self, data_dir: str = "."):
+        self.data_dir = data_dir
+
+    def path(self, collection: str) -> str:
+        return os.path.join(self.data_dir, f"{collection}.bin")
+
+    def exists(self) -> bool:
+        return any(os.path.exists(self.path(c)) for c in LAYOUTS)
+
+    def open_table(self, collection: str) -> SnapshotTable:
+        return SnapshotTable(self.path(collection), LAYOUTS[collection])
+
+    def load(self, collection: str) -> Iterator[dict]:
+        if not os.path.exists(self.path(collection)):
+            return
+        table = self.open_table(collection)
+        try:
+            yield from table
+        finally:
+            table.close()
+
+    def load_objects(self, collection: str, from_dict: Callable[[dict], object]):
+        if not os.path.exists(self.path(collection)):
+            return
+        table = self.open_table(collection)
+        try:
+            yield from table.objects()
+        finally:
+            table.close()
+
+    def count(self, collection: str):
+        if not os.path.exists(self.path(collection)):
+            return 0
+        with open(self.path(collection), "rb") as f:
+            return HEADER.unpack(f.read(HEADER.size))[2]
+
+    def save(self, collection: str, records: Iterable[dict]):
+        self.bytes_written += write_snapshot(
+            self.path(collection),
+            LAYOUTS[collection],
+            records,
+            FIELD_DEFAULTS[collection],
+        )
+
+    def apply(
+        self,
+        collection: str,
+        changes: List[Change],
+        records: Callable[[], Iterable[dict]],
+    ):
+        self.save(collection, records())
+
+    def load_sequences(self) -> Dict[str, int]:
+        return read_sequences(os.path.join(self.data_dir, SEQUENCES_FILE))
+
+    def save_sequences(self, sequences: Dict[str, int]):
+        self.bytes_written += write_sequences(
+            os.path.join(self.data_dir, SEQUENCES_FILE), sequences
+        )
@@ -0,0 +1,71 @@
+# storage/journal.py
+import json
+import os
+from typing import Iterator, Tuple
+
+
+# Append-only log of mutations, one JSON record per line
+class Journal:
+    def __init__(self, path: str):
+        self.path = path
+        self._entries = 0
+        self._file = None
+        if os.path.exists(path):
+            self._recover()
+
+    def _recover(self):
+        # Counts the entries and cuts a torn last line left by a crash
+        # mid-append; otherwise the next append would extend the fragment
+        # and every entry written after it would be unreadable
+        complete = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                complete += len(line)
+                if line.strip():
+                    self._entries += 1
+            size = f.seek(0, os.SEEK_END)
+        if complete < size:
+            with open(self.path, "r+b") as f:
+                f.truncate(complete)
+
+    def __len__(self) -> int:
+        return self._entries
+
+    def append(self, op: str, record: dict) -> int:
+        # Flushed to the OS, so an entry survives the process crashing; call
+        # sync() for it to survive the machine crashing too
+        if self._file is None:
+            self._file = open(self.path, "a")
+        written = self._file.write(json.dumps({"op": op, "r": record}) + "\n")
+        self._file.flush()
+        self._entries += 1
+        return written
+
+    def sync(self):
+        if self._file is not None:
+            os.fsync(self._file.fileno())
+
+    def replay(self) -> Iterator[Tuple[str, dict]]:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A corrupt entry is skipped; the ones after it still count
+                    continue
+                yield entry["op"], entry["r"]
+
+    def truncate(self):
+        self.close()
+        with open(self.path, "w"):
+            pass
+        self._entries = 0
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
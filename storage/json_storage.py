@@ -0,0 +1,135 @@
+# storage/json_storage.py
+import json
+import os
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from storage.base import COLLECTION_KEYS, DELETE, Change, Storage
+from storage.journal import Journal
+from storage.json_stream import iter_json_array
+
+SEQUENCES_FILE = "sequences.json"
+
+
+def read_sequences(path: str) -> Dict[str, int]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def write_sequences(path: str, sequences: Dict[str, int]) -> int:
+    # Atomic like the snapshots; returns the bytes written
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(sequences, f, indent=4)
+        written = f.tell()
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return written
+
+
+class JsonStorage(Storage):
+    # One pretty-printed JSON array per collection, e.g. doctors.json
+    def __init__(self, data_dir: str = "."):
+        self.data_dir = data_dir
+
+    def path(self, collection: str) -> str:
+        return os.path.join(self.data_dir, f"{collection}.json")
+
+    def load(self, collection: str) -> Iterator[dict]:
+        path = self.path(collection)
+        if not os.path.exists(path):
+            return
+        with open(path, "r") as f:
+            yield from iter_json_array(f)
+
+    def save(self, collection: str, records: Iterable[dict]):
+        path = self.path(collection)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(list(records), f, indent=4)
+            self.bytes_written += f.tell()
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def apply(
+        self,
+        collection: str,
+        changes: List[Change],
+        records: Callable[[], Iterable[dict]],
+    ):
+        self.save(collection, records())
+
+    def load_sequences(self) -> Dict[str, int]:
+        return read_sequences(os.path.join(self.data_dir, SEQUENCES_FILE))
+
+    def save_sequences(self, sequences: Dict[str, int]):
+        self.bytes_written += write_sequences(
+            os.path.join(self.data_dir, SEQUENCES_FILE), sequences
+        )
+
+
+class JournalStorage(JsonStorage):
+    # JSON snapshots plus one append-only journal per collection. Mutations are
+    # appended to the journal; every `compact_every` entries the journal is
+    # folded into a fresh snapshot (written via atomic rename) and truncated.
+    # With `sync` each batch of appends is fsynced before apply() returns, so
+    # it survives power loss; without it, only a crash of the process.
+    def __init__(
+        self, data_dir: str = ".", compact_every: int = 1000, sync: bool = True
+    ):
+        super().__init__(data_dir)
+        self.compact_every = compact_every
+        self.sync = sync
+        self._journals: Dict[str, Journal] = {}
+
+    def journal(self, collection: str) -> Journal:
+        journal = self._journals.get(collection)
+        if journal is None:
+            journal = Journal(os.path.join(self.data_dir, f"{collection}.journal"))
+            self._journals[collection] = journal
+        return journal
+
+    def load(self, collection: str) -> Iterator[dict]:
+        # Only the journal, at most `compact_every` entries, is held in
+        # memory; the snapshot is streamed past it record by record
+        key = COLLECTION_KEYS[collection]
+        latest: Dict[str, Optional[dict]] = {}
+        for op, record in self.journal(collection).replay():
+            latest[record[key]] = None if op == DELETE else record
+        for record in super().load(collection):
+            if record[key] in latest:
+                record = latest.pop(record[key])
+                if record is None:
+                    continue
+            yield record
+        # Records the snapshot does not have yet
+        for record in latest.values():
+            if record is not None:
+                yield record
+
+    def save(self, collection: str, records: Iterable[dict]):
+        # Snapshot first, then drop the log: replaying a log that is already
+        # folded into the snapshot is harmless because records are keyed
+        super().save(collection, records)
+        self.journal(collection).truncate()
+
+    def apply(
+        self,
+        collection: str,
+        changes: List[Change],
+        records: Callable[[], Iterable[dict]],
+    ):
+        journal = self.journal(collection)
+        for op, record in changes:
+            self.bytes_written += journal.append(op, record)
+        if self.sync:
+            journal.sync()
+        if len(journal) >= self.compact_every:
+            self.save(collection, records())
+
+    def close(self):
+        for journal in self._journals.values():
+            journal.close()
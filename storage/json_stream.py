@@ -0,0 +1,51 @@
+# storage/json_stream.py
+import json
+from typing import IO, Iterator
+
+CHUNK_SIZE = 1 << 16
+
+
+def iter_json_array(f: IO[str], chunk_size: int = CHUNK_SIZE) -> Iterator[dict]:
+    # Yields the elements of a top-level JSON array one at a time, reading the
+    # file in chunks, so the whole list of dicts never exists at once
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+    started = False
+
+    while True:
+        # Skip whitespace and separators
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+            pos += 1
+
+        if pos < len(buffer):
+            if not started:
+                if buffer[pos] != "[":
+                    raise ValueError("Expected a JSON array.")
+                started = True
+                pos += 1
+                continue
+            if buffer[pos] == "]":
+                return
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                # A value touching the end of the buffer may be cut short
+                if end < len(buffer) or eof:
+                    yield value
+                    pos = end
+                    continue
+        elif eof:
+            if not started:
+                # Empty file
+                return
+            raise ValueError("Unterminated JSON array.")
+
+        chunk = f.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[pos:] + chunk
+        pos = 0
@@ -0,0 +1,274 @@
+# storage/sqlite_storage.py
+import sqlite3
+import threading
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from storage.base import DELETE, FIELD_DEFAULTS, Change, Storage
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS doctors (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    age INTEGER NOT NULL,
+    specialization TEXT NOT NULL,
+    password TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS patients (
+    patient_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    age INTEGER NOT NULL,
+    medical_history TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS appointments (
+    appointment_id TEXT PRIMARY KEY,
+    doctor_id TEXT NOT NULL,
+    patient_id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    start_time TEXT NOT NULL DEFAULT '09:00',
+    duration INTEGER NOT NULL DEFAULT 30,
+    series_id TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_appointments_doctor ON appointments (doctor_id, date);
+CREATE INDEX IF NOT EXISTS idx_appointments_patient ON appointments (patient_id, date);
+CREATE INDEX IF NOT EXISTS idx_appointments_date ON appointments (date);
+CREATE TABLE IF NOT EXISTS series (
+    series_id TEXT PRIMARY KEY,
+    doctor_id TEXT NOT NULL,
+    patient_id TEXT NOT NULL,
+    start_date TEXT NOT NULL,
+    start_time TEXT NOT NULL,
+    duration INTEGER NOT NULL,
+    frequency TEXT NOT NULL,
+    interval INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    until TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sequences (
+    collection TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+COLUMNS = {
+    "doctors": ("id", "name", "age", "specialization", "password"),
+    "patients": ("patient_id", "name", "age", "medical_history"),
+    "appointments": (
+        "appointment_id",
+        "doctor_id",
+        "patient_id",
+        "date",
+        "start_time",
+        "duration",
+        "series_id",
+    ),
+    "series": (
+        "series_id",
+        "doctor_id",
+        "patient_id",
+        "start_date",
+        "start_time",
+        "duration",
+        "frequency",
+        "interval",
+        "count",
+        "until",
+    ),
+}
+
+# Statements are built once and always executed with bound parameters, so
+# sqlite3's statement cache keeps them prepared across calls
+UPSERT_SQL = {
+    collection: "INSERT OR REPLACE INTO {} ({}) VALUES ({})".format(
+        collection, ", ".join(columns), ", ".join("?" * len(columns))
+    )
+    for collection, columns in COLUMNS.items()
+}
+DELETE_SQL = {
+    collection: f"DELETE FROM {collection} WHERE {columns[0]} = ?"
+    for collection, columns in COLUMNS.items()
+}
+SELECT_SQL = {
+    collection: "SELECT {} FROM {} ORDER BY rowid".format(
+        ", ".join(columns), collection
+    )
+    for collection, columns in COLUMNS.items()
+}
+
+
+class SqliteStorage(Storage):
+    indexed_queries = True
+
+    def __init__(self, path: str = "hospital.db"):
+        self.path = path
+        # The connection is shared with the write-behind thread
+        self._lock = threading.RLock()
+        # Autocommit mode; transactions are opened explicitly around batches
+        self._conn = sqlite3.connect(
+            path, isolation_level=None, check_same_thread=False, cached_statements=256
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        # Databases created before appointments had time slots
+        columns = {
+            row[1] for row in self._conn.execute("PRAGMA table_info(appointments)")
+        }
+        if "start_time" not in columns:
+            self._conn.execute(
+                "ALTER TABLE appointments "
+                "ADD COLUMN start_time TEXT NOT NULL DEFAULT '09:00'"
+            )
+        if "duration" not in columns:
+            self._conn.execute(
+                "ALTER TABLE appointments "
+                "ADD COLUMN duration INTEGER NOT NULL DEFAULT 30"
+            )
+        # ... and before appointment series
+        if "series_id" not in columns:
+            self._conn.execute(
+                "ALTER TABLE appointments ADD COLUMN series_id TEXT NOT NULL DEFAULT ''"
+            )
+
+    def is_empty(self) -> bool:
+        return not any(
+            self._conn.execute(f"SELECT 1 FROM {collection} LIMIT 1").fetchone()
+            for collection in COLUMNS
+        )
+
+    def load(self, collection: str) -> Iterator[dict]:
+        columns = COLUMNS[collection]
+        # Rows are streamed from the cursor instead of fetched all at once
+        for row in self._conn.execute(SELECT_SQL[collection]):
+            yield dict(zip(columns, row))
+
+    def save(self, collection: str, records: Iterable[dict]):
+        with self._transaction():
+            self._conn.execute(f"DELETE FROM {collection}")
+            self._conn.executemany(
+                UPSERT_SQL[collection],
+                (_row(collection, record) for record in records),
+            )
+
+    def apply(
+        self,
+        collection: str,
+        changes: List[Change],
+        records: Callable[[], Iterable[dict]],
+    ):
+        columns = COLUMNS[collection]
+        with self._transaction():
+            for op, record in changes:
+                if op == DELETE:
+                    self._conn.execute(DELETE_SQL[collection], (record[columns[0]],))
+                else:
+                    self._conn.execute(UPSERT_SQL[collection], _row(collection, record))
+
+    def load_sequences(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._conn.execute("SELECT collection, value FROM sequences"))
+
+    def save_sequences(self, sequences: Dict[str, int]):
+        with self._transaction():
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO sequences (collection, value) VALUES (?, ?)",
+                sequences.items(),
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def count(self, collection: str) -> int:
+        with self._lock:
+            sql = f"SELECT COUNT(*) FROM {collection}"
+            return self._conn.execute(sql).fetchone()[0]
+
+    # Indexed appointment queries, ordered by date, start time and ID
+    def query_appointments(
+        self,
+        doctor_id: Optional[str] = None,
+        patient_id: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[str]:
+        where, params = _appointment_filter(doctor_id, patient_id, date_from, date_to)
+        sql = (
+            f"SELECT appointment_id FROM appointments{where} "
+            "ORDER BY date, start_time, CAST(substr(appointment_id, 2) AS INTEGER) "
+            "LIMIT ? OFFSET ?"
+        )
+        params.extend([-1 if limit is None else limit, offset])
+        with self._lock:
+            return [row[0] for row in self._conn.execute(sql, params)]
+
+    def count_appointments(
+        self,
+        doctor_id: Optional[str] = None,
+        patient_id: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+    ) -> int:
+        where, params = _appointment_filter(doctor_id, patient_id, date_from, date_to)
+        with self._lock:
+            sql = f"SELECT COUNT(*) FROM appointments{where}"
+            return self._conn.execute(sql, params).fetchone()[0]
+
+    def _transaction(self):
+        return _Transaction(self._conn, self._lock)
+
+
+def _row(collection: str, record: dict) -> tuple:
+    defaults = FIELD_DEFAULTS[collection]
+    return tuple(
+        record[column] if column in record else defaults[column]
+        for column in COLUMNS[collection]
+    )
+
+
+def _appointment_filter(
+    doctor_id: Optional[str],
+    patient_id: Optional[str],
+    date_from: Optional[str],
+    date_to: Optional[str],
+) -> Tuple[str, list]:
+    # ISO dates compare correctly as text, so ranges can use the date indexes
+    clauses = []
+    params = []
+    if doctor_id is not None:
+        clauses.append("doctor_id = ?")
+        params.append(doctor_id)
+    if patient_id is not None:
+        clauses.append("patient_id = ?")
+        params.append(patient_id)
+    if date_from is not None:
+        clauses.append("date >= ?")
+        params.append(date_from)
+    if date_to is not None:
+        clauses.append("date <= ?")
+        params.append(date_to)
+    if not clauses:
+        return "", params
+    return " WHERE " + " AND ".join(clauses), params
+
+
+class _Transaction:
+    def __init__(self, conn: sqlite3.Connection, lock: threading.RLock):
+        self._conn = conn
+        self._lock = lock
+
+    def __enter__(self):
+        self._lock.acquire()
+        self._conn.execute("BEGIN")
+        return self._conn
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self._conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self._lock.release()
+        return False
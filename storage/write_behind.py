@@ -0,0 +1,178 @@
+# storage/write_behind.py
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from storage.base import Change, Storage
+
+
+class _Pending:
+    def __init__(self):
+        self.snapshot: Optional[List[dict]] = None
+        self.changes: List[Change] = []
+        self.records: Optional[Callable[[], Iterable[dict]]] = None
+
+
+class WriteBehindStorage(Storage):
+    # Wraps another backend and persists on a background thread. Mutations only
+    # mark their collection dirty; a burst of them is coalesced into a single
+    # flush `delay` seconds later that touches only the dirty collections.
+    writes_behind = True
+
+    def __init__(
+        self,
+        inner: Storage,
+        delay: float = 0.25,
+        on_flushed: Optional[Callable[[List[str]], None]] = None,
+        on_failed: Optional[Callable[[str, str], None]] = None,
+    ):
+        self.inner = inner
+        self.delay = delay
+        self.on_flushed = on_flushed
+        self.on_failed = on_failed
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._pending: Dict[str, _Pending] = {}
+        self._sequences: Optional[Dict[str, int]] = None
+        self._wake = False
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="write-behind", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def bytes_written(self) -> int:
+        return self.inner.bytes_written
+
+    def load(self, collection: str) -> Iterator[dict]:
+        return self.inner.load(collection)
+
+    def load_objects(self, collection: str, from_dict: Callable[[dict], object]):
+        return self.inner.load_objects(collection, from_dict)
+
+    def count(self, collection: str) -> Optional[int]:
+        return self.inner.count(collection)
+
+    def load_sequences(self) -> Dict[str, int]:
+        return self.inner.load_sequences()
+
+    @property
+    def indexed_queries(self) -> bool:
+        return self.inner.indexed_queries
+
+    # Queries see every change made so far: anything queued is written first
+    def query_appointments(self, *args, **kwargs) -> List[str]:
+        self.flush()
+        return self.inner.query_appointments(*args, **kwargs)
+
+    def count_appointments(self, *args, **kwargs) -> int:
+        self.flush()
+        return self.inner.count_appointments(*args, **kwargs)
+
+    def save_sequences(self, sequences: Dict[str, int]):
+        with self._cond:
+            self._sequences = dict(sequences)
+            self._notify()
+
+    def save(self, collection: str, records: Iterable[dict]):
+        with self._cond:
+            pending = self._pending.setdefault(collection, _Pending())
+            # A full snapshot supersedes anything queued before it
+            pending.snapshot = list(records)
+            pending.changes = []
+            self._notify()
+
+    def apply(
+        self,
+        collection: str,
+        changes: List[Change],
+        records: Callable[[], Iterable[dict]],
+    ):
+        with self._cond:
+            pending = self._pending.setdefault(collection, _Pending())
+            pending.changes.extend(changes)
+            pending.records = records
+            self._notify()
+
+    def is_dirty(self) -> bool:
+        with self._cond:
+            return bool(self._pending) or self._sequences is not None
+
+    def flush(self):
+        # Synchronously write everything that is queued
+        with self._flush_lock:
+            with self._cond:
+                pending, self._pending = self._pending, {}
+                sequences, self._sequences = self._sequences, None
+            if sequences is not None:
+                try:
+                    self.inner.save_sequences(sequences)
+                except Exception as exc:
+                    with self._cond:
+                        if self._sequences is None:
+                            self._sequences = sequences
+                    if self.on_failed is not None:
+                        self.on_failed("sequences", str(exc))
+            if not pending:
+                return
+
+            flushed = []
+            for collection, item in pending.items():
+                try:
+                    if item.snapshot is not None:
+                        self.inner.save(collection, item.snapshot)
+                    if item.changes:
+                        self.inner.apply(collection, item.changes, item.records)
+                except Exception as exc:
+                    self._requeue(collection, item)
+                    if self.on_failed is not None:
+                        self.on_failed(collection, str(exc))
+                else:
+                    flushed.append(collection)
+
+            if flushed and self.on_flushed is not None:
+                self.on_flushed(flushed)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        self.flush()
+        self.inner.close()
+
+    def _notify(self):
+        self._wake = True
+        self._cond.notify()
+
+    def _requeue(self, collection: str, item: _Pending):
+        # Put a failed batch back in front of anything queued since, without
+        # waking the worker; the next mutation or close() retries it
+        with self._cond:
+            newer = self._pending.get(collection)
+            if newer is not None and newer.snapshot is not None:
+                return
+            if newer is not None:
+                item.changes.extend(newer.changes)
+                item.records = newer.records
+            self._pending[collection] = item
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._wake and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                # Let the rest of the burst arrive before writing
+                deadline = time.monotonic() + self.delay
+                while not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if self._closed:
+                    return
+                self._wake = False
+            self.flush()
@@ -0,0 +1,13 @@
+# tests/conftest.py
+import os
+
+import pytest
+
+# Qt widgets and models are tested without a display
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+@pytest.fixture(scope="session")
+def qt_app():
+    widgets = pytest.importorskip("PySide6.QtWidgets")
+    return widgets.QApplication.instance() or widgets.QApplication([])
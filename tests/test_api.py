@@ -0,0 +1,191 @@
+# tests/test_api.py
+import asyncio
+import json
+
+import pytest
+
+from api.server import MAX_LIMIT, HospitalService, Request, encode_response
+from management.hospital_management import HospitalManagement
+from storage.json_storage import JsonStorage
+
+
+@pytest.fixture
+def service(tmp_path):
+    return HospitalService(HospitalManagement(JsonStorage(str(tmp_path))))
+
+
+def call(service, method: str, target: str, body=None):
+    data = json.dumps(body).encode("utf-8") if body is not None else b""
+    return service.respond(Request(method, target, {}, data))
+
+
+@pytest.fixture
+def booked(service):
+    _, doctor = call(
+        service,
+        "POST",
+        "/doctors",
+        {"name": "Dana Lee", "age": 50, "specialization": "General", "password": "pw"},
+    )
+    _, patient = call(service, "POST", "/patients", {"name": "Alice Smith", "age": 40})
+    status, appointment = call(
+        service,
+        "POST",
+        "/appointments",
+        {
+            "doctor_id": doctor["id"],
+            "patient_id": patient["patient_id"],
+            "date": "2025-03-03",
+            "start_time": "10:00",
+        },
+    )
+    assert status == 201
+    return doctor, patient, appointment
+
+
+def test_doctors_and_patients(service, booked):
+    doctor, patient, _ = booked
+    assert "password" not in doctor
+    assert call(service, "GET", f"/doctors/{doctor['id']}") == (200, doctor)
+    assert call(service, "GET", "/patients/") == (200, [patient])
+    assert call(service, "GET", "/patients?q=ali") == (200, [patient])
+    assert call(service, "GET", "/doctors?q=lee") == (200, [doctor])
+    assert call(service, "GET", "/health") == (
+        200,
+        {"doctors": 1, "patients": 1, "appointments": 1, "series": 0},
+    )
+
+
+def test_list_paging(service):
+    for number in range(5):
+        call(service, "POST", "/patients", {"name": f"Patient {number}", "age": 30})
+    status, page = call(service, "GET", "/patients?offset=1&limit=2")
+    assert status == 200
+    assert [patient["name"] for patient in page] == ["Patient 1", "Patient 2"]
+    _, page = call(service, "GET", f"/patients?limit={MAX_LIMIT + 1}")
+    assert len(page) == 5
+
+
+def test_appointments(service, booked):
+    doctor, patient, appointment = booked
+    appointment_id = appointment["appointment_id"]
+    assert call(service, "GET", f"/appointments?doctor_id={doctor['id']}") == (
+        200,
+        [appointment],
+    )
+    assert call(service, "GET", "/appointments?date_from=2025-03-04") == (200, [])
+
+    status, moved = call(
+        service,
+        "PUT",
+        f"/appointments/{appointment_id}",
+        {
+            "doctor_id": doctor["id"],
+            "patient_id": patient["patient_id"],
+            "date": "2025-03-04",
+        },
+    )
+    assert status == 200
+    assert (moved["date"], moved["start_time"]) == ("2025-03-04", "10:00")
+
+    assert call(service, "DELETE", f"/appointments/{appointment_id}") == (
+        200,
+        {"deleted": appointment_id},
+    )
+    assert call(service, "GET", f"/appointments/{appointment_id}")[0] == 404
+
+
+def test_series(service, booked):
+    doctor, patient, _ = booked
+    status, series = call(
+        service,
+        "POST",
+        "/series",
+        {
+            "doctor_id": doctor["id"],
+            "patient_id": patient["patient_id"],
+            "start_date": "2025-03-10",
+            "frequency": "weekly",
+            "count": 3,
+        },
+    )
+    assert status == 201
+    assert [occurrence["date"] for occurrence in series["appointments"]] == [
+        "2025-03-10",
+        "2025-03-17",
+        "2025-03-24",
+    ]
+    series_id = series["series_id"]
+    _, updated = call(service, "PUT", f"/series/{series_id}", {"start_time": "14:00"})
+    assert {occurrence["start_time"] for occurrence in updated["appointments"]} == {
+        "14:00"
+    }
+    assert call(service, "DELETE", f"/series/{series_id}?from_date=2025-03-17") == (
+        200,
+        {"cancelled": series_id, "from_date": "2025-03-17"},
+    )
+    _, kept = call(service, "GET", f"/series/{series_id}")
+    assert [occurrence["date"] for occurrence in kept["appointments"]] == ["2025-03-10"]
+
+
+@pytest.mark.parametrize(
+    "method, target, body, status",
+    [
+        ("GET", "/nowhere", None, 404),
+        ("PATCH", "/patients", None, 405),
+        ("GET", "/patients/P999", None, 404),
+        ("GET", "/patients?limit=-1", None, 400),
+        ("POST", "/patients", {"name": "Bob"}, 400),
+        ("POST", "/patients", {"name": "Bob", "age": True}, 400),
+        ("POST", "/patients", ["not", "an", "object"], 400),
+        ("GET", "/appointments?date_from=03/03/2025", None, 400),
+    ],
+)
+def test_errors(service, method, target, body, status):
+    code, payload = call(service, method, target, body)
+    assert code == status
+    assert payload["error"]
+
+
+def test_double_booking_is_a_conflict(service, booked):
+    doctor, patient, appointment = booked
+    status, payload = call(
+        service,
+        "POST",
+        "/appointments",
+        {
+            "doctor_id": doctor["id"],
+            "patient_id": patient["patient_id"],
+            "date": appointment["date"],
+            "start_time": appointment["start_time"],
+        },
+    )
+    assert status == 409
+
+
+def test_keep_alive_connection(service):
+    async def exchange():
+        server = await asyncio.start_server(service.handle_connection, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            body = json.dumps({"name": "Alice Smith", "age": 40}).encode("utf-8")
+            writer.write(
+                b"POST /patients HTTP/1.1\r\n"
+                b"Content-Length: %d\r\n\r\n%s" % (len(body), body)
+            )
+            writer.write(b"GET /health HTTP/1.1\r\nConnection: close\r\n\r\n")
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            return response
+
+    response = asyncio.run(exchange())
+    first, second = response.split(b"HTTP/1.1 ")[1:]
+    assert first.startswith(b"201 Created")
+    assert b'"name": "Alice Smith"' in first
+    assert b"HTTP/1.1 " + second == encode_response(
+        200,
+        {"doctors": 0, "patients": 1, "appointments": 0, "series": 0},
+        keep_alive=False,
+    )
@@ -0,0 +1,153 @@
+# tests/test_binary_storage.py
+import struct
+
+import pytest
+
+from models.appointment import Appointment
+from models.doctor import Doctor
+from models.patient import Patient
+from models.series import AppointmentSeries
+from storage.binary_storage import HEADER, BinaryStorage
+
+RECORDS = {
+    "doctors": [
+        {
+            "id": "D1",
+            "name": "Dana Lee",
+            "age": 50,
+            "specialization": "Cardiologist",
+            "password": "pw",
+        },
+        {
+            "id": "D7",
+            "name": "Ünal Özdemir",
+            "age": 61,
+            "specialization": "General",
+            "password": "pw",
+        },
+    ],
+    "patients": [
+        {"patient_id": "P1", "name": "Alice", "age": 40, "medical_history": ""},
+        {"patient_id": "P3", "name": "Bob", "age": 9, "medical_history": "asthma"},
+        {"patient_id": "P4", "name": "Alice", "age": 3, "medical_history": "asthma"},
+    ],
+    "appointments": [
+        {
+            "appointment_id": "A1",
+            "doctor_id": "D1",
+            "patient_id": "P1",
+            "date": "2025-01-06",
+            "start_time": "09:00",
+            "duration": 30,
+        },
+        {
+            "appointment_id": "A2",
+            "doctor_id": "D7",
+            "patient_id": "P3",
+            "date": "2025-02-28",
+            "start_time": "16:45",
+            "duration": 60,
+            "series_id": "S1",
+        },
+    ],
+    "series": [
+        {
+            "series_id": "S1",
+            "doctor_id": "D7",
+            "patient_id": "P3",
+            "start_date": "2025-02-28",
+            "start_time": "16:45",
+            "duration": 60,
+            "frequency": "monthly",
+            "interval": 1,
+            "count": 0,
+            "until": "2025-12-31",
+        },
+    ],
+}
+MODELS = {
+    "doctors": Doctor,
+    "patients": Patient,
+    "appointments": Appointment,
+    "series": AppointmentSeries,
+}
+
+
+@pytest.fixture
+def storage(tmp_path):
+    storage = BinaryStorage(str(tmp_path))
+    for collection, records in RECORDS.items():
+        storage.save(collection, records)
+    return storage
+
+
+@pytest.mark.parametrize("collection", list(RECORDS))
+def test_round_trip(storage, collection):
+    # Loaded dicts carry every column, e.g. an empty series_id
+    from_dict = MODELS[collection].from_dict
+    loaded = [from_dict(record).to_dict() for record in storage.load(collection)]
+    assert loaded == [from_dict(record).to_dict() for record in RECORDS[collection]]
+    assert storage.count(collection) == len(loaded)
+
+
+@pytest.mark.parametrize("collection", list(RECORDS))
+def test_objects_match_dict_path(storage, collection):
+    # load_objects builds models straight from the rows
+    from_dict = MODELS[collection].from_dict
+    built = storage.load_objects(collection, from_dict)
+    assert [record.to_dict() for record in built] == [
+        from_dict(record).to_dict() for record in storage.load(collection)
+    ]
+
+
+def test_random_access_and_string_sharing(storage):
+    table = storage.open_table("patients")
+    try:
+        assert table[2]["name"] == "Alice"
+        with pytest.raises(IndexError):
+            table[3]
+    finally:
+        table.close()
+    # "Alice" and "asthma" are each stored once in the heap
+    with open(storage.path("patients"), "rb") as f:
+        *_, heap_size = HEADER.unpack(f.read(HEADER.size))
+    assert heap_size == len("Alice" "Bob" "asthma")
+
+
+def test_missing_collection_is_empty(tmp_path):
+    storage = BinaryStorage(str(tmp_path))
+    assert list(storage.load("patients")) == []
+    assert storage.count("patients") == 0
+    assert not storage.exists()
+
+
+def test_other_versions_are_rejected(storage):
+    path = storage.path("doctors")
+    with open(path, "r+b") as f:
+        f.seek(4)
+        f.write(struct.pack("<I", 2))
+    with pytest.raises(ValueError, match="compatible"):
+        list(storage.load("doctors"))
+
+
+@pytest.mark.parametrize(
+    "collection, field, value, slot",
+    [
+        ("series", "interval", 70000, "interval"),
+        ("series", "count", 1 << 16, "count"),
+        ("appointments", "duration", 1 << 16, "duration"),
+        ("patients", "age", 1 << 16, "age"),
+    ],
+)
+def test_values_too_wide_for_their_slot_are_refused(
+    tmp_path, collection, field, value, slot
+):
+    storage = BinaryStorage(str(tmp_path))
+    storage.save(collection, RECORDS[collection])
+    records = [dict(record) for record in RECORDS[collection]]
+    records[-1][field] = value
+
+    with pytest.raises(ValueError, match=f"{slot} = {value} of"):
+        storage.save(collection, records)
+    # The previous snapshot is left as it was
+    assert list(storage.load(collection))[-1][field] == RECORDS[collection][-1][field]
@@ -0,0 +1,130 @@
+# tests/test_bulk_import.py
+import io
+import json
+
+import pytest
+
+import main
+from management.bulk_import import BulkImporter
+from management.hospital_management import ID_SEQUENCES, HospitalManagement
+from models.doctor import Specialization
+from storage.json_storage import JsonStorage
+
+
+@pytest.fixture
+def hospital_mgmt(tmp_path, monkeypatch):
+    for sequence in ID_SEQUENCES.values():
+        monkeypatch.setattr(sequence, "_value", 0)
+    return HospitalManagement(JsonStorage(str(tmp_path)))
+
+
+def reasons(report) -> dict:
+    return dict(report.rejected)
+
+
+def test_rejected_patient_rows_take_no_ids(hospital_mgmt, tmp_path):
+    hospital_mgmt.add_patient("Existing", 50, "")
+    rows = (
+        "name,age,medical_history\n"
+        "Alice Smith,40,asthma\n"
+        ",30,\n"
+        "Bob Jones,abc,\n"
+        "Carol White,0,\n"
+        "Dan Brown,25,\n"
+    )
+    report = BulkImporter(hospital_mgmt).import_patients(io.StringIO(rows))
+
+    assert report.accepted == 2
+    assert reasons(report) == {
+        3: "missing name",
+        4: "age is not a number",
+        5: "age must be positive",
+    }
+    assert [patient.patient_id for patient in hospital_mgmt.patients] == [
+        "P1",
+        "P2",
+        "P3",
+    ]
+    assert ID_SEQUENCES["patients"].value == 3
+    with open(tmp_path / "patients.json") as f:
+        assert [record["name"] for record in json.load(f)][1:] == [
+            "Alice Smith",
+            "Dan Brown",
+        ]
+
+
+def test_given_and_duplicate_doctor_ids(hospital_mgmt):
+    rows = "\n".join(
+        json.dumps({"age": 40, "password": "pw", **row})
+        for row in [
+            {"id": "D5", "name": "A", "specialization": "Surgeon"},
+            {"name": "B", "specialization": "Surgeon"},
+            {"id": "D9", "name": "C", "specialization": "Dentist"},
+            {"id": "D5", "name": "D", "specialization": "General"},
+            {"id": "X7", "name": "E", "specialization": "General"},
+        ]
+    )
+    report = BulkImporter(hospital_mgmt).import_doctors(io.StringIO(rows), "jsonl")
+
+    assert [doctor.id for doctor in hospital_mgmt.doctors] == ["D5", "D6"]
+    assert reasons(report) == {
+        3: "unknown specialization 'Dentist'",
+        4: "duplicate ID D5",
+        5: "Invalid ID 'X7': expected 'D' and a number.",
+    }
+    # The rejected D9 did not move the sequence past it
+    assert ID_SEQUENCES["doctors"].value == 6
+
+
+def test_appointment_references_and_conflicts(hospital_mgmt):
+    doctor = hospital_mgmt.add_doctor("Dana Lee", 50, Specialization.GENERAL, "pw")
+    patient = hospital_mgmt.add_patient("Alice Smith", 40, "")
+    hospital_mgmt.book_appointment(doctor.id, patient.patient_id, "2025-03-03")
+    rows = (
+        "appointment_id,doctor_id,patient_id,date,start_time,duration\n"
+        ",D1,P1,2025-03-03,10:00,30\n"
+        "A20,D2,P1,2025-03-03,11:00,30\n"
+        ",D1,P9,2025-03-03,11:00,30\n"
+        ",D1,P1,2025-03-03,09:15,15\n"
+        ",D1,P1,2025-03-03,10:15,30\n"
+        ",D1,P1,2025-03-03,10:05,30\n"
+        ",D1,P1,2025-13-03,11:00,30\n"
+        "A1,D1,P1,2025-03-04,11:00,30\n"
+        ",D1,P1,2025-03-03,11:00,30\n"
+    )
+    report = BulkImporter(hospital_mgmt).import_appointments(io.StringIO(rows))
+
+    assert report.accepted == 2
+    assert reasons(report) == {
+        3: "unknown doctor D2",
+        4: "unknown patient P9",
+        5: "D1 is already booked at 09:15 on 2025-03-03",
+        6: "D1 is already booked at 10:15 on 2025-03-03",
+        7: "Appointments must start and last in 15-minute steps.",
+        8: "bad date or time",
+        9: "duplicate ID A1",
+    }
+    assert [a.appointment_id for a in hospital_mgmt.appointments] == [
+        "A1",
+        "A2",
+        "A3",
+    ]
+    assert [a.start_time for a in hospital_mgmt.appointments] == [
+        "09:00",
+        "10:00",
+        "11:00",
+    ]
+    assert ID_SEQUENCES["appointments"].value == 3
+
+
+def test_headless_import_reports_rejections(hospital_mgmt, tmp_path, capsys):
+    path = tmp_path / "patients.csv"
+    path.write_text("name,age,medical_history\nAlice,40,\nBob,-1,\n")
+    args, _ = main.parse_args(
+        ["main.py", "--data-dir", str(tmp_path), "--import", "patients", str(path)]
+    )
+
+    assert main.run_import(args) == 1
+    (report,) = json.loads(capsys.readouterr().out)
+    assert (report["accepted"], report["rejected"]) == (1, 1)
+    assert report["rejected_rows"] == [{"line": 3, "reason": "age must be positive"}]
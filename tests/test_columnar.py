@@ -0,0 +1,108 @@
+# tests/test_columnar.py
+from collections import Counter
+
+import pytest
+
+from management.hospital_management import HospitalManagement
+from models.doctor import Specialization
+from storage.json_storage import JsonStorage
+
+pytest.importorskip("numpy")
+
+WINDOWS = [(None, None), ("2025-01-02", None), ("2025-01-02", "2025-01-04")]
+
+
+def populate(hospital_mgmt: HospitalManagement) -> list:
+    doctors = [
+        hospital_mgmt.add_doctor(f"Doctor {index}", 45, specialization, "pw")
+        for index, specialization in enumerate(
+            [Specialization.GENERAL, Specialization.SURGEON, Specialization.SURGEON]
+        )
+    ]
+    patient = hospital_mgmt.add_patient("Alice Smith", 30, "")
+    return [
+        hospital_mgmt.book_appointment(
+            doctors[(day + slot) % 3].id,
+            patient.patient_id,
+            f"2025-01-0{day}",
+            f"{9 + slot:02d}:00",
+        )
+        for day in range(1, 6)
+        for slot in range(3)
+    ]
+
+
+def in_window(appointment, start, end) -> bool:
+    return (start is None or appointment.date >= start) and (
+        end is None or appointment.date <= end
+    )
+
+
+def assert_matches_objects(hospital_mgmt: HospitalManagement):
+    columns = hospital_mgmt.columns
+    assert len(columns) == len(hospital_mgmt.appointments)
+    for start, end in WINDOWS:
+        shown = [
+            appointment
+            for appointment in hospital_mgmt.appointments
+            if in_window(appointment, start, end)
+        ]
+        assert columns.counts_by_doctor(start, end) == dict(
+            Counter(appointment.doctor_id for appointment in shown)
+        )
+        histogram = Counter(
+            hospital_mgmt.find_doctor_by_id(appointment.doctor_id).specialization.value
+            for appointment in shown
+        )
+        assert columns.specialization_histogram(start, end) == {
+            specialization.value: histogram[specialization.value]
+            for specialization in Specialization
+        }
+
+    doctor_ids, dates, counts = columns.counts_by_doctor_per_day(
+        "2025-01-01", "2025-01-05"
+    )
+    per_day = Counter(
+        (appointment.doctor_id, appointment.date)
+        for appointment in hospital_mgmt.appointments
+    )
+    assert {
+        (doctor_id, date): int(counts[row, column])
+        for row, doctor_id in enumerate(doctor_ids)
+        for column, date in enumerate(dates)
+        if counts[row, column]
+    } == dict(per_day)
+
+
+def test_mirror_follows_inserts_updates_and_deletes(tmp_path):
+    hospital_mgmt = HospitalManagement(JsonStorage(str(tmp_path)))
+    booked = populate(hospital_mgmt)
+    hospital_mgmt.enable_columnar()
+    assert_matches_objects(hospital_mgmt)
+
+    moved = booked[0]
+    hospital_mgmt.update_appointment(
+        moved.appointment_id, "D2", moved.patient_id, "2025-01-04", "17:00"
+    )
+    # Enough deletes to compact the arrays
+    for appointment in booked[1:10]:
+        hospital_mgmt.delete_appointment(appointment.appointment_id)
+    hospital_mgmt.add_doctor("Doctor 3", 45, Specialization.NEUROLOGIST, "pw")
+    hospital_mgmt.book_appointment("D4", moved.patient_id, "2025-01-03")
+    assert_matches_objects(hospital_mgmt)
+
+
+def test_mirror_enabled_mid_load_sees_every_record(tmp_path):
+    populate(HospitalManagement(JsonStorage(str(tmp_path))))
+
+    hospital_mgmt = HospitalManagement(JsonStorage(str(tmp_path)), autoload=False)
+    loading = hospital_mgmt.iter_load_data(chunk_size=4)
+    # Doctors and the first chunks of appointments are in
+    for progress in loading:
+        if progress.collection == "appointments" and progress.loaded:
+            break
+    hospital_mgmt.enable_columnar()
+    assert len(hospital_mgmt.columns) < 15
+    for _ in loading:
+        pass
+    assert_matches_objects(hospital_mgmt)
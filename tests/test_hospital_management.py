@@ -0,0 +1,146 @@
+# tests/test_hospital_management.py
+import json
+
+import pytest
+
+from management.events import ChangeType
+from management.hospital_management import HospitalManagement
+from models.doctor import Specialization
+from storage.json_storage import JsonStorage
+
+
+@pytest.fixture
+def hospital_mgmt(tmp_path):
+    return HospitalManagement(JsonStorage(str(tmp_path)))
+
+
+def test_invalid_patient_update_changes_nothing(hospital_mgmt, tmp_path):
+    patient = hospital_mgmt.add_patient("Alice Smith", 40, "asthma")
+    assert hospital_mgmt.search_patients("alice") == [patient]
+    events = []
+    hospital_mgmt.subscribe(events.append)
+
+    with pytest.raises(ValueError):
+        hospital_mgmt.update_patient(patient.patient_id, "Bob", 0, "flu")
+
+    assert (patient.name, patient.age, patient.medical_history) == (
+        "Alice Smith",
+        40,
+        "asthma",
+    )
+    assert hospital_mgmt.search_patients("bob") == []
+    assert hospital_mgmt.search_patients("alice") == [patient]
+    assert hospital_mgmt.complete_patients("bo") == []
+    assert events == []
+    with open(tmp_path / "patients.json") as f:
+        assert json.load(f)[0]["name"] == "Alice Smith"
+
+
+def test_patient_update_reindexes(hospital_mgmt):
+    patient = hospital_mgmt.add_patient("Alice Smith", 40, "asthma")
+    assert hospital_mgmt.update_patient(patient.patient_id, "Bob Jones", 41, "flu")
+    assert hospital_mgmt.search_patients("alice") == []
+    assert hospital_mgmt.search_patients("flu") == [patient]
+    assert hospital_mgmt.complete_patients("jo") == [patient]
+
+
+def test_collections_keep_insertion_order_across_deletes(hospital_mgmt):
+    doctor = hospital_mgmt.add_doctor("Dana Lee", 50, Specialization.GENERAL, "pw")
+    patient = hospital_mgmt.add_patient("Alice Smith", 40, "")
+    booked = [
+        hospital_mgmt.book_appointment(doctor.id, patient.patient_id, f"2025-01-0{day}")
+        for day in range(1, 5)
+    ]
+    events = []
+    hospital_mgmt.subscribe(events.append)
+
+    assert hospital_mgmt.delete_appointment(booked[1].appointment_id)
+    assert list(hospital_mgmt.appointments) == [booked[0], booked[2], booked[3]]
+    assert len(hospital_mgmt.list_appointments()) == 3
+    (event,) = events
+    assert event.collection == "appointments"
+    assert event.change_type == ChangeType.DELETED
+    assert event.records == [booked[1]]
+
+
+def ids(appointments) -> list:
+    return [appointment.appointment_id for appointment in appointments]
+
+
+@pytest.fixture
+def booked(hospital_mgmt):
+    doctors = [
+        hospital_mgmt.add_doctor(name, 50, Specialization.GENERAL, "pw")
+        for name in ("Dana Lee", "Eli Moss")
+    ]
+    patients = [
+        hospital_mgmt.add_patient(name, 40, "") for name in ("Alice Smith", "Bob Jones")
+    ]
+    appointments = [
+        hospital_mgmt.book_appointment(doctor.id, patient.patient_id, date, start)
+        for date in ("2025-01-06", "2025-01-07")
+        for doctor, patient, start in (
+            (doctors[0], patients[0], "09:00"),
+            (doctors[1], patients[1], "10:00"),
+        )
+    ]
+    return doctors, patients, appointments
+
+
+def test_lookups_by_id(hospital_mgmt, booked):
+    doctors, patients, appointments = booked
+    assert hospital_mgmt.find_doctor_by_id(doctors[1].id) is doctors[1]
+    assert hospital_mgmt.find_patient_by_id(patients[0].patient_id) is patients[0]
+    first = appointments[0]
+    assert hospital_mgmt.find_appointment_by_id(first.appointment_id) is first
+    assert hospital_mgmt.find_appointment_by_id("A999") is None
+    assert hospital_mgmt.find_doctor_by_id("nonsense") is None
+
+
+def test_secondary_indexes_follow_updates(hospital_mgmt, booked):
+    doctors, patients, appointments = booked
+    moved = appointments[0]
+    assert hospital_mgmt.update_appointment(
+        moved.appointment_id,
+        doctors[1].id,
+        patients[1].patient_id,
+        "2025-01-08",
+        "11:00",
+    )
+
+    assert ids(hospital_mgmt.list_appointments_for_doctor(doctors[0].id)) == ids(
+        [appointments[2]]
+    )
+    assert ids(hospital_mgmt.list_appointments_for_doctor(doctors[1].id)) == ids(
+        [appointments[1], appointments[3], moved]
+    )
+    assert ids(
+        hospital_mgmt.list_appointments_for_patient(patients[1].patient_id)
+    ) == ids([appointments[1], appointments[3], moved])
+    assert ids(hospital_mgmt.list_appointments_on_date("2025-01-06")) == ids(
+        [appointments[1]]
+    )
+    assert ids(hospital_mgmt.list_appointments_on_date("2025-01-08")) == ids([moved])
+    assert ids(
+        hospital_mgmt.query_appointments(date_from="2025-01-07", date_to="2025-01-08")
+    ) == ids([appointments[2], appointments[3], moved])
+    assert hospital_mgmt.count_appointments(doctor_id=doctors[1].id) == 3
+
+
+def test_secondary_indexes_follow_deletes(hospital_mgmt, booked):
+    doctors, patients, appointments = booked
+    for appointment in appointments[:2]:
+        assert hospital_mgmt.delete_appointment(appointment.appointment_id)
+    assert not hospital_mgmt.delete_appointment(appointments[0].appointment_id)
+
+    assert hospital_mgmt.list_appointments_on_date("2025-01-06") == []
+    assert ids(hospital_mgmt.list_appointments_for_doctor(doctors[0].id)) == ids(
+        [appointments[2]]
+    )
+    assert ids(
+        hospital_mgmt.list_appointments_for_patient(patients[1].patient_id)
+    ) == ids([appointments[3]])
+    assert ids(hospital_mgmt.query_appointments()) == ids(appointments[2:])
+    assert hospital_mgmt.count_appointments(date_to="2025-01-06") == 0
+    # The emptied day is gone from the sorted dates as well
+    assert hospital_mgmt._appointment_dates == [appointments[2].date_ordinal]
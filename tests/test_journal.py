@@ -0,0 +1,137 @@
+# tests/test_journal.py
+import os
+
+from storage.base import DELETE, INSERT, UPDATE
+from storage.journal import Journal
+from storage.json_storage import JournalStorage, JsonStorage
+
+
+def patient(number: int, name: str = "Name") -> dict:
+    return {
+        "patient_id": f"P{number}",
+        "name": name,
+        "age": 30,
+        "medical_history": "",
+    }
+
+
+def test_replay_returns_appended_entries_in_order(tmp_path):
+    journal = Journal(str(tmp_path / "patients.journal"))
+    journal.append(INSERT, patient(1))
+    journal.append(UPDATE, patient(1, "Renamed"))
+    journal.append(DELETE, {"patient_id": "P1"})
+    journal.close()
+
+    reopened = Journal(journal.path)
+    assert len(reopened) == 3
+    assert [op for op, _ in reopened.replay()] == [INSERT, UPDATE, DELETE]
+
+
+def test_torn_tail_is_cut_before_the_next_append(tmp_path):
+    path = str(tmp_path / "patients.journal")
+    journal = Journal(path)
+    journal.append(INSERT, patient(1))
+    journal.close()
+    # A crash halfway through writing the second entry
+    with open(path, "a") as f:
+        f.write('{"op": "insert", "r": {"patient_')
+
+    journal = Journal(path)
+    assert len(journal) == 1
+    journal.append(INSERT, patient(3))
+    journal.close()
+
+    records = [record for _, record in Journal(path).replay()]
+    assert [record["patient_id"] for record in records] == ["P1", "P3"]
+
+
+def test_corrupt_entry_does_not_hide_later_ones(tmp_path):
+    path = str(tmp_path / "patients.journal")
+    with open(path, "w") as f:
+        f.write('{"op": "insert", "r": {"patient_id": "P1"}}\n')
+        f.write("not json\n")
+        f.write('{"op": "insert", "r": {"patient_id": "P2"}}\n')
+
+    records = [record for _, record in Journal(path).replay()]
+    assert [record["patient_id"] for record in records] == ["P1", "P2"]
+
+
+def test_storage_survives_crash_append_and_restart(tmp_path):
+    data_dir = str(tmp_path)
+    storage = JournalStorage(data_dir)
+    storage.apply("patients", [(INSERT, patient(1))], lambda: [])
+    storage.apply("patients", [(INSERT, patient(2))], lambda: [])
+    storage.close()
+    path = storage.journal("patients").path
+    with open(path, "rb+") as f:
+        f.truncate(os.path.getsize(path) - 10)
+
+    storage = JournalStorage(data_dir)
+    assert [record["patient_id"] for record in storage.load("patients")] == ["P1"]
+    storage.apply("patients", [(INSERT, patient(3))], lambda: [])
+    storage.close()
+
+    storage = JournalStorage(data_dir)
+    ids = [record["patient_id"] for record in storage.load("patients")]
+    storage.close()
+    assert ids == ["P1", "P3"]
+
+
+def test_compaction_folds_the_journal_into_the_snapshot(tmp_path):
+    storage = JournalStorage(str(tmp_path), compact_every=3)
+    records = {}
+    for number in range(1, 4):
+        records[number] = patient(number)
+        storage.apply(
+            "patients", [(INSERT, records[number])], lambda: list(records.values())
+        )
+    assert len(storage.journal("patients")) == 0
+    assert os.path.exists(storage.path("patients"))
+
+    del records[2]
+    storage.apply(
+        "patients", [(DELETE, {"patient_id": "P2"})], lambda: list(records.values())
+    )
+    storage.close()
+
+    storage = JournalStorage(str(tmp_path))
+    ids = [record["patient_id"] for record in storage.load("patients")]
+    storage.close()
+    assert ids == ["P1", "P3"]
+
+
+def test_load_streams_the_snapshot_past_the_journal(tmp_path):
+    storage = JournalStorage(str(tmp_path))
+    JsonStorage.save(storage, "patients", [patient(1), patient(2), patient(3)])
+    storage.apply(
+        "patients",
+        [
+            (UPDATE, patient(2, "Renamed")),
+            (DELETE, {"patient_id": "P3"}),
+            (INSERT, patient(4)),
+        ],
+        lambda: [],
+    )
+    storage.close()
+
+    storage = JournalStorage(str(tmp_path))
+    records = storage.load("patients")
+    # The first snapshot record arrives before the rest of the file is read
+    assert next(records)["patient_id"] == "P1"
+    rest = [(record["patient_id"], record["name"]) for record in records]
+    storage.close()
+    assert rest == [("P2", "Renamed"), ("P4", "Name")]
+
+
+def test_sync_fsyncs_once_per_batch(tmp_path, monkeypatch):
+    synced = []
+    monkeypatch.setattr(os, "fsync", synced.append)
+    storage = JournalStorage(str(tmp_path))
+    storage.apply("patients", [(INSERT, patient(1)), (INSERT, patient(2))], list)
+    assert len(synced) == 1
+    storage.close()
+
+    storage = JournalStorage(str(tmp_path), sync=False)
+    storage.apply("patients", [(INSERT, patient(3))], list)
+    storage.close()
+    assert len(synced) == 1
@@ -0,0 +1,35 @@
+# tests/test_json_stream.py
+import io
+import json
+
+import pytest
+
+from storage.json_stream import iter_json_array
+
+RECORDS = [
+    {"patient_id": "P1", "name": "Alice", "medical_history": "a, [b] {c}"},
+    {"patient_id": "P2", "name": 'Bob "B" Jones', "medical_history": "été"},
+    {"patient_id": "P3", "name": "", "medical_history": "]"},
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 64, 1 << 16])
+@pytest.mark.parametrize("indent", [None, 4])
+def test_elements_match_json_load(chunk_size, indent):
+    text = json.dumps(RECORDS, indent=indent)
+    assert list(iter_json_array(io.StringIO(text), chunk_size)) == RECORDS
+
+
+@pytest.mark.parametrize("text", ["", "[]", "  [ \n ]  "])
+def test_empty_input(text):
+    assert list(iter_json_array(io.StringIO(text), 2)) == []
+
+
+def test_numbers_split_across_chunks_are_not_cut_short():
+    assert list(iter_json_array(io.StringIO("[12345, 678]"), 3)) == [12345, 678]
+
+
+@pytest.mark.parametrize("text", ['{"a": 1}', '[{"a": 1}', '[{"a": 1}, {"b"'])
+def test_malformed_input_raises(text):
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.StringIO(text), 4))
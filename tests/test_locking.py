@@ -0,0 +1,100 @@
+# tests/test_locking.py
+import threading
+import time
+
+import pytest
+
+from management.locking import ReadWriteLock
+
+TIMEOUT = 5
+
+
+def start(target) -> threading.Thread:
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_reads_and_writes_are_reentrant():
+    lock = ReadWriteLock()
+    with lock.read():
+        with lock.read():
+            pass
+    with lock.write():
+        with lock.write():
+            # The writer may also read
+            with lock.read():
+                pass
+    # Fully released: another thread can write
+    done = threading.Event()
+    start(lambda: (lock.acquire_write(), lock.release_write(), done.set()))
+    assert done.wait(TIMEOUT)
+
+
+def test_upgrading_a_read_raises():
+    lock = ReadWriteLock()
+    with lock.read():
+        with pytest.raises(RuntimeError):
+            lock.acquire_write()
+    with lock.write():
+        pass
+
+
+def test_readers_share_and_writers_exclude():
+    lock = ReadWriteLock()
+    inside, release = threading.Barrier(3), threading.Event()
+
+    def reader():
+        with lock.read():
+            inside.wait(TIMEOUT)
+            release.wait(TIMEOUT)
+
+    readers = [start(reader), start(reader)]
+    inside.wait(TIMEOUT)  # both readers hold the lock at once
+
+    wrote = threading.Event()
+
+    def writer():
+        with lock.write():
+            wrote.set()
+
+    writer_thread = start(writer)
+    assert not wrote.wait(0.1)
+    release.set()
+    assert wrote.wait(TIMEOUT)
+    for thread in readers + [writer_thread]:
+        thread.join(TIMEOUT)
+
+
+def test_waiting_writer_blocks_new_readers():
+    lock = ReadWriteLock()
+    order = []
+    holding, release = threading.Event(), threading.Event()
+
+    def first_reader():
+        with lock.read():
+            holding.set()
+            release.wait(TIMEOUT)
+
+    def writer():
+        with lock.write():
+            order.append("writer")
+
+    def late_reader():
+        with lock.read():
+            order.append("reader")
+
+    threads = [start(first_reader)]
+    holding.wait(TIMEOUT)
+    threads.append(start(writer))
+    deadline = time.monotonic() + TIMEOUT
+    while not lock._waiting_writers and time.monotonic() < deadline:
+        time.sleep(0.001)
+    threads.append(start(late_reader))
+    time.sleep(0.05)
+    # The late reader queues behind the writer instead of joining in
+    assert order == []
+    release.set()
+    for thread in threads:
+        thread.join(TIMEOUT)
+    assert order == ["writer", "reader"]
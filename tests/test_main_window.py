@@ -0,0 +1,53 @@
+# tests/test_main_window.py
+import pytest
+
+from management.hospital_management import HospitalManagement
+from models.doctor import Specialization
+from storage.json_storage import JsonStorage
+
+
+@pytest.fixture
+def window(qt_app, tmp_path, monkeypatch):
+    from PySide6.QtWidgets import QMessageBox
+
+    from ui.main_window import MainWindow
+
+    messages = []
+    for kind in ("information", "warning"):
+        monkeypatch.setattr(
+            QMessageBox,
+            kind,
+            lambda parent, title, text, kind=kind: messages.append((kind, text)),
+        )
+    hospital_mgmt = HospitalManagement(JsonStorage(str(tmp_path)))
+    hospital_mgmt.enable_metrics()
+    window = MainWindow(hospital_mgmt)
+    window.messages = messages
+    yield window
+    window.close()
+
+
+def test_booking_with_metrics_on(window):
+    from PySide6.QtCore import QDate
+
+    hospital_mgmt = window.hospital_mgmt
+    doctor = hospital_mgmt.add_doctor("Dana Lee", 50, Specialization.GENERAL, "pw")
+    patient = hospital_mgmt.add_patient("Alice Smith", 40, "")
+    window.tabs.setCurrentIndex(window.tabs.indexOf(window.appointment_tab))
+
+    # Each of these signals carries an argument the slots take no parameter
+    # for
+    window.appointment_doctor_picker.set_record(doctor)
+    window.appointment_patient_picker.set_record(patient)
+    window.appointment_date_input.setDate(QDate.currentDate().addDays(1))
+    window.appointment_window_combo.setCurrentIndex(0)
+    assert window.appointment_time_combo.count() > 0
+
+    window.book_button.click()
+    assert window.messages[-1][0] == "information"
+    assert len(hospital_mgmt.appointments) == 1
+
+    operations = hospital_mgmt.metrics.snapshot()["operations"]
+    assert operations["ui.refresh_time_slots"]["calls"] > 1
+    assert operations["ui.change_appointment_window"]["calls"] == 1
+    assert operations["book_appointment"]["calls"] == 1
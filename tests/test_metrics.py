@@ -0,0 +1,86 @@
+# tests/test_metrics.py
+from management.hospital_management import HospitalManagement
+from management.metrics import LATENCY_BUCKETS_MS, Histogram, Metrics
+from storage.json_storage import JsonStorage
+
+
+def test_histogram_buckets_and_percentiles():
+    histogram = Histogram()
+    for milliseconds in (0.05, 0.3, 0.3, 2, 40, 7000):
+        histogram.observe(milliseconds / 1000)
+    assert histogram.count == 6
+    assert histogram.buckets[0] == 1  # <= 0.1 ms
+    assert histogram.buckets[1] == 2  # <= 0.5 ms
+    assert histogram.buckets[-1] == 1  # slower than the last bound
+    assert histogram.percentile(0.5) == 0.5
+    assert histogram.percentile(1.0) == histogram.max
+    summary = histogram.to_dict()
+    assert summary["calls"] == 6
+    assert summary["buckets"][f">{LATENCY_BUCKETS_MS[-1]}ms"] == 1
+
+
+class Service:
+    def work(self, value):
+        return value * 2
+
+
+def test_instrument_times_one_instance_only():
+    metrics = Metrics()
+    timed, plain = Service(), Service()
+    metrics.instrument(timed, ["work"], prefix="svc.")
+    assert timed.work(2) == 4
+    assert timed.work(3) == 6
+    plain.work(1)
+    assert "work" not in vars(plain)
+    assert metrics.snapshot()["operations"]["svc.work"]["calls"] == 2
+
+
+def test_counters_and_gauges_in_snapshot():
+    metrics = Metrics()
+    metrics.increment("saves")
+    metrics.increment("saves", 2)
+    size = [3]
+    metrics.add_gauge("records", lambda: size[0])
+    size[0] = 5
+    snapshot = metrics.snapshot()
+    assert snapshot["counters"] == {"saves": 3}
+    # Gauges are read when the snapshot is taken
+    assert snapshot["gauges"] == {"records": 5}
+
+
+def test_hospital_metrics(tmp_path):
+    hospital_mgmt = HospitalManagement(JsonStorage(str(tmp_path)))
+    metrics = hospital_mgmt.enable_metrics()
+    hospital_mgmt.add_patient("Alice Smith", 40, "")
+    hospital_mgmt.search_patients("alice")
+    snapshot = metrics.snapshot()
+    assert snapshot["operations"]["add_patient"]["calls"] == 1
+    assert snapshot["operations"]["search_patients"]["calls"] == 1
+    assert snapshot["gauges"]["patients.records"] == 1
+    assert snapshot["gauges"]["storage.bytes_written"] > 0
+
+
+def test_save_bytes_counted_only_when_written(tmp_path):
+    from storage.write_behind import WriteBehindStorage
+
+    for name in ("direct", "deferred"):
+        (tmp_path / name).mkdir()
+    hospital_mgmt = HospitalManagement(JsonStorage(str(tmp_path / "direct")))
+    metrics = hospital_mgmt.enable_metrics()
+    hospital_mgmt.add_patient("Alice Smith", 40, "")
+    hospital_mgmt.save_data()
+    assert metrics.snapshot()["counters"]["save_data.bytes_written"] > 0
+
+    storage = WriteBehindStorage(JsonStorage(str(tmp_path / "deferred")))
+    try:
+        hospital_mgmt = HospitalManagement(storage)
+        metrics = hospital_mgmt.enable_metrics()
+        hospital_mgmt.add_patient("Alice Smith", 40, "")
+        hospital_mgmt.save_data()
+        storage.flush()
+        snapshot = metrics.snapshot()
+    finally:
+        storage.close()
+    # Written by the background flush, so only the gauge sees the bytes
+    assert "save_data.bytes_written" not in snapshot["counters"]
+    assert snapshot["gauges"]["storage.bytes_written"] > 0
@@ -0,0 +1,92 @@
+# tests/test_pickers.py
+import pytest
+
+from management.hospital_management import HospitalManagement
+from models.patient import Patient
+from storage.json_storage import JsonStorage
+
+
+@pytest.fixture
+def hospital_mgmt(tmp_path, monkeypatch):
+    # Patient numbers start from 1, so ID completions are predictable
+    monkeypatch.setattr(Patient.id_sequence, "_value", 0)
+    hospital_mgmt = HospitalManagement(JsonStorage(str(tmp_path)))
+    for number in range(1, 121):
+        hospital_mgmt.add_patient(f"Patient Number{number}", 30, "")
+    hospital_mgmt.add_patient("Alice Smith", 40, "")
+    hospital_mgmt.add_patient("Bob Smithers", 40, "")
+    return hospital_mgmt
+
+
+def names(patients) -> list:
+    return [patient.name for patient in patients]
+
+
+def test_ids_complete_in_numeric_order(hospital_mgmt):
+    # P12 itself, then P120; P121 is Alice, and P122 Bob
+    assert names(hospital_mgmt.complete_patients("P12")) == [
+        "Patient Number12",
+        "Patient Number120",
+        "Alice Smith",
+        "Bob Smithers",
+    ]
+    assert names(hospital_mgmt.complete_patients("p1", limit=3)) == [
+        "Patient Number1",
+        "Patient Number10",
+        "Patient Number11",
+    ]
+    assert hospital_mgmt.complete_patients("P0") == []
+
+
+def test_names_complete_from_any_word(hospital_mgmt):
+    assert names(hospital_mgmt.complete_patients("smi")) == [
+        "Alice Smith",
+        "Bob Smithers",
+    ]
+    assert names(hospital_mgmt.complete_patients("alice sm")) == ["Alice Smith"]
+    assert names(hospital_mgmt.complete_patients("number11", limit=2)) == [
+        "Patient Number11",
+        "Patient Number110",
+    ]
+    assert hospital_mgmt.complete_patients("zed") == []
+
+
+def test_new_patients_are_completed(hospital_mgmt):
+    hospital_mgmt.complete_patients("smi")
+    carol = hospital_mgmt.add_patient("Carol Smithson", 40, "")
+    assert hospital_mgmt.complete_patients("smithson") == [carol]
+
+
+@pytest.fixture
+def picker(qt_app, hospital_mgmt):
+    from ui.main_window import create_patient_picker
+
+    picker = create_patient_picker(hospital_mgmt)
+    picker.selections = []
+    picker.selection_changed.connect(picker.selections.append)
+    return picker
+
+
+def test_picker_lists_only_the_matches(picker):
+    from PySide6.QtCore import QModelIndex
+
+    picker.textEdited.emit("smi")
+    model = picker.completer().model()
+    assert [model.index(row).data() for row in range(model.rowCount())] == [
+        "Alice Smith (P121)",
+        "Bob Smithers (P122)",
+    ]
+    # More than one match: nothing is selected until one is picked
+    assert picker.currentData() == ""
+    picker.completer().activated[QModelIndex].emit(model.index(1))
+    assert picker.currentData() == "P122"
+
+
+def test_picker_selects_an_exact_id(picker, hospital_mgmt):
+    picker.textEdited.emit("p121")
+    assert picker.currentData() == "P121"
+    picker.textEdited.emit("smith")
+    assert picker.currentData() == ""
+    picker.set_record(hospital_mgmt.find_patient_by_id("P5"))
+    assert picker.text() == "Patient Number5 (P5)"
+    assert picker.selections == ["P121", "", "P5"]
@@ -0,0 +1,88 @@
+# tests/test_profiling.py
+import json
+import threading
+
+import pytest
+
+from management.profiling import Profiler
+
+
+@pytest.fixture
+def profiler(tmp_path):
+    profiler = Profiler(str(tmp_path / "profile"))
+    yield profiler
+    profiler.stop()
+
+
+def busy():
+    return sum(range(1000))
+
+
+def test_nested_phases_are_profiled_separately(profiler):
+    with profiler.phase("outer"):
+        busy()
+        with profiler.phase("inner"):
+            busy()
+        with profiler.phase("inner"):
+            busy()
+    assert profiler.phases["outer"].profiled_runs == 1
+    assert profiler.phases["inner"].runs == 2
+    assert profiler.phases["inner"].profiled_runs == 2
+
+
+def test_phase_on_another_thread_is_timed_without_cprofile(profiler):
+    # Python 3.12+ allows one active cProfile per process; a phase started
+    # while the worker profiles must not try to start a second one
+    started, release = threading.Event(), threading.Event()
+
+    def worker():
+        with profiler.phase("load_data"):
+            started.set()
+            release.wait()
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    started.wait()
+    try:
+        with profiler.phase("action"):
+            busy()
+    finally:
+        release.set()
+        thread.join()
+    with profiler.phase("action"):
+        busy()
+
+    assert profiler.phases["load_data"].profiled_runs == 1
+    action = profiler.phases["action"]
+    assert action.runs == 2
+    assert action.profiled_runs == 1
+
+
+def test_write_reports(profiler, tmp_path):
+    with profiler.phase("startup", snapshot=True):
+        busy()
+    profiler.write_reports()
+    with open(tmp_path / "profile" / "phases.json") as f:
+        (phase,) = json.load(f)
+    assert phase["name"] == "startup"
+    assert (tmp_path / "profile" / "01-startup.prof").exists()
+
+
+def test_reentered_phases_accumulate(profiler):
+    for _ in range(3):
+        with profiler.phase("action: click"):
+            busy()
+    stats = profiler.phases["action: click"]
+    assert stats.runs == 3
+    assert stats.wall_seconds > 0
+    assert stats.top_allocations == []  # only snapshot phases record them
+
+
+def test_snapshot_phase_records_allocation_sites(profiler):
+    with profiler.phase("load_data", snapshot=True):
+        kept = [str(number) for number in range(20000)]
+    stats = profiler.phases["load_data"]
+    assert stats.allocated_bytes > 0
+    assert stats.peak_bytes >= stats.allocated_bytes
+    assert any("test_profiling.py" in line for line in stats.top_allocations)
+    del kept
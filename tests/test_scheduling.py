@@ -0,0 +1,92 @@
+# tests/test_scheduling.py
+import pytest
+
+from management.hospital_management import HospitalManagement
+from management.scheduling import (
+    CLINIC_CLOSES,
+    CLINIC_OPENS,
+    DoctorSchedule,
+    SlotConflictError,
+    validate_slot,
+)
+from models.appointment import Appointment
+from models.doctor import Specialization
+from models.fields import format_time, parse_date
+from storage.json_storage import JsonStorage
+
+DAY = "2025-03-03"
+
+
+@pytest.fixture
+def hospital_mgmt(tmp_path):
+    return HospitalManagement(JsonStorage(str(tmp_path)))
+
+
+@pytest.fixture
+def doctor(hospital_mgmt):
+    return hospital_mgmt.add_doctor("Dana Lee", 50, Specialization.GENERAL, "pw")
+
+
+@pytest.fixture
+def patient(hospital_mgmt):
+    return hospital_mgmt.add_patient("Alice Smith", 40, "")
+
+
+def test_free_slots_stay_within_clinic_hours(hospital_mgmt, doctor):
+    slots = hospital_mgmt.free_slots(doctor.id, DAY, 60)
+    assert slots[0] == format_time(CLINIC_OPENS)
+    # The last hour-long appointment ends at closing time
+    assert slots[-1] == format_time(CLINIC_CLOSES - 60)
+    assert len(slots) == (CLINIC_CLOSES - 60 - CLINIC_OPENS) // 15 + 1
+
+
+def test_free_slots_skip_booked_time(hospital_mgmt, doctor, patient):
+    hospital_mgmt.book_appointment(doctor.id, patient.patient_id, DAY, "09:00", 30)
+    slots = hospital_mgmt.free_slots(doctor.id, DAY, 30)
+    # 08:45 would overlap 09:00 by a quarter of an hour
+    assert "08:30" in slots
+    assert {"08:45", "09:00", "09:15"}.isdisjoint(slots)
+    assert "09:30" in slots
+    # Another day and another doctor are unaffected
+    assert "09:00" in hospital_mgmt.free_slots(doctor.id, "2025-03-04", 30)
+
+
+def test_rescheduling_treats_the_own_slot_as_free(hospital_mgmt, doctor, patient):
+    booked = hospital_mgmt.book_appointment(
+        doctor.id, patient.patient_id, DAY, "09:00", 30
+    )
+    slots = hospital_mgmt.free_slots(
+        doctor.id, DAY, 60, ignore_appointment_id=booked.appointment_id
+    )
+    assert "09:00" in slots
+    assert hospital_mgmt.update_appointment(
+        booked.appointment_id, doctor.id, patient.patient_id, DAY, "08:45", 60
+    )
+
+
+def test_double_booking_is_refused(hospital_mgmt, doctor, patient):
+    hospital_mgmt.book_appointment(doctor.id, patient.patient_id, DAY, "09:00", 60)
+    assert not hospital_mgmt.is_slot_free(doctor.id, DAY, "09:45", 15)
+    with pytest.raises(SlotConflictError):
+        hospital_mgmt.book_appointment(doctor.id, patient.patient_id, DAY, "09:45")
+    assert hospital_mgmt.is_slot_free(doctor.id, DAY, "10:00", 15)
+    assert len(hospital_mgmt.appointments) == 1
+
+
+def test_removing_one_of_two_overlapping_bookings_keeps_the_other():
+    # Legacy data may hold overlapping bookings, like A1 and A2 did
+    schedule = DoctorSchedule()
+    first = Appointment("D1", "P1", DAY, "A101", "09:00", 60)
+    second = Appointment("D1", "P1", DAY, "A102", "09:30", 30)
+    schedule.add(first)
+    schedule.add(second)
+    schedule.remove(first)
+    ordinal = parse_date(DAY)
+    assert not schedule.is_free(1, ordinal, 9 * 60 + 30, 15)
+    assert schedule.is_free(1, ordinal, 9 * 60, 30)
+
+
+@pytest.mark.parametrize("start, duration", [(9 * 60 + 5, 30), (9 * 60, 20), (0, 0)])
+def test_slots_must_follow_the_grid(start, duration):
+    with pytest.raises(ValueError):
+        validate_slot(start, duration)
@@ -0,0 +1,120 @@
+# tests/test_search.py
+import random
+
+import pytest
+
+from management import search
+from management.hospital_management import HospitalManagement
+from management.search import (
+    MAX_PREFIX_TERMS,
+    NamePrefixIndex,
+    PatientSearchIndex,
+    name_keys,
+)
+from storage.json_storage import JsonStorage
+
+
+class Named:
+    def __init__(self, number: int, name: str):
+        self.number = number
+        self.name = name
+
+
+def brute_force(records, prefix, limit):
+    found = {}
+    for key, number in sorted(
+        (key, record.number) for record in records for key in name_keys(record.name)
+    ):
+        if key.startswith(prefix) and len(found) < limit:
+            found.setdefault(number, None)
+    return list(found)
+
+
+def test_name_index_across_chunks(monkeypatch):
+    monkeypatch.setattr(search, "NAME_CHUNK_SIZE", 4)
+    rng = random.Random(7)
+    words = ["ann", "anna", "bob", "bobby", "carl", "cara", "dan", "dana"]
+    records = [
+        Named(number, f"{rng.choice(words)} {rng.choice(words)}")
+        for number in range(1, 41)
+    ]
+    index = NamePrefixIndex(records[:20])
+    for record in records[20:]:
+        index.add(record)
+    for record in records[::3]:
+        index.remove(record)
+    kept = [record for number, record in enumerate(records) if number % 3]
+
+    assert len(index) == sum(len(name_keys(record.name)) for record in kept)
+    assert len(index._chunks) > 1
+    for prefix in ["a", "an", "anna", "b", "bobby c", "c", "cara", "d", "dana", "z"]:
+        assert index.search(prefix, 100) == brute_force(kept, prefix, 100)
+        assert index.search(prefix, 3) == brute_force(kept, prefix, 3)
+
+
+def test_name_index_removes_down_to_empty(monkeypatch):
+    monkeypatch.setattr(search, "NAME_CHUNK_SIZE", 2)
+    records = [Named(number, f"name{number}") for number in range(10)]
+    index = NamePrefixIndex(records)
+    for record in records:
+        index.remove(record)
+    assert len(index) == 0
+    assert index.search("name") == []
+    index.add(records[0])
+    assert index.search("name") == [0]
+
+
+class Patient:
+    def __init__(self, number: int, name: str, medical_history: str = ""):
+        self.number = number
+        self.name = name
+        self.medical_history = medical_history
+
+
+def test_search_marks_truncated_prefixes():
+    patients = [
+        Patient(number, f"Pat{number:03d}") for number in range(MAX_PREFIX_TERMS + 1)
+    ]
+    index = PatientSearchIndex(patients)
+
+    results = index.search("pat", 1000)
+    assert results.truncated
+    assert len(results) == MAX_PREFIX_TERMS
+    assert not index.search("pat000", 1000).truncated
+    assert not index.search("pat ", 1000).truncated
+
+
+def test_loading_builds_the_indexes(tmp_path):
+    hospital_mgmt = HospitalManagement(JsonStorage(str(tmp_path)))
+    hospital_mgmt.add_patient("Alice Smith", 40, "asthma")
+    hospital_mgmt.save_data()
+
+    loaded = HospitalManagement(JsonStorage(str(tmp_path)), autoload=False)
+    progress = list(loaded.iter_load_data(build_indexes=True))
+
+    assert [str(step) for step in progress if step.indexing] == [
+        "Indexing doctors...",
+        "Indexing patients...",
+    ]
+    assert loaded.patient_index is not None
+    assert loaded._patient_names is not None
+    assert loaded._doctor_names is not None
+    assert [patient.name for patient in loaded.search_patients("asth")] == [
+        "Alice Smith"
+    ]
+    assert [patient.name for patient in loaded.complete_patients("smi")] == [
+        "Alice Smith"
+    ]
+
+
+@pytest.mark.parametrize("build_indexes", [False, True])
+def test_indexes_follow_updates(tmp_path, build_indexes):
+    hospital_mgmt = HospitalManagement(JsonStorage(str(tmp_path)), autoload=False)
+    hospital_mgmt.load_data(build_indexes=build_indexes)
+    patient = hospital_mgmt.add_patient("Alice Smith", 40, "asthma")
+    hospital_mgmt.update_patient(patient.patient_id, "Alice Jones", 41, "flu")
+
+    assert hospital_mgmt.search_patients("smith") == []
+    assert hospital_mgmt.search_patients("jon") == [patient]
+    assert hospital_mgmt.complete_patients("smi") == []
+    assert hospital_mgmt.complete_patients("jon") == [patient]
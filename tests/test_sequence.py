@@ -0,0 +1,52 @@
+# tests/test_sequence.py
+import threading
+
+import pytest
+
+from management.hospital_management import HospitalManagement
+from models.appointment import Appointment
+from models.doctor import Specialization
+from models.sequence import IdSequence
+from storage.backends import STORAGE_BACKENDS, create_storage
+
+
+def test_concurrent_next_hands_out_unique_numbers():
+    sequence = IdSequence()
+    numbers = []
+
+    def take():
+        numbers.extend(sequence.next() for _ in range(2000))
+
+    threads = [threading.Thread(target=take) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(numbers) == list(range(1, 8001))
+
+
+def test_advance_never_moves_back():
+    sequence = IdSequence(5)
+    sequence.advance(3)
+    assert sequence.value == 5
+    sequence.advance(9)
+    assert sequence.next() == 10
+
+
+@pytest.mark.parametrize("backend", STORAGE_BACKENDS)
+def test_deleted_ids_are_not_reused_after_restart(backend, tmp_path, monkeypatch):
+    hospital_mgmt = HospitalManagement(create_storage(backend, str(tmp_path)))
+    doctor = hospital_mgmt.add_doctor("Dana Lee", 50, Specialization.GENERAL, "pw")
+    patient = hospital_mgmt.add_patient("Alice Smith", 40, "")
+    appointment = hospital_mgmt.book_appointment(
+        doctor.id, patient.patient_id, "2025-01-06"
+    )
+    hospital_mgmt.delete_appointment(appointment.appointment_id)
+    hospital_mgmt.storage.close()
+
+    # A fresh process: nothing loaded refers to the deleted number
+    monkeypatch.setattr(Appointment.id_sequence, "_value", 0)
+    reloaded = HospitalManagement(create_storage(backend, str(tmp_path)))
+    booked = reloaded.book_appointment(doctor.id, patient.patient_id, "2025-01-06")
+    reloaded.storage.close()
+    assert booked.number > appointment.number
@@ -0,0 +1,153 @@
+# tests/test_series.py
+from datetime import date
+
+import pytest
+
+from management.hospital_management import HospitalManagement
+from management.scheduling import SlotConflictError
+from models.doctor import Specialization
+from models.fields import format_date
+from models.series import MAX_OCCURRENCES, MONTHLY, WEEKLY, occurrence_ordinals
+from storage.backends import STORAGE_BACKENDS, create_storage
+from storage.json_storage import JournalStorage
+
+
+def ordinal(text: str) -> int:
+    return date.fromisoformat(text).toordinal()
+
+
+def dates(ordinals) -> list:
+    return [format_date(value) for value in ordinals]
+
+
+def test_weekly_by_count_and_interval():
+    assert dates(occurrence_ordinals(ordinal("2025-01-06"), WEEKLY, 2, 3, 0)) == [
+        "2025-01-06",
+        "2025-01-20",
+        "2025-02-03",
+    ]
+
+
+def test_weekly_until_is_inclusive():
+    ordinals = occurrence_ordinals(
+        ordinal("2025-01-06"), WEEKLY, 1, 0, ordinal("2025-01-20")
+    )
+    assert dates(ordinals) == ["2025-01-06", "2025-01-13", "2025-01-20"]
+
+
+def test_monthly_skips_months_without_the_day():
+    ordinals = occurrence_ordinals(ordinal("2025-01-31"), MONTHLY, 1, 4, 0)
+    assert dates(ordinals) == ["2025-01-31", "2025-03-31", "2025-05-31", "2025-07-31"]
+
+
+def test_count_and_until_whichever_comes_first():
+    ordinals = occurrence_ordinals(
+        ordinal("2025-01-15"), MONTHLY, 1, 10, ordinal("2025-03-15")
+    )
+    assert dates(ordinals) == ["2025-01-15", "2025-02-15", "2025-03-15"]
+
+
+@pytest.mark.parametrize(
+    "frequency, interval, count, until",
+    [
+        ("daily", 1, 3, 0),
+        (WEEKLY, 0, 3, 0),
+        (WEEKLY, 1, -1, 0),
+        (WEEKLY, 1, 0, 0),
+        (WEEKLY, 1, 0, ordinal("2024-12-31")),
+        (WEEKLY, 1, MAX_OCCURRENCES + 1, 0),
+    ],
+)
+def test_invalid_rules_are_rejected(frequency, interval, count, until):
+    with pytest.raises(ValueError):
+        occurrence_ordinals(ordinal("2025-01-01"), frequency, interval, count, until)
+
+
+@pytest.fixture
+def hospital_mgmt(tmp_path):
+    hospital_mgmt = HospitalManagement(JournalStorage(str(tmp_path)))
+    hospital_mgmt.doctor = hospital_mgmt.add_doctor(
+        "Dana Lee", 50, Specialization.GENERAL, "pw"
+    )
+    hospital_mgmt.patient = hospital_mgmt.add_patient("Alice Smith", 40, "")
+    yield hospital_mgmt
+    hospital_mgmt.storage.close()
+
+
+def book_weekly(hospital_mgmt, start_date: str, count: int, **options):
+    return hospital_mgmt.book_series(
+        hospital_mgmt.doctor.id,
+        hospital_mgmt.patient.patient_id,
+        start_date,
+        WEEKLY,
+        count=count,
+        **options,
+    )
+
+
+def test_conflicting_series_books_nothing(hospital_mgmt):
+    hospital_mgmt.book_appointment(
+        hospital_mgmt.doctor.id, hospital_mgmt.patient.patient_id, "2025-01-20"
+    )
+    booked = len(hospital_mgmt.appointments)
+    with pytest.raises(SlotConflictError, match="2025-01-20"):
+        book_weekly(hospital_mgmt, "2025-01-06", 4)
+    assert len(hospital_mgmt.appointments) == booked
+    assert len(hospital_mgmt.series) == 0
+
+
+def test_series_edits_only_touch_its_occurrences(hospital_mgmt, monkeypatch):
+    other = hospital_mgmt.add_doctor("Omar Adel", 45, Specialization.GENERAL, "pw")
+    series = book_weekly(hospital_mgmt, "2025-01-06", 6)
+    for day in range(1, 29):
+        hospital_mgmt.book_appointment(
+            other.id, hospital_mgmt.patient.patient_id, f"2025-02-{day:02d}"
+        )
+
+    # Neither call may walk the whole appointment collection
+    def no_scan(self):
+        raise AssertionError("scanned every appointment")
+
+    monkeypatch.setattr(HospitalManagement, "appointments", property(no_scan))
+    assert hospital_mgmt.update_series(
+        series.series_id, start_time="11:00", from_date="2025-01-20"
+    )
+    assert hospital_mgmt.cancel_series(series.series_id, from_date="2025-02-03")
+    monkeypatch.undo()
+
+    occurrences = hospital_mgmt.list_series_appointments(series.series_id)
+    assert [(a.date, a.start_time) for a in occurrences] == [
+        ("2025-01-06", "09:00"),
+        ("2025-01-13", "09:00"),
+        ("2025-01-20", "11:00"),
+        ("2025-01-27", "11:00"),
+    ]
+    assert series.until == "2025-02-02"
+    assert series.start_time == "09:00"  # a partial edit keeps the rule
+    assert len(hospital_mgmt.appointments) == 4 + 28
+
+
+def test_deleting_the_last_occurrence_removes_the_series(hospital_mgmt):
+    series = book_weekly(hospital_mgmt, "2025-01-06", 2)
+    for appointment in hospital_mgmt.list_series_appointments(series.series_id):
+        hospital_mgmt.delete_appointment(appointment.appointment_id)
+    assert hospital_mgmt.find_series_by_id(series.series_id) is None
+
+
+@pytest.mark.parametrize("backend", STORAGE_BACKENDS)
+def test_series_round_trip(backend, tmp_path):
+    hospital_mgmt = HospitalManagement(create_storage(backend, str(tmp_path)))
+    doctor = hospital_mgmt.add_doctor("Dana Lee", 50, Specialization.GENERAL, "pw")
+    patient = hospital_mgmt.add_patient("Alice Smith", 40, "")
+    series = hospital_mgmt.book_series(
+        doctor.id, patient.patient_id, "2025-01-31", MONTHLY, until="2025-06-30"
+    )
+    hospital_mgmt.storage.close()
+
+    reloaded = HospitalManagement(create_storage(backend, str(tmp_path)))
+    reloaded.storage.close()
+    assert [record.to_dict() for record in reloaded.series] == [series.to_dict()]
+    assert [
+        appointment.date
+        for appointment in reloaded.list_series_appointments(series.series_id)
+    ] == ["2025-01-31", "2025-03-31", "2025-05-31"]
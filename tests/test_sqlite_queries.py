@@ -0,0 +1,134 @@
+# tests/test_sqlite_queries.py
+import pytest
+
+from management.hospital_management import ID_SEQUENCES, HospitalManagement
+from models.doctor import Specialization
+from storage.json_storage import JsonStorage
+from storage.sqlite_storage import SqliteStorage
+from storage.write_behind import WriteBehindStorage
+
+QUERIES = [
+    {},
+    {"date_from": "2025-01-03"},
+    {"date_from": "2025-01-02", "date_to": "2025-01-04"},
+    {"doctor_id": "D1"},
+    {"doctor_id": "D01", "date_to": "2025-01-03"},
+    {"patient_id": "P2"},
+    {"doctor_id": "D2", "patient_id": "P1"},
+    {"doctor_id": "X1"},
+]
+
+
+def restart_ids(monkeypatch):
+    # Both hospitals get the same IDs
+    for sequence in ID_SEQUENCES.values():
+        monkeypatch.setattr(sequence, "_value", 0)
+
+
+def populate(hospital_mgmt: HospitalManagement):
+    doctors = [
+        hospital_mgmt.add_doctor(name, 45, Specialization.GENERAL, "pw")
+        for name in ("Dana Lee", "Omar Khan")
+    ]
+    patients = [
+        hospital_mgmt.add_patient(name, 30, "") for name in ("Alice Smith", "Bob Jones")
+    ]
+    booked = []
+    # Later days first, and two IDs that sort differently as text (A9, A10)
+    for day in (5, 4, 3, 2, 1):
+        for doctor, patient, time in (
+            (doctors[0], patients[0], "10:00"),
+            (doctors[1], patients[1], "09:00"),
+        ):
+            booked.append(
+                hospital_mgmt.book_appointment(
+                    doctor.id, patient.patient_id, f"2025-01-0{day}", time
+                )
+            )
+    hospital_mgmt.update_appointment(
+        booked[0].appointment_id, doctors[1].id, patients[0].patient_id, "2025-01-02"
+    )
+    hospital_mgmt.delete_appointment(booked[3].appointment_id)
+
+
+def snapshot(hospital_mgmt: HospitalManagement) -> list:
+    return [
+        (
+            [a.appointment_id for a in hospital_mgmt.query_appointments(**query)],
+            hospital_mgmt.count_appointments(**query),
+        )
+        for query in QUERIES
+    ] + [
+        [a.appointment_id for a in hospital_mgmt.query_appointments(limit=3, offset=4)],
+        sorted(
+            a.appointment_id
+            for a in hospital_mgmt.list_appointments_on_date("2025-01-02")
+        ),
+        sorted(
+            a.appointment_id for a in hospital_mgmt.list_appointments_for_doctor("D2")
+        ),
+        sorted(
+            a.appointment_id for a in hospital_mgmt.list_appointments_for_patient("P1")
+        ),
+    ]
+
+
+def test_sqlite_queries_match_the_in_memory_indexes(tmp_path, monkeypatch):
+    restart_ids(monkeypatch)
+    in_memory = HospitalManagement(JsonStorage(str(tmp_path)))
+    populate(in_memory)
+    expected = snapshot(in_memory)
+
+    restart_ids(monkeypatch)
+    storage = SqliteStorage(str(tmp_path / "hospital.db"))
+    hospital_mgmt = HospitalManagement(storage)
+    populate(hospital_mgmt)
+    assert hospital_mgmt._indexed_storage
+    assert snapshot(hospital_mgmt) == expected
+    # The secondary indexes are left to SQLite
+    assert not hospital_mgmt._appointments_by_date
+    assert not hospital_mgmt._appointments_by_doctor
+    storage.close()
+
+    storage = SqliteStorage(str(tmp_path / "hospital.db"))
+    assert snapshot(HospitalManagement(storage)) == expected
+    storage.close()
+
+
+def test_queries_see_changes_still_queued_for_write_behind(tmp_path):
+    storage = WriteBehindStorage(SqliteStorage(str(tmp_path / "hospital.db")), delay=60)
+    hospital_mgmt = HospitalManagement(storage)
+    doctor = hospital_mgmt.add_doctor("Dana Lee", 45, Specialization.GENERAL, "pw")
+    patient = hospital_mgmt.add_patient("Alice Smith", 30, "")
+    appointment = hospital_mgmt.book_appointment(
+        doctor.id, patient.patient_id, "2025-01-01"
+    )
+    assert hospital_mgmt.query_appointments(doctor_id=doctor.id) == [appointment]
+    assert hospital_mgmt.count_appointments(date_from="2025-01-01") == 1
+    storage.close()
+
+
+def test_query_uses_the_appointment_indexes(tmp_path):
+    storage = SqliteStorage(str(tmp_path / "hospital.db"))
+    plans = {
+        index: " ".join(
+            row[-1]
+            for row in storage._conn.execute(
+                "EXPLAIN QUERY PLAN SELECT appointment_id FROM appointments "
+                f"WHERE {column} = ? AND date >= ?",
+                ("x", "2025-01-01"),
+            )
+        )
+        for index, column in (("doctor", "doctor_id"), ("patient", "patient_id"))
+    }
+    storage.close()
+    for index, plan in plans.items():
+        assert f"idx_appointments_{index}" in plan
+
+
+def test_invalid_dates_are_rejected_like_in_memory(tmp_path):
+    storage = SqliteStorage(str(tmp_path / "hospital.db"))
+    hospital_mgmt = HospitalManagement(storage)
+    with pytest.raises(ValueError):
+        hospital_mgmt.query_appointments(date_from="not a date")
+    storage.close()
@@ -0,0 +1,315 @@
+# tests/test_table_models.py
+import pytest
+
+from management.hospital_management import HospitalManagement
+from storage.json_storage import JsonStorage
+
+
+@pytest.fixture
+def hospital_mgmt(tmp_path):
+    return HospitalManagement(JsonStorage(str(tmp_path)))
+
+
+@pytest.fixture
+def patient_model(qt_app, hospital_mgmt):
+    from ui.table_models import PatientTableModel
+
+    for name in ("Alice Smith", "Bob Jones", "Carol White"):
+        hospital_mgmt.add_patient(name, 30, "asthma")
+    return PatientTableModel(hospital_mgmt)
+
+
+def cell(model, row: int, column: int = 1) -> str:
+    return model.data(model.index(row, column))
+
+
+def test_rows_are_served_from_the_collection_without_a_copy(
+    patient_model, hospital_mgmt
+):
+    patient_model.refresh()
+    assert patient_model._records is hospital_mgmt.patients
+    assert patient_model.rowCount() == 3
+    assert [cell(patient_model, row) for row in range(3)] == [
+        "Alice Smith",
+        "Bob Jones",
+        "Carol White",
+    ]
+    # No row map until a change needs one
+    assert patient_model._rows is None
+
+
+def test_inserts_extend_the_rows(patient_model, hospital_mgmt):
+    inserted = []
+    patient_model.rowsInserted.connect(
+        lambda parent, first, last: inserted.append((first, last))
+    )
+    hospital_mgmt.add_patient("Dan Brown", 30, "")
+    assert inserted == [(3, 3)]
+    assert cell(patient_model, 3) == "Dan Brown"
+
+
+def test_update_repaints_only_the_changed_row(patient_model, hospital_mgmt):
+    changed = []
+    patient_model.dataChanged.connect(
+        lambda first, last: changed.append((first.row(), last.row()))
+    )
+    bob = hospital_mgmt.patients[1]
+    hospital_mgmt.add_patient("Dan Brown", 30, "")
+    hospital_mgmt.update_patient(bob.patient_id, "Robert Jones", 31, "asthma")
+    assert changed == [(1, 1)]
+    assert cell(patient_model, 1) == "Robert Jones"
+
+    # The row map outlives a refresh and follows later inserts
+    patient_model.refresh()
+    eve = hospital_mgmt.add_patient("Eve Black", 30, "")
+    hospital_mgmt.update_patient(eve.patient_id, "Eve Green", 30, "")
+    assert changed[-1] == (4, 4)
+
+
+def test_filter_shows_its_own_rows_until_refreshed(patient_model, hospital_mgmt):
+    carol = hospital_mgmt.patients[2]
+    patient_model.show_records([carol])
+    assert patient_model.rowCount() == 1
+    assert cell(patient_model, 0) == "Carol White"
+
+    # New patients wait for the filter to be cleared
+    hospital_mgmt.add_patient("Dan Brown", 30, "")
+    assert patient_model.rowCount() == 1
+    hospital_mgmt.update_patient(carol.patient_id, "Carol Grey", 30, "")
+    assert cell(patient_model, 0) == "Carol Grey"
+
+    patient_model.refresh()
+    assert patient_model.rowCount() == 4
+    assert patient_model.record_at(3).name == "Dan Brown"
+
+
+@pytest.fixture
+def booked(hospital_mgmt):
+    # Two doctors' mornings on two days, booked out of order
+    from models.doctor import Specialization
+
+    doctors = [
+        hospital_mgmt.add_doctor(name, 50, Specialization.GENERAL, "pw")
+        for name in ("Dana Lee", "Eli Moss")
+    ]
+    patient = hospital_mgmt.add_patient("Alice Smith", 40, "")
+    for date in ("2025-03-04", "2025-03-03"):
+        for start in ("11:00", "09:00", "10:00"):
+            for doctor in doctors:
+                hospital_mgmt.book_appointment(
+                    doctor.id, patient.patient_id, date, start
+                )
+    return doctors, patient
+
+
+def appointment_model(hospital_mgmt, **window):
+    from ui.table_models import AppointmentTableModel
+
+    model = AppointmentTableModel(hospital_mgmt, **window)
+    model.refresh()
+    return model
+
+
+def page_ids(model) -> list:
+    return [model.record_at(row).appointment_id for row in range(model.rowCount())]
+
+
+def queried_ids(model) -> list:
+    return [appointment.appointment_id for appointment in model.query_page()]
+
+
+def test_pages_follow_the_date_order(qt_app, hospital_mgmt, booked):
+    model = appointment_model(hospital_mgmt, page_size=4)
+    ordered = [
+        appointment.appointment_id
+        for appointment in sorted(
+            hospital_mgmt.appointments,
+            key=lambda appointment: (appointment.date, appointment.start_time),
+        )
+    ]
+    pages = []
+    for offset in range(0, 12, 4):
+        model.set_offset(offset)
+        pages.extend(page_ids(model))
+    assert pages == ordered
+    assert model.total() == 12
+
+
+def test_window_changes_start_from_the_first_page(qt_app, hospital_mgmt, booked):
+    model = appointment_model(hospital_mgmt, page_size=4)
+    model.set_offset(8)
+    model.set_window("2025-03-04", "2025-03-04")
+    assert model.offset == 0
+    assert model.total() == 6
+    assert {model.record_at(row).date for row in range(4)} == {"2025-03-04"}
+    assert page_ids(model) == queried_ids(model)
+
+
+@pytest.mark.parametrize("offset", [0, 4, 8])
+@pytest.mark.parametrize(
+    "date, start",
+    [
+        ("2025-03-03", "08:00"),  # before every row
+        ("2025-03-03", "10:30"),  # inside the first page
+        ("2025-03-04", "09:30"),  # inside a later page
+        ("2025-03-05", "09:00"),  # after every row
+    ],
+)
+def test_new_appointments_land_where_the_query_puts_them(
+    qt_app, hospital_mgmt, booked, offset, date, start
+):
+    doctors, patient = booked
+    model = appointment_model(hospital_mgmt, page_size=4)
+    model.set_offset(offset)
+    hospital_mgmt.book_appointment(doctors[0].id, patient.patient_id, date, start)
+    assert page_ids(model) == queried_ids(model)
+    assert all(
+        model.row_of(model.record_at(row)) == row for row in range(model.rowCount())
+    )
+
+
+def test_new_appointments_outside_the_window_are_left_out(
+    qt_app, hospital_mgmt, booked
+):
+    doctors, patient = booked
+    model = appointment_model(
+        hospital_mgmt, date_from="2025-03-03", date_to="2025-03-03"
+    )
+    hospital_mgmt.book_appointment(
+        doctors[0].id, patient.patient_id, "2025-03-04", "08:00"
+    )
+    assert model.rowCount() == 6
+    assert page_ids(model) == queried_ids(model)
+
+
+def test_changes_from_other_threads_reach_the_model_on_the_gui_thread(
+    qt_app, patient_model, hospital_mgmt
+):
+    import threading
+
+    from PySide6.QtCore import QThread
+
+    threads = []
+    patient_model.rowsInserted.connect(
+        lambda *args: threads.append(QThread.currentThread())
+    )
+    worker = threading.Thread(
+        target=hospital_mgmt.add_patient, args=("Dan Brown", 30, "")
+    )
+    worker.start()
+    worker.join()
+    # Queued until the GUI thread's event loop runs
+    assert patient_model.rowCount() == 3
+
+    qt_app.processEvents()
+    assert patient_model.rowCount() == 4
+    assert threads == [qt_app.thread()]
+
+
+def test_queued_insert_after_a_refresh_is_not_repeated(qt_app, hospital_mgmt, booked):
+    import threading
+
+    doctors, patient = booked
+    model = appointment_model(hospital_mgmt)
+    worker = threading.Thread(
+        target=hospital_mgmt.book_appointment,
+        args=(doctors[0].id, patient.patient_id, "2025-03-03", "08:00"),
+    )
+    worker.start()
+    worker.join()
+    model.refresh()
+    qt_app.processEvents()
+    assert page_ids(model) == queried_ids(model)
+
+
+@pytest.fixture
+def display_rows(qt_app, hospital_mgmt):
+    from ui.table_models import AppointmentDisplayRows
+
+    display_rows = AppointmentDisplayRows(hospital_mgmt)
+    hospital_mgmt.subscribe(display_rows.on_change)
+    return display_rows
+
+
+def test_display_rows_are_formatted_once(
+    display_rows, hospital_mgmt, booked, monkeypatch
+):
+    doctors, patient = booked
+    first = next(iter(hospital_mgmt.appointments))
+    cells = display_rows.row(first)
+    assert cells == (
+        first.appointment_id,
+        f"Dana Lee ({doctors[0].id})",
+        f"Alice Smith ({patient.patient_id})",
+        "2025-03-04",
+        "11:00-11:30",
+    )
+
+    lookups = []
+    monkeypatch.setattr(hospital_mgmt, "find_doctor_by_id", lookups.append)
+    assert display_rows.row(first) is cells
+    assert lookups == []
+
+
+def test_display_rows_drop_only_what_a_change_touches(
+    display_rows, hospital_mgmt, booked
+):
+    doctors, patient = booked
+    appointments = list(hospital_mgmt.appointments)
+    for appointment in appointments:
+        display_rows.row(appointment)
+    other = hospital_mgmt.add_patient("Bob Jones", 30, "")
+    assert len(display_rows) == 12
+
+    # Two of Dana's appointments move to Bob
+    moved = [
+        appointment
+        for appointment in appointments
+        if appointment.doctor_number == doctors[0].number
+    ][:2]
+    for appointment in moved:
+        hospital_mgmt.update_appointment(
+            appointment.appointment_id,
+            doctors[0].id,
+            other.patient_id,
+            appointment.date,
+        )
+    assert len(display_rows) == 10
+    assert display_rows.row(moved[0])[2] == f"Bob Jones ({other.patient_id})"
+
+    # Renaming Bob drops just his rows; renaming Alice the other ten
+    hospital_mgmt.update_patient(other.patient_id, "Robert Jones", 30, "")
+    assert len(display_rows) == 10
+    hospital_mgmt.update_patient(patient.patient_id, "Alice Brown", 40, "")
+    assert len(display_rows) == 0
+    assert display_rows.row(appointments[-1])[2] == (
+        f"Alice Brown ({patient.patient_id})"
+    )
+
+
+def test_display_rows_keep_the_newest(qt_app, hospital_mgmt, booked):
+    from ui.table_models import AppointmentDisplayRows
+
+    display_rows = AppointmentDisplayRows(hospital_mgmt, capacity=4)
+    appointments = list(hospital_mgmt.appointments)
+    for appointment in appointments:
+        display_rows.row(appointment)
+    assert len(display_rows) == 4
+    assert not display_rows.discard(appointments[7].number)
+    for appointment in appointments[8:]:
+        assert display_rows.discard(appointment.number)
+    # Nothing is left referring to the dropped rows
+    assert display_rows._by_doctor == {}
+    assert display_rows._by_patient == {}
+
+
+def test_page_repaints_rows_of_a_renamed_patient(qt_app, hospital_mgmt, booked):
+    doctors, patient = booked
+    model = appointment_model(hospital_mgmt, page_size=4)
+    for row in range(model.rowCount()):
+        model.data(model.index(row, 2))
+    changed = []
+    model.dataChanged.connect(lambda first, last: changed.append(first.row()))
+    hospital_mgmt.update_patient(patient.patient_id, "Alice Brown", 40, "")
+    assert sorted(changed) == [0, 1, 2, 3]
+    assert model.data(model.index(0, 2)) == f"Alice Brown ({patient.patient_id})"
@@ -0,0 +1,125 @@
+# tests/test_write_behind.py
+import threading
+
+import pytest
+
+from storage.base import DELETE, INSERT, Storage
+from storage.json_storage import JsonStorage
+from storage.write_behind import WriteBehindStorage
+
+
+class RecordingStorage(Storage):
+    def __init__(self):
+        self.calls = []
+        self.fail = False
+        self.written = threading.Event()
+
+    def load(self, collection: str):
+        return iter(())
+
+    def save(self, collection, records):
+        self._write(("save", collection, list(records)))
+
+    def apply(self, collection, changes, records):
+        self._write(("apply", collection, list(changes)))
+
+    def save_sequences(self, sequences):
+        self._write(("sequences", dict(sequences)))
+
+    def _write(self, call):
+        if self.fail:
+            raise OSError("disk full")
+        self.calls.append(call)
+        self.written.set()
+
+
+@pytest.fixture
+def inner():
+    return RecordingStorage()
+
+
+@pytest.fixture
+def storage(inner):
+    # Long enough that only explicit flushes write, unless a test waits
+    storage = WriteBehindStorage(inner, delay=60)
+    yield storage
+    inner.fail = False
+    storage.close()
+
+
+def test_a_burst_is_written_as_one_batch(storage, inner):
+    for number in range(1, 4):
+        storage.apply("patients", [(INSERT, {"patient_id": f"P{number}"})], lambda: [])
+    storage.apply("patients", [(DELETE, {"patient_id": "P2"})], lambda: [])
+    assert inner.calls == []
+    assert storage.is_dirty()
+
+    storage.flush()
+    assert inner.calls == [
+        (
+            "apply",
+            "patients",
+            [
+                (INSERT, {"patient_id": "P1"}),
+                (INSERT, {"patient_id": "P2"}),
+                (INSERT, {"patient_id": "P3"}),
+                (DELETE, {"patient_id": "P2"}),
+            ],
+        )
+    ]
+    assert not storage.is_dirty()
+
+
+def test_a_snapshot_supersedes_queued_changes(storage, inner):
+    storage.apply("doctors", [(INSERT, {"doctor_id": "D1"})], lambda: [])
+    storage.save("doctors", [{"doctor_id": "D2"}])
+    storage.apply("doctors", [(INSERT, {"doctor_id": "D3"})], lambda: [])
+    storage.flush()
+    assert inner.calls == [
+        ("save", "doctors", [{"doctor_id": "D2"}]),
+        ("apply", "doctors", [(INSERT, {"doctor_id": "D3"})]),
+    ]
+
+
+def test_failed_batches_are_kept_for_the_next_flush(storage, inner):
+    failures = []
+    storage.on_failed = lambda collection, error: failures.append(collection)
+    storage.apply("patients", [(INSERT, {"patient_id": "P1"})], lambda: [])
+    storage.save_sequences({"patients": 1})
+    inner.fail = True
+    storage.flush()
+    assert failures == ["sequences", "patients"]
+    assert storage.is_dirty()
+
+    # Changes made in the meantime are written after the failed ones
+    storage.apply("patients", [(INSERT, {"patient_id": "P2"})], lambda: [])
+    inner.fail = False
+    storage.flush()
+    assert inner.calls == [
+        ("sequences", {"patients": 1}),
+        (
+            "apply",
+            "patients",
+            [(INSERT, {"patient_id": "P1"}), (INSERT, {"patient_id": "P2"})],
+        ),
+    ]
+
+
+def test_the_worker_flushes_after_the_delay(inner):
+    flushed = []
+    storage = WriteBehindStorage(inner, delay=0.01, on_flushed=flushed.append)
+    try:
+        storage.apply("patients", [(INSERT, {"patient_id": "P1"})], lambda: [])
+        assert inner.written.wait(5)
+    finally:
+        storage.close()
+    assert flushed == [["patients"]]
+
+
+def test_close_writes_what_is_queued(tmp_path):
+    storage = WriteBehindStorage(JsonStorage(str(tmp_path)), delay=60)
+    storage.save("patients", [{"patient_id": "P1", "name": "Alice Smith"}])
+    storage.close()
+    assert [
+        record["patient_id"] for record in JsonStorage(str(tmp_path)).load("patients")
+    ] == ["P1"]
@@ -0,0 +1,106 @@
+# ui/diagnostics.py
+from PySide6.QtWidgets import (
+    QFileDialog,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QMessageBox,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+from management.hospital_management import HospitalManagement
+
+OPERATION_COLUMNS = [
+    "Operation",
+    "Calls",
+    "Mean (ms)",
+    "p50 (ms)",
+    "p95 (ms)",
+    "Max (ms)",
+]
+
+
+class DiagnosticsTab(QWidget):
+    # Operation metrics of a HospitalManagement with metrics enabled; the
+    # main window only adds this tab on request (Ctrl+Shift+D)
+    def __init__(self, hospital_mgmt: HospitalManagement, parent=None):
+        super().__init__(parent)
+        self.hospital_mgmt = hospital_mgmt
+        layout = QVBoxLayout()
+
+        self.summary_label = QLabel()
+        self.summary_label.setWordWrap(True)
+        layout.addWidget(self.summary_label)
+
+        self.operation_table = QTableWidget(0, len(OPERATION_COLUMNS))
+        self.operation_table.setHorizontalHeaderLabels(OPERATION_COLUMNS)
+        self.operation_table.horizontalHeader().setSectionResizeMode(
+            QHeaderView.Stretch
+        )
+        self.operation_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.operation_table)
+
+        button_layout = QHBoxLayout()
+        refresh_button = QPushButton("Refresh")
+        refresh_button.clicked.connect(self.refresh)
+        button_layout.addWidget(refresh_button)
+        export_button = QPushButton("Export JSON...")
+        export_button.clicked.connect(self.export_json)
+        button_layout.addWidget(export_button)
+        layout.addLayout(button_layout)
+
+        self.setLayout(layout)
+        self.refresh()
+
+    def refresh(self):
+        metrics = self.hospital_mgmt.metrics
+        if metrics is None:
+            self.summary_label.setText(
+                "Metrics are disabled. Start the application with --metrics "
+                "(or HOSPITAL_METRICS=1) to record them."
+            )
+            self.operation_table.setRowCount(0)
+            return
+
+        snapshot = metrics.snapshot()
+        facts = [
+            f"{name}: {value:,}"
+            for name, value in {**snapshot["gauges"], **snapshot["counters"]}.items()
+        ]
+        self.summary_label.setText(
+            f"Uptime: {snapshot['uptime_seconds']:.0f} s\n" + "\n".join(facts)
+        )
+
+        operations = snapshot["operations"]
+        self.operation_table.setRowCount(len(operations))
+        for row, (name, stats) in enumerate(operations.items()):
+            values = [
+                name,
+                f"{stats['calls']:,}",
+                f"{stats['mean_ms']:.3f}",
+                f"{stats['p50_ms']:.3f}",
+                f"{stats['p95_ms']:.3f}",
+                f"{stats['max_ms']:.3f}",
+            ]
+            for column, value in enumerate(values):
+                self.operation_table.setItem(row, column, QTableWidgetItem(value))
+
+    def export_json(self):
+        metrics = self.hospital_mgmt.metrics
+        if metrics is None:
+            QMessageBox.information(self, "Diagnostics", "Metrics are disabled.")
+            return
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export Metrics", "metrics.json", "JSON (*.json)"
+        )
+        if not path:
+            return
+        try:
+            with open(path, "w") as f:
+                f.write(metrics.to_json())
+        except OSError as e:
+            QMessageBox.warning(self, "Export Error", f"Could not write {path}: {e}")
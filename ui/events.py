@@ -0,0 +1,21 @@
+# ui/events.py
+from PySide6.QtCore import QObject, Signal
+
+from management.events import ChangeListener
+from management.hospital_management import HospitalManagement
+
+
+class ChangeRelay(QObject):
+    # HospitalManagement runs its listeners on whichever thread made the
+    # change, with the write lock held. A relay forwards the events through
+    # a Qt signal instead: they reach `listener` at once when the change is
+    # made on the GUI thread, and are queued to the GUI thread when a worker
+    # made it, so widgets and models are only ever touched from there.
+    changed = Signal(object)  # ChangeEvent
+
+    def __init__(self, hospital_mgmt: HospitalManagement, listener: ChangeListener):
+        # No parent: HospitalManagement's listener list keeps the relay
+        # alive, and Qt drops the connection if the listener's object goes
+        super().__init__()
+        self.changed.connect(listener)
+        hospital_mgmt.subscribe(self.changed.emit)
@@ -0,0 +1,55 @@
+# ui/loading.py
+import threading
+import time
+from contextlib import nullcontext
+from typing import Callable, ContextManager
+
+from PySide6.QtCore import QObject, Signal
+
+from management.hospital_management import HospitalManagement
+
+
+class DataLoader(QObject):
+    # Runs HospitalManagement.iter_load_data() on a worker thread so the
+    # window can be shown before the data is in. Signals are emitted from
+    # the worker; Qt queues delivery to the GUI thread.
+    progress = Signal(object)  # LoadProgress, once per loaded chunk
+    finished = Signal(float)  # seconds spent loading
+    failed = Signal(str)
+
+    def __init__(
+        self,
+        hospital_mgmt: HospitalManagement,
+        context: Callable[[], ContextManager] = nullcontext,
+        parent=None,
+    ):
+        super().__init__(parent)
+        self.hospital_mgmt = hospital_mgmt
+        self.context = context  # wraps the whole load, e.g. a profiler phase
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._run, name="data-loader", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        # Abandon the load after the current chunk, e.g. when quitting
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        start = time.perf_counter()
+        try:
+            with self.context():
+                for progress in self.hospital_mgmt.iter_load_data(build_indexes=True):
+                    if self._stopping.is_set():
+                        return
+                    self.progress.emit(progress)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.finished.emit(time.perf_counter() - start)
@@ -1,7 +1,9 @@
 # ui/main_window.py
-from PySide6.QtCore import QDate, Qt
+from PySide6.QtCore import QDate, Qt, QTimer
+from PySide6.QtGui import QKeySequence, QShortcut
 from PySide6.QtWidgets import (
     QAbstractItemView,
+    QCheckBox,
     QComboBox,
     QDateEdit,
     QDialog,
@@ -11,17 +13,62 @@ from PySide6.QtWidgets import (
     QLineEdit,
     QMainWindow,
     QMessageBox,
+    QProgressBar,
     QPushButton,
-    QTableWidget,
-    QTableWidgetItem,
+    QSpinBox,
+    QTableView,
     QTabWidget,
     QTextEdit,
     QVBoxLayout,
     QWidget,
 )
 
-from management.hospital_management import HospitalManagement
+from management.events import ChangeEvent
+from management.hospital_management import HospitalManagement, LoadProgress
+from management.scheduling import DURATIONS, SlotConflictError
+from models.appointment import DEFAULT_DURATION
 from models.doctor import Specialization
+from models.series import MONTHLY, WEEKLY
+from storage.write_behind import WriteBehindStorage
+from ui.events import ChangeRelay
+from ui.persistence import PersistenceSignals
+from ui.pickers import RecordPicker, describe_doctor, describe_patient
+from ui.table_models import AppointmentTableModel, DoctorTableModel, PatientTableModel
+
+APPOINTMENT_PAGE_SIZE = 200
+# (label, first day, last day) relative to today; None leaves that end open
+APPOINTMENT_WINDOWS = [
+    ("Today", 0, 0),
+    ("Next 7 days", 0, 6),
+    ("Next 30 days", 0, 29),
+    ("Past 30 days", -30, -1),
+    ("All", None, None),
+]
+DEFAULT_APPOINTMENT_WINDOW = 1  # Next 7 days
+# (label, frequency, interval) offered when booking; None books a single visit
+REPEAT_OPTIONS = [
+    ("Does not repeat", None, 1),
+    ("Weekly", WEEKLY, 1),
+    ("Every 2 weeks", WEEKLY, 2),
+    ("Monthly", MONTHLY, 1),
+]
+DEFAULT_REPEAT_COUNT = 4
+MAX_REPEAT_COUNT = 52
+# Window methods timed when metrics are enabled
+INSTRUMENTED_UI_OPERATIONS = (
+    "create_patient_tab",
+    "create_doctor_tab",
+    "create_appointment_tab",
+    "load_patients",
+    "load_doctors",
+    "load_appointments",
+    "filter_patients",
+    "refresh_time_slots",
+    "change_appointment_window",
+    "turn_page",
+)
+PATIENT_FILTER_LIMIT = 500  # best matches shown by the patient filter box
+FILTER_DELAY_MS = 150  # wait for a pause in typing before searching
 
 # Light mode stylesheet
 light_mode_stylesheet = """
@@ -50,7 +97,7 @@ QLineEdit, QComboBox, QDateEdit, QTextEdit {
     padding: 4px;
 }
 
-QTableWidget {
+QTableView {
     background-color: #ffffff;
     gridline-color: #dddddd;
 }
@@ -79,10 +126,73 @@ QTabBar::tab:selected, QTabBar::tab:hover {
 """
 
 
+def create_table_view(model) -> QTableView:
+    table = QTableView()
+    table.setModel(model)
+    table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+    # Fixed row heights keep the view from measuring every row
+    table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+    table.setSelectionBehavior(QAbstractItemView.SelectRows)
+    table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+    return table
+
+
+def create_duration_combo(selected: int = DEFAULT_DURATION) -> QComboBox:
+    combo = QComboBox()
+    for minutes in DURATIONS:
+        combo.addItem(f"{minutes} min", minutes)
+    combo.setCurrentIndex(max(combo.findData(selected), 0))
+    return combo
+
+
+def create_doctor_picker(hospital_mgmt: HospitalManagement) -> RecordPicker:
+    return RecordPicker(
+        hospital_mgmt.complete_doctors, describe_doctor, "Type a doctor name or ID"
+    )
+
+
+def create_patient_picker(hospital_mgmt: HospitalManagement) -> RecordPicker:
+    return RecordPicker(
+        hospital_mgmt.complete_patients, describe_patient, "Type a patient name or ID"
+    )
+
+
+def fill_time_slots(
+    combo: QComboBox,
+    hospital_mgmt: HospitalManagement,
+    doctor_id: str,
+    date: str,
+    duration: int,
+    ignore_appointment_id: str = None,
+    selected: str = None,
+):
+    # Offer only the start times at which the doctor is free
+    combo.clear()
+    if not doctor_id:
+        combo.addItem("Select Doctor", "")
+        return
+    slots = hospital_mgmt.free_slots(doctor_id, date, duration, ignore_appointment_id)
+    if not slots:
+        combo.addItem("Fully booked", "")
+        return
+    for slot in slots:
+        combo.addItem(slot, slot)
+    if selected is not None:
+        combo.setCurrentIndex(max(combo.findData(selected), 0))
+
+
 class MainWindow(QMainWindow):
-    def __init__(self, hospital_mgmt: HospitalManagement):
+    # Pass loading=True when the data is still being loaded (see
+    # ui.loading.DataLoader) and connect the loader to on_load_progress,
+    # on_load_finished and on_load_failed
+    def __init__(self, hospital_mgmt: HospitalManagement, loading: bool = False):
         super().__init__()
         self.hospital_mgmt = hospital_mgmt
+        # Before any signal is connected, so the connections see the wrappers
+        if hospital_mgmt.metrics is not None:
+            hospital_mgmt.metrics.instrument(
+                self, INSTRUMENTED_UI_OPERATIONS, "ui.", slots=True
+            )
         self.setWindowTitle("Hospital Management System")
         self.setGeometry(100, 100, 1000, 800)
         self.setStyleSheet(light_mode_stylesheet)  # Apply light mode
@@ -90,12 +200,55 @@ class MainWindow(QMainWindow):
         self.tabs = QTabWidget()
         self.setCentralWidget(self.tabs)
 
-        self.create_patient_tab()
-        self.create_doctor_tab()
-        self.create_appointment_tab()
+        # Tabs start out empty and are built, and their data loaded, the
+        # first time they are shown
+        self.patient_tab = QWidget()
+        self.doctor_tab = QWidget()
+        self.appointment_tab = QWidget()
+        self.tabs.addTab(self.patient_tab, "Patient Management")
+        self.tabs.addTab(self.doctor_tab, "Doctor Management")
+        self.tabs.addTab(self.appointment_tab, "Appointment Management")
+        self._tab_builders = {
+            self.patient_tab: self.create_patient_tab,
+            self.doctor_tab: self.create_doctor_tab,
+            self.appointment_tab: self.create_appointment_tab,
+        }
+
+        # Hidden until asked for
+        self.diagnostics_tab = None
+        self.diagnostics_shortcut = QShortcut(QKeySequence("Ctrl+Shift+D"), self)
+        self.diagnostics_shortcut.activated.connect(self.toggle_diagnostics_tab)
+
+        # Saves run in the background; report their outcome in the status bar
+        if isinstance(hospital_mgmt.storage, WriteBehindStorage):
+            self.persistence_signals = PersistenceSignals(self)
+            self.persistence_signals.flushed.connect(self.on_data_saved)
+            self.persistence_signals.failed.connect(self.on_save_failed)
+            self.persistence_signals.attach(hospital_mgmt.storage)
+
+        # While data loads the tables fill in chunk by chunk and actions that
+        # need all of it are disabled
+        self.data_loaded = not loading
+        self.loaded_collections = set()
+        self.load_progress_bar = None
+        self._loading_collection = ""
+        if loading:
+            self.begin_loading()
+
+        self.tabs.currentChanged.connect(self.build_tab)
+        self.build_tab(self.tabs.currentIndex())
+
+    # Tab Construction
+    def build_tab(self, index: int):
+        builder = self._tab_builders.pop(self.tabs.widget(index), None)
+        if builder is not None:
+            builder()
+            self.update_load_state()
+
+    def tab_built(self, tab: QWidget) -> bool:
+        return tab not in self._tab_builders
 
     def create_patient_tab(self):
-        self.patient_tab = QWidget()
         layout = QVBoxLayout()
 
         # Add Patient Section
@@ -112,9 +265,9 @@ class MainWindow(QMainWindow):
         self.patient_history_input = QLineEdit()
         add_layout.addWidget(self.patient_history_input)
 
-        add_button = QPushButton("Add Patient")
-        add_button.clicked.connect(self.add_patient)
-        add_layout.addWidget(add_button)
+        self.add_patient_button = QPushButton("Add Patient")
+        self.add_patient_button.clicked.connect(self.add_patient)
+        add_layout.addWidget(self.add_patient_button)
 
         layout.addLayout(add_layout)
 
@@ -123,20 +276,31 @@ class MainWindow(QMainWindow):
         search_layout.addWidget(QLabel("Search Patient ID:"))
         self.search_patient_input = QLineEdit()
         search_layout.addWidget(self.search_patient_input)
-        search_button = QPushButton("Search")
-        search_button.clicked.connect(self.search_patient)
-        search_layout.addWidget(search_button)
+        self.search_patient_button = QPushButton("Search")
+        self.search_patient_button.clicked.connect(self.search_patient)
+        search_layout.addWidget(self.search_patient_button)
         layout.addLayout(search_layout)
 
-        # Patient Table
-        self.patient_table = QTableWidget()
-        self.patient_table.setColumnCount(4)
-        self.patient_table.setHorizontalHeaderLabels(
-            ["Patient ID", "Name", "Age", "Medical History"]
+        # Filter Patients Section
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(QLabel("Filter:"))
+        self.patient_filter_input = QLineEdit()
+        self.patient_filter_input.setPlaceholderText(
+            "Words from the name or medical history"
         )
-        self.patient_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.patient_table.setSelectionBehavior(QAbstractItemView.SelectRows)
-        self.patient_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.patient_filter_input.setClearButtonEnabled(True)
+        filter_layout.addWidget(self.patient_filter_input)
+        layout.addLayout(filter_layout)
+
+        self.patient_filter_timer = QTimer(self)
+        self.patient_filter_timer.setSingleShot(True)
+        self.patient_filter_timer.setInterval(FILTER_DELAY_MS)
+        self.patient_filter_timer.timeout.connect(self.filter_patients)
+        self.patient_filter_input.textChanged.connect(self.patient_filter_timer.start)
+
+        # Patient Table
+        self.patient_model = PatientTableModel(self.hospital_mgmt, self)
+        self.patient_table = create_table_view(self.patient_model)
         layout.addWidget(self.patient_table)
 
         # Refresh Button
@@ -145,13 +309,11 @@ class MainWindow(QMainWindow):
         layout.addWidget(refresh_button)
 
         self.patient_tab.setLayout(layout)
-        self.tabs.addTab(self.patient_tab, "Patient Management")
 
         # Initial Load
         self.load_patients()
 
     def create_doctor_tab(self):
-        self.doctor_tab = QWidget()
         layout = QVBoxLayout()
 
         # Add Doctor Section
@@ -176,9 +338,9 @@ class MainWindow(QMainWindow):
         self.doctor_password_input.setEchoMode(QLineEdit.Password)
         add_layout.addWidget(self.doctor_password_input)
 
-        add_button = QPushButton("Add Doctor")
-        add_button.clicked.connect(self.add_doctor)
-        add_layout.addWidget(add_button)
+        self.add_doctor_button = QPushButton("Add Doctor")
+        self.add_doctor_button.clicked.connect(self.add_doctor)
+        add_layout.addWidget(self.add_doctor_button)
 
         layout.addLayout(add_layout)
 
@@ -187,20 +349,14 @@ class MainWindow(QMainWindow):
         search_layout.addWidget(QLabel("Search Doctor ID:"))
         self.search_doctor_input = QLineEdit()
         search_layout.addWidget(self.search_doctor_input)
-        search_button = QPushButton("Search")
-        search_button.clicked.connect(self.search_doctor)
-        search_layout.addWidget(search_button)
+        self.search_doctor_button = QPushButton("Search")
+        self.search_doctor_button.clicked.connect(self.search_doctor)
+        search_layout.addWidget(self.search_doctor_button)
         layout.addLayout(search_layout)
 
         # Doctor Table
-        self.doctor_table = QTableWidget()
-        self.doctor_table.setColumnCount(4)
-        self.doctor_table.setHorizontalHeaderLabels(
-            ["Doctor ID", "Name", "Age", "Specialization"]
-        )
-        self.doctor_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.doctor_table.setSelectionBehavior(QAbstractItemView.SelectRows)
-        self.doctor_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.doctor_model = DoctorTableModel(self.hospital_mgmt, self)
+        self.doctor_table = create_table_view(self.doctor_model)
         layout.addWidget(self.doctor_table)
 
         # Refresh Button
@@ -209,13 +365,11 @@ class MainWindow(QMainWindow):
         layout.addWidget(refresh_button)
 
         self.doctor_tab.setLayout(layout)
-        self.tabs.addTab(self.doctor_tab, "Doctor Management")
 
         # Initial Load
         self.load_doctors()
 
     def create_appointment_tab(self):
-        self.appointment_tab = QWidget()
         layout = QVBoxLayout()
 
         # Book Appointment Section
@@ -223,15 +377,13 @@ class MainWindow(QMainWindow):
 
         # Doctor Selection
         book_layout.addWidget(QLabel("Doctor:"))
-        self.appointment_doctor_combo = QComboBox()
-        self.refresh_doctor_combo()
-        book_layout.addWidget(self.appointment_doctor_combo)
+        self.appointment_doctor_picker = create_doctor_picker(self.hospital_mgmt)
+        book_layout.addWidget(self.appointment_doctor_picker)
 
         # Patient Selection
         book_layout.addWidget(QLabel("Patient:"))
-        self.appointment_patient_combo = QComboBox()
-        self.refresh_patient_combo()
-        book_layout.addWidget(self.appointment_patient_combo)
+        self.appointment_patient_picker = create_patient_picker(self.hospital_mgmt)
+        book_layout.addWidget(self.appointment_patient_picker)
 
         # Date Selection
         book_layout.addWidget(QLabel("Date:"))
@@ -240,25 +392,82 @@ class MainWindow(QMainWindow):
         self.appointment_date_input.setDate(QDate.currentDate())
         book_layout.addWidget(self.appointment_date_input)
 
+        # Time Slot Selection
+        book_layout.addWidget(QLabel("Duration:"))
+        self.appointment_duration_combo = create_duration_combo()
+        book_layout.addWidget(self.appointment_duration_combo)
+
+        book_layout.addWidget(QLabel("Time:"))
+        self.appointment_time_combo = QComboBox()
+        book_layout.addWidget(self.appointment_time_combo)
+        self.refresh_time_slots()
+
+        # Recurrence
+        book_layout.addWidget(QLabel("Repeat:"))
+        self.appointment_repeat_combo = QComboBox()
+        for label, _, _ in REPEAT_OPTIONS:
+            self.appointment_repeat_combo.addItem(label)
+        book_layout.addWidget(self.appointment_repeat_combo)
+
+        book_layout.addWidget(QLabel("Times:"))
+        self.appointment_repeat_count = QSpinBox()
+        self.appointment_repeat_count.setRange(2, MAX_REPEAT_COUNT)
+        self.appointment_repeat_count.setValue(DEFAULT_REPEAT_COUNT)
+        self.appointment_repeat_count.setEnabled(False)
+        book_layout.addWidget(self.appointment_repeat_count)
+        self.appointment_repeat_combo.currentIndexChanged.connect(
+            lambda index: self.appointment_repeat_count.setEnabled(index > 0)
+        )
+
+        self.appointment_doctor_picker.selection_changed.connect(
+            self.refresh_time_slots
+        )
+        self.appointment_date_input.dateChanged.connect(self.refresh_time_slots)
+        self.appointment_duration_combo.currentIndexChanged.connect(
+            self.refresh_time_slots
+        )
+
         # Book Button
-        book_button = QPushButton("Book Appointment")
-        book_button.clicked.connect(self.book_appointment)
-        book_layout.addWidget(book_button)
+        self.book_button = QPushButton("Book Appointment")
+        self.book_button.clicked.connect(self.book_appointment)
+        book_layout.addWidget(self.book_button)
 
         layout.addLayout(book_layout)
 
-        # Appointment Table
-        self.appointment_table = QTableWidget()
-        self.appointment_table.setColumnCount(4)
-        self.appointment_table.setHorizontalHeaderLabels(
-            ["Appointment ID", "Doctor", "Patient", "Date"]
+        # Date Window and Paging
+        window_layout = QHBoxLayout()
+        window_layout.addWidget(QLabel("Show:"))
+        self.appointment_window_combo = QComboBox()
+        for label, _, _ in APPOINTMENT_WINDOWS:
+            self.appointment_window_combo.addItem(label)
+        self.appointment_window_combo.setCurrentIndex(DEFAULT_APPOINTMENT_WINDOW)
+        self.appointment_window_combo.currentIndexChanged.connect(
+            self.change_appointment_window
         )
-        self.appointment_table.horizontalHeader().setSectionResizeMode(
-            QHeaderView.Stretch
+        window_layout.addWidget(self.appointment_window_combo)
+        window_layout.addStretch()
+
+        self.previous_page_button = QPushButton("Previous")
+        self.previous_page_button.clicked.connect(lambda: self.turn_page(-1))
+        window_layout.addWidget(self.previous_page_button)
+        self.page_label = QLabel()
+        window_layout.addWidget(self.page_label)
+        self.next_page_button = QPushButton("Next")
+        self.next_page_button.clicked.connect(lambda: self.turn_page(1))
+        window_layout.addWidget(self.next_page_button)
+        layout.addLayout(window_layout)
+
+        # Appointment Table
+        date_from, date_to = self.appointment_window()
+        self.appointment_model = AppointmentTableModel(
+            self.hospital_mgmt,
+            self,
+            date_from=date_from,
+            date_to=date_to,
+            page_size=APPOINTMENT_PAGE_SIZE,
         )
-        self.appointment_table.setSelectionBehavior(QAbstractItemView.SelectRows)
-        self.appointment_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
-        self.appointment_table.cellClicked.connect(self.display_appointment_details)
+        self.appointment_table = create_table_view(self.appointment_model)
+        self.appointment_table.clicked.connect(self.display_appointment_details)
         layout.addWidget(self.appointment_table)
 
         # Appointment Detail Section
@@ -279,6 +488,11 @@ class MainWindow(QMainWindow):
         self.delete_button.setEnabled(False)
         action_layout.addWidget(self.delete_button)
 
+        self.cancel_series_button = QPushButton("Cancel Series")
+        self.cancel_series_button.clicked.connect(self.cancel_series)
+        self.cancel_series_button.setEnabled(False)
+        action_layout.addWidget(self.cancel_series_button)
+
         detail_layout.addLayout(action_layout)
         layout.addLayout(detail_layout)
 
@@ -288,25 +502,155 @@ class MainWindow(QMainWindow):
         layout.addWidget(refresh_button)
 
         self.appointment_tab.setLayout(layout)
-        self.tabs.addTab(self.appointment_tab, "Appointment Management")
 
         # Initial Load
         self.load_appointments()
 
-    # Helper Methods to Refresh ComboBoxes
-    def refresh_doctor_combo(self):
-        self.appointment_doctor_combo.clear()
-        self.appointment_doctor_combo.addItem("Select Doctor", "")
-        for doctor in self.hospital_mgmt.list_doctors():
-            display_text = f"{doctor.name} ({doctor.id})"
-            self.appointment_doctor_combo.addItem(display_text, doctor.id)
-
-    def refresh_patient_combo(self):
-        self.appointment_patient_combo.clear()
-        self.appointment_patient_combo.addItem("Select Patient", "")
-        for patient in self.hospital_mgmt.list_patients():
-            display_text = f"{patient.name} ({patient.patient_id})"
-            self.appointment_patient_combo.addItem(display_text, patient.patient_id)
+        # Keep the time slots and paging in step with the data; subscribed
+        # after the model so the page label sees its updated rows
+        self.data_relay = ChangeRelay(self.hospital_mgmt, self.on_data_changed)
+
+    def refresh_time_slots(self):
+        fill_time_slots(
+            self.appointment_time_combo,
+            self.hospital_mgmt,
+            self.appointment_doctor_picker.currentData(),
+            self.appointment_date_input.date().toString("yyyy-MM-dd"),
+            self.appointment_duration_combo.currentData(),
+            selected=self.appointment_time_combo.currentData(),
+        )
+
+    def on_data_changed(self, event: ChangeEvent):
+        if event.collection == "appointments":
+            self.refresh_time_slots()
+            self.update_page_label()
+
+    # Background Loading
+    def full_data_widgets(self) -> list:
+        # Disabled until every collection is loaded: records added earlier
+        # could take IDs of records still to come, saving would write out a
+        # partial collection, and lookups would miss what is not loaded yet
+        widgets = []
+        if self.tab_built(self.patient_tab):
+            widgets += [
+                self.add_patient_button,
+                self.search_patient_button,
+                self.patient_filter_input,
+            ]
+        if self.tab_built(self.doctor_tab):
+            widgets += [self.add_doctor_button, self.search_doctor_button]
+        if self.tab_built(self.appointment_tab):
+            widgets.append(self.book_button)
+        return widgets
+
+    def collection_pickers(self, collection: str) -> list:
+        # Pickers usable as soon as their own collection is loaded
+        if not self.tab_built(self.appointment_tab):
+            return []
+        if collection == "doctors":
+            return [self.appointment_doctor_picker]
+        if collection == "patients":
+            return [self.appointment_patient_picker]
+        return []
+
+    def update_load_state(self):
+        # Also applied to each tab as it is built
+        for widget in self.full_data_widgets():
+            widget.setEnabled(self.data_loaded)
+        for collection in ("doctors", "patients"):
+            for picker in self.collection_pickers(collection):
+                picker.setEnabled(
+                    self.data_loaded or collection in self.loaded_collections
+                )
+
+    def begin_loading(self):
+        self.update_load_state()
+        self.load_progress_bar = QProgressBar()
+        self.load_progress_bar.setMaximumWidth(200)
+        self.load_progress_bar.setRange(0, 0)
+        self.statusBar().addPermanentWidget(self.load_progress_bar)
+        self.statusBar().showMessage("Loading data...")
+
+    def on_load_progress(self, progress: LoadProgress):
+        if progress.collection != self._loading_collection:
+            self.loaded_collections.add(self._loading_collection)
+            self._loading_collection = progress.collection
+            self.update_load_state()
+        if progress.done:
+            return
+
+        self.statusBar().showMessage(str(progress))
+        if progress.total:
+            self.load_progress_bar.setRange(0, progress.total)
+            self.load_progress_bar.setValue(progress.loaded)
+        else:
+            self.load_progress_bar.setRange(0, 0)
+
+        # Show each chunk as it arrives; tabs built later start from
+        # whatever has been loaded by then
+        if progress.collection == "patients":
+            if self.tab_built(self.patient_tab):
+                self.patient_model.append_loaded()
+        elif progress.collection == "doctors":
+            if self.tab_built(self.doctor_tab):
+                self.doctor_model.append_loaded()
+        elif progress.collection == "appointments":
+            if self.tab_built(self.appointment_tab):
+                self.appointment_model.refresh()
+                self.update_page_label()
+
+    def on_load_finished(self, seconds: float):
+        self.data_loaded = True
+        self.update_load_state()
+        self.remove_load_progress_bar()
+        self.statusBar().showMessage(f"Data loaded in {seconds:.1f} s.", 3000)
+        if self.tab_built(self.appointment_tab):
+            self.load_appointments()
+            self.refresh_time_slots()
+
+    def on_load_failed(self, error: str):
+        # Everything that writes stays disabled so the partial data in
+        # memory never overwrites the stored files
+        self.remove_load_progress_bar()
+        self.statusBar().showMessage("Loading failed.")
+        QMessageBox.critical(
+            self,
+            "Load Error",
+            f"Could not load the data: {error}\n"
+            "Changes are disabled until the application is restarted.",
+        )
+
+    def remove_load_progress_bar(self):
+        if self.load_progress_bar is not None:
+            self.statusBar().removeWidget(self.load_progress_bar)
+            self.load_progress_bar.deleteLater()
+            self.load_progress_bar = None
+
+    # Diagnostics
+    def toggle_diagnostics_tab(self):
+        if self.diagnostics_tab is None:
+            # Rarely opened, so not imported at startup
+            from ui.diagnostics import DiagnosticsTab
+
+            self.diagnostics_tab = DiagnosticsTab(self.hospital_mgmt)
+            self.tabs.addTab(self.diagnostics_tab, "Diagnostics")
+            self.tabs.setCurrentWidget(self.diagnostics_tab)
+            return
+        self.tabs.removeTab(self.tabs.indexOf(self.diagnostics_tab))
+        self.diagnostics_tab.deleteLater()
+        self.diagnostics_tab = None
+
+    # Persistence Feedback
+    def on_data_saved(self, collections):
+        self.statusBar().showMessage(f"Saved {', '.join(collections)}.", 3000)
+
+    def on_save_failed(self, collection, error):
+        self.statusBar().showMessage(f"Failed to save {collection}.")
+        QMessageBox.warning(
+            self,
+            "Save Error",
+            f"Could not save {collection}: {error}\nChanges will be retried.",
+        )
 
     # Patient Management Methods
     def add_patient(self):
@@ -330,21 +674,27 @@ class MainWindow(QMainWindow):
         QMessageBox.information(
             self, "Success", f"Patient added with ID: {new_patient.patient_id}"
         )
-        self.load_patients()
-        self.refresh_patient_combo()
         self.patient_name_input.clear()
         self.patient_age_input.clear()
         self.patient_history_input.clear()
 
     def load_patients(self):
-        patients = self.hospital_mgmt.list_patients()
-        self.patient_table.setRowCount(len(patients))
-        for row, patient in enumerate(patients):
-            self.patient_table.setItem(row, 0, QTableWidgetItem(patient.patient_id))
-            self.patient_table.setItem(row, 1, QTableWidgetItem(patient.name))
-            self.patient_table.setItem(row, 2, QTableWidgetItem(str(patient.age)))
-            self.patient_table.setItem(
-                row, 3, QTableWidgetItem(patient.medical_history)
+        self.patient_filter_input.clear()
+        self.patient_filter_timer.stop()
+        self.patient_model.refresh()
+
+    def filter_patients(self):
+        query = self.patient_filter_input.text()
+        if not query.strip():
+            self.patient_model.refresh()
+            return
+        results = self.hospital_mgmt.search_patients(query, PATIENT_FILTER_LIMIT)
+        self.patient_model.show_records(results)
+        if results.truncated:
+            self.statusBar().showMessage(
+                "Showing some of the matches: type more of the last word to "
+                "see the rest.",
+                3000,
             )
 
     def search_patient(self):
@@ -401,22 +751,12 @@ class MainWindow(QMainWindow):
         QMessageBox.information(
             self, "Success", f"Doctor added with ID: {new_doctor.id}"
         )
-        self.load_doctors()
-        self.refresh_doctor_combo()
         self.doctor_name_input.clear()
         self.doctor_age_input.clear()
         self.doctor_password_input.clear()
 
     def load_doctors(self):
-        doctors = self.hospital_mgmt.list_doctors()
-        self.doctor_table.setRowCount(len(doctors))
-        for row, doctor in enumerate(doctors):
-            self.doctor_table.setItem(row, 0, QTableWidgetItem(doctor.id))
-            self.doctor_table.setItem(row, 1, QTableWidgetItem(doctor.name))
-            self.doctor_table.setItem(row, 2, QTableWidgetItem(str(doctor.age)))
-            self.doctor_table.setItem(
-                row, 3, QTableWidgetItem(doctor.specialization.value)
-            )
+        self.doctor_model.refresh()
 
     def search_doctor(self):
         doctor_id = self.search_doctor_input.text().strip()
@@ -440,24 +780,47 @@ class MainWindow(QMainWindow):
 
     # Appointment Management Methods
     def book_appointment(self):
-        doctor_id = self.appointment_doctor_combo.currentData()
-        patient_id = self.appointment_patient_combo.currentData()
+        doctor_id = self.appointment_doctor_picker.currentData()
+        patient_id = self.appointment_patient_picker.currentData()
         date = self.appointment_date_input.date().toString("yyyy-MM-dd")
+        start_time = self.appointment_time_combo.currentData()
+        duration = self.appointment_duration_combo.currentData()
 
-        if not doctor_id or not patient_id or not date:
+        if not doctor_id or not patient_id or not date or not start_time:
             QMessageBox.warning(self, "Input Error", "All fields are required.")
             return
 
-        appointment = self.hospital_mgmt.book_appointment(doctor_id, patient_id, date)
-        if appointment:
-            QMessageBox.information(
-                self,
-                "Success",
-                f"Appointment booked with ID: {appointment.appointment_id}",
-            )
-            self.load_appointments()
-            self.appointment_doctor_combo.setCurrentIndex(0)
-            self.appointment_patient_combo.setCurrentIndex(0)
+        _, frequency, interval = REPEAT_OPTIONS[
+            self.appointment_repeat_combo.currentIndex()
+        ]
+        try:
+            if frequency:
+                # Every occurrence is booked, or none if any slot is taken
+                booked = self.hospital_mgmt.book_series(
+                    doctor_id,
+                    patient_id,
+                    date,
+                    frequency,
+                    interval,
+                    count=self.appointment_repeat_count.value(),
+                    start_time=start_time,
+                    duration=duration,
+                )
+            else:
+                booked = self.hospital_mgmt.book_appointment(
+                    doctor_id, patient_id, date, start_time, duration
+                )
+        except SlotConflictError as e:
+            QMessageBox.warning(self, "Scheduling Conflict", str(e))
+            return
+        if booked:
+            if frequency:
+                message = f"Appointment series booked with ID: {booked.series_id}"
+            else:
+                message = f"Appointment booked with ID: {booked.appointment_id}"
+            QMessageBox.information(self, "Success", message)
+            self.appointment_doctor_picker.clear_selection()
+            self.appointment_patient_picker.clear_selection()
             self.appointment_date_input.setDate(QDate.currentDate())
         else:
             QMessageBox.warning(
@@ -467,75 +830,100 @@ class MainWindow(QMainWindow):
             )
 
     def load_appointments(self):
-        appointments = self.hospital_mgmt.list_appointments()
-        self.appointment_table.setRowCount(len(appointments))
-        for row, appointment in enumerate(appointments):
-            self.appointment_table.setItem(
-                row, 0, QTableWidgetItem(appointment.appointment_id)
-            )
-            doctor = self.hospital_mgmt.find_doctor_by_id(appointment.doctor_id)
-            patient = self.hospital_mgmt.find_patient_by_id(appointment.patient_id)
-            doctor_display = f"{doctor.name} ({doctor.id})" if doctor else "Unknown"
-            patient_display = (
-                f"{patient.name} ({patient.patient_id})" if patient else "Unknown"
+        self.appointment_model.refresh()
+        self.update_page_label()
+        self.clear_appointment_details()
+
+    def appointment_window(self):
+        _, first, last = APPOINTMENT_WINDOWS[
+            self.appointment_window_combo.currentIndex()
+        ]
+        today = QDate.currentDate()
+        return tuple(
+            None if days is None else today.addDays(days).toString("yyyy-MM-dd")
+            for days in (first, last)
+        )
+
+    def change_appointment_window(self):
+        self.appointment_model.set_window(*self.appointment_window())
+        self.update_page_label()
+        self.clear_appointment_details()
+
+    def turn_page(self, step: int):
+        model = self.appointment_model
+        model.set_offset(model.offset + step * model.page_size)
+        self.update_page_label()
+        self.clear_appointment_details()
+
+    def update_page_label(self):
+        model = self.appointment_model
+        total = model.total()
+        shown = model.rowCount()
+        if shown:
+            self.page_label.setText(
+                f"{model.offset + 1:,}-{model.offset + shown:,} of {total:,}"
             )
-            self.appointment_table.setItem(row, 1, QTableWidgetItem(doctor_display))
-            self.appointment_table.setItem(row, 2, QTableWidgetItem(patient_display))
-            self.appointment_table.setItem(row, 3, QTableWidgetItem(appointment.date))
+        else:
+            self.page_label.setText(f"0 of {total:,}")
+        self.previous_page_button.setEnabled(model.offset > 0)
+        self.next_page_button.setEnabled(model.offset + shown < total)
 
-        # Clear details and disable buttons
+    def clear_appointment_details(self):
         self.detail_label.setText("Select an appointment to see details.")
         self.edit_button.setEnabled(False)
         self.delete_button.setEnabled(False)
+        self.cancel_series_button.setEnabled(False)
 
-    def display_appointment_details(self, row, column):
-        appointment_id = self.appointment_table.item(row, 0).text()
-        doctor_display = self.appointment_table.item(row, 1).text()
-        patient_display = self.appointment_table.item(row, 2).text()
-        date = self.appointment_table.item(row, 3).text()
+    def display_appointment_details(self, index):
+        appointment = self.appointment_model.record_at(index.row())
+        if not appointment:
+            return
 
+        # The same cached cells the table shows
+        appointment_id, doctor, patient, date, time = (
+            self.appointment_model.display_row(appointment)
+        )
         details = (
             f"Appointment ID: {appointment_id}\n"
-            f"Doctor: {doctor_display}\n"
-            f"Patient: {patient_display}\n"
-            f"Date: {date}"
+            f"Doctor: {doctor}\n"
+            f"Patient: {patient}\n"
+            f"Date: {date}\n"
+            f"Time: {time}"
         )
+        series = self.hospital_mgmt.find_series_by_id(appointment.series_id)
+        if series:
+            ends = f"{series.count} times" if series.count else f"until {series.until}"
+            details += (
+                f"\nSeries: {series.series_id}, {series.frequency} every "
+                f"{series.interval} from {series.start_date}, {ends}"
+            )
         self.detail_label.setText(details)
-        self.edit_button.setEnabled(True)
-        self.delete_button.setEnabled(True)
+        self.edit_button.setEnabled(self.data_loaded)
+        self.delete_button.setEnabled(self.data_loaded)
+        self.cancel_series_button.setEnabled(self.data_loaded and bool(series))
 
-    def edit_appointment(self):
-        selected_row = self.appointment_table.currentRow()
-        if selected_row < 0:
-            QMessageBox.warning(self, "Selection Error", "No appointment selected.")
-            return
-
-        appointment_id = self.appointment_table.item(selected_row, 0).text()
-        appointment = next(
-            (
-                a
-                for a in self.hospital_mgmt.appointments
-                if a.appointment_id == appointment_id
-            ),
-            None,
-        )
+    def selected_appointment(self):
+        selected_row = self.appointment_table.currentIndex().row()
+        return self.appointment_model.record_at(selected_row)
 
+    def edit_appointment(self):
+        appointment = self.selected_appointment()
         if not appointment:
-            QMessageBox.warning(self, "Error", "Appointment not found.")
+            QMessageBox.warning(self, "Selection Error", "No appointment selected.")
             return
 
         # Open Edit Dialog
         dialog = EditAppointmentDialog(appointment, self.hospital_mgmt)
         if dialog.exec():
-            self.load_appointments()
+            self.display_appointment_details(self.appointment_table.currentIndex())
 
     def delete_appointment(self):
-        selected_row = self.appointment_table.currentRow()
-        if selected_row < 0:
+        appointment = self.selected_appointment()
+        if not appointment:
             QMessageBox.warning(self, "Selection Error", "No appointment selected.")
             return
 
-        appointment_id = self.appointment_table.item(selected_row, 0).text()
+        appointment_id = appointment.appointment_id
         confirm = QMessageBox.question(
             self,
             "Confirm Deletion",
@@ -549,10 +937,35 @@ class MainWindow(QMainWindow):
                 QMessageBox.information(
                     self, "Success", "Appointment deleted successfully."
                 )
-                self.load_appointments()
+                self.clear_appointment_details()
             else:
                 QMessageBox.warning(self, "Error", "Failed to delete appointment.")
 
+    def cancel_series(self):
+        # Cancels the selected occurrence and every later one; earlier
+        # visits of the series stay booked
+        appointment = self.selected_appointment()
+        if not appointment or not appointment.series_id:
+            QMessageBox.warning(self, "Selection Error", "No series selected.")
+            return
+
+        series_id = appointment.series_id
+        confirm = QMessageBox.question(
+            self,
+            "Confirm Cancellation",
+            f"Cancel series {series_id} from {appointment.date} onwards?",
+            QMessageBox.Yes | QMessageBox.No,
+        )
+
+        if confirm == QMessageBox.Yes:
+            if self.hospital_mgmt.cancel_series(series_id, appointment.date):
+                QMessageBox.information(
+                    self, "Success", "Appointment series cancelled successfully."
+                )
+                self.clear_appointment_details()
+            else:
+                QMessageBox.warning(self, "Error", "Failed to cancel series.")
+
 
 class EditAppointmentDialog(QDialog):
     def __init__(self, appointment, hospital_mgmt: HospitalManagement):
@@ -568,23 +981,19 @@ class EditAppointmentDialog(QDialog):
 
         # Doctor Selection
         layout.addWidget(QLabel("Doctor:"))
-        self.doctor_combo = QComboBox()
-        for doctor in self.hospital_mgmt.list_doctors():
-            display_text = f"{doctor.name} ({doctor.id})"
-            self.doctor_combo.addItem(display_text, doctor.id)
-            if doctor.id == self.appointment.doctor_id:
-                self.doctor_combo.setCurrentText(display_text)
-        layout.addWidget(self.doctor_combo)
+        self.doctor_picker = create_doctor_picker(self.hospital_mgmt)
+        self.doctor_picker.set_record(
+            self.hospital_mgmt.find_doctor_by_id(self.appointment.doctor_id)
+        )
+        layout.addWidget(self.doctor_picker)
 
         # Patient Selection
         layout.addWidget(QLabel("Patient:"))
-        self.patient_combo = QComboBox()
-        for patient in self.hospital_mgmt.list_patients():
-            display_text = f"{patient.name} ({patient.patient_id})"
-            self.patient_combo.addItem(display_text, patient.patient_id)
-            if patient.patient_id == self.appointment.patient_id:
-                self.patient_combo.setCurrentText(display_text)
-        layout.addWidget(self.patient_combo)
+        self.patient_picker = create_patient_picker(self.hospital_mgmt)
+        self.patient_picker.set_record(
+            self.hospital_mgmt.find_patient_by_id(self.appointment.patient_id)
+        )
+        layout.addWidget(self.patient_picker)
 
         # Date Selection
         layout.addWidget(QLabel("Date:"))
@@ -593,6 +1002,31 @@ class EditAppointmentDialog(QDialog):
         self.date_input.setDate(QDate.fromString(self.appointment.date, "yyyy-MM-dd"))
         layout.addWidget(self.date_input)
 
+        # Time Slot Selection
+        layout.addWidget(QLabel("Duration:"))
+        self.duration_combo = create_duration_combo(self.appointment.duration)
+        layout.addWidget(self.duration_combo)
+
+        layout.addWidget(QLabel("Time:"))
+        self.time_combo = QComboBox()
+        layout.addWidget(self.time_combo)
+        self.refresh_time_slots(self.appointment.start_time)
+
+        self.doctor_picker.selection_changed.connect(self.refresh_time_slots)
+        self.date_input.dateChanged.connect(self.refresh_time_slots)
+        self.duration_combo.currentIndexChanged.connect(self.refresh_time_slots)
+
+        # Series Scope
+        self.series_checkbox = QCheckBox(
+            "Apply to this and following appointments in the series"
+        )
+        self.series_checkbox.setVisible(bool(self.appointment.series_id))
+        # Occurrences keep their own dates
+        self.series_checkbox.toggled.connect(
+            lambda checked: self.date_input.setEnabled(not checked)
+        )
+        layout.addWidget(self.series_checkbox)
+
         # Buttons
         button_layout = QHBoxLayout()
         save_button = QPushButton("Save")
@@ -606,20 +1040,60 @@ class EditAppointmentDialog(QDialog):
         layout.addLayout(button_layout)
         self.setLayout(layout)
 
+    def refresh_time_slots(self, selected=None):
+        # The appointment's own slot counts as free while rescheduling it
+        fill_time_slots(
+            self.time_combo,
+            self.hospital_mgmt,
+            self.doctor_picker.currentData(),
+            self.date_input.date().toString("yyyy-MM-dd"),
+            self.duration_combo.currentData(),
+            ignore_appointment_id=self.appointment.appointment_id,
+            selected=(
+                selected if isinstance(selected, str) else self.time_combo.currentData()
+            ),
+        )
+
     def save_changes(self):
-        new_doctor_id = self.doctor_combo.currentData()
-        new_patient_id = self.patient_combo.currentData()
+        new_doctor_id = self.doctor_picker.currentData()
+        new_patient_id = self.patient_picker.currentData()
         new_date = self.date_input.date().toString("yyyy-MM-dd")
+        new_start_time = self.time_combo.currentData()
+        new_duration = self.duration_combo.currentData()
 
         if not new_doctor_id or not new_patient_id or not new_date:
             QMessageBox.warning(self, "Input Error", "All fields are required.")
             return
+        if not new_start_time:
+            QMessageBox.warning(self, "Input Error", "Please pick a free time slot.")
+            return
 
         # Update appointment
-        self.appointment.doctor_id = new_doctor_id
-        self.appointment.patient_id = new_patient_id
-        self.appointment.date = new_date
+        try:
+            if self.series_checkbox.isChecked():
+                updated = self.hospital_mgmt.update_series(
+                    self.appointment.series_id,
+                    new_doctor_id,
+                    new_patient_id,
+                    new_start_time,
+                    new_duration,
+                    from_date=self.appointment.date,
+                )
+            else:
+                updated = self.hospital_mgmt.update_appointment(
+                    self.appointment.appointment_id,
+                    new_doctor_id,
+                    new_patient_id,
+                    new_date,
+                    new_start_time,
+                    new_duration,
+                )
+        except SlotConflictError as e:
+            QMessageBox.warning(self, "Scheduling Conflict", str(e))
+            return
+        if not updated:
+            QMessageBox.warning(self, "Error", "Failed to update appointment.")
+            return
 
-        self.hospital_mgmt.save_data()
         QMessageBox.information(self, "Success", "Appointment updated successfully.")
         self.accept()
@@ -0,0 +1,14 @@
+# ui/persistence.py
+from PySide6.QtCore import QObject, Signal
+
+from storage.write_behind import WriteBehindStorage
+
+
+class PersistenceSignals(QObject):
+    # Emitted from the write-behind thread; Qt queues delivery to the GUI thread
+    flushed = Signal(list)
+    failed = Signal(str, str)
+
+    def attach(self, storage: WriteBehindStorage):
+        storage.on_flushed = self.flushed.emit
+        storage.on_failed = self.failed.emit
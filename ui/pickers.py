@@ -0,0 +1,108 @@
+# ui/pickers.py
+from typing import Callable, List
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt, Signal
+from PySide6.QtWidgets import QCompleter, QLineEdit
+
+PICKER_LIMIT = 50  # completions shown at once
+
+
+class MatchListModel(QAbstractListModel):
+    # Holds only the current matches as (display text, ID) pairs
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._matches: List[tuple] = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._matches)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        display, record_id = self._matches[index.row()]
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return display
+        if role == Qt.UserRole:
+            return record_id
+        return None
+
+    def set_matches(self, matches: List[tuple]):
+        self.beginResetModel()
+        self._matches = matches
+        self.endResetModel()
+
+
+class RecordPicker(QLineEdit):
+    # Type-ahead replacement for a combo box of every doctor or patient. Each
+    # keystroke asks `complete(text, limit)` for matching records, so only
+    # the matches are turned into items. Mirrors QComboBox.currentData().
+    selection_changed = Signal(str)
+
+    def __init__(
+        self,
+        complete: Callable[[str, int], list],
+        describe: Callable[[object], tuple],
+        placeholder: str = "",
+        parent=None,
+    ):
+        super().__init__(parent)
+        self._complete = complete
+        self._describe = describe  # record -> (display text, ID)
+        self._selected = ""
+        self.setPlaceholderText(placeholder)
+        self.setClearButtonEnabled(True)
+
+        self._model = MatchListModel(self)
+        completer = QCompleter(self._model, self)
+        # The model already holds the matches; don't let Qt filter them again
+        completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        completer.activated[QModelIndex].connect(self._on_activated)
+        self.setCompleter(completer)
+
+        self.textEdited.connect(self._on_text_edited)
+
+    def currentData(self) -> str:
+        return self._selected
+
+    def set_record(self, record):
+        if record is None:
+            self.clear_selection()
+            return
+        display, record_id = self._describe(record)
+        self.setText(display)
+        self._select(record_id)
+
+    def clear_selection(self):
+        self.clear()
+        self._select("")
+
+    def _on_text_edited(self, text: str):
+        matches = [
+            self._describe(record) for record in self._complete(text, PICKER_LIMIT)
+        ]
+        self._model.set_matches(matches)
+        # Typing a full ID or an exact entry selects it without the popup
+        exact = [
+            record_id
+            for display, record_id in matches
+            if text.strip().upper() in (display.upper(), record_id.upper())
+        ]
+        self._select(exact[0] if len(exact) == 1 else "")
+        if matches:
+            self.completer().complete()
+
+    def _on_activated(self, index: QModelIndex):
+        self._select(index.data(Qt.UserRole))
+
+    def _select(self, record_id: str):
+        if record_id != self._selected:
+            self._selected = record_id
+            self.selection_changed.emit(record_id)
+
+
+def describe_doctor(doctor) -> tuple:
+    return f"{doctor.name} ({doctor.id})", doctor.id
+
+
+def describe_patient(patient) -> tuple:
+    return f"{patient.name} ({patient.patient_id})", patient.patient_id
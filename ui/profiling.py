@@ -0,0 +1,38 @@
+# ui/profiling.py
+from PySide6.QtCore import QEvent
+from PySide6.QtWidgets import QAbstractButton, QApplication
+
+from management.profiling import Profiler
+
+# Events that start a user action
+ACTION_EVENTS = (QEvent.MouseButtonRelease, QEvent.KeyPress)
+
+
+class ProfilingApplication(QApplication):
+    # Runs every mouse click and key press inside its own profiler phase,
+    # named after the widget that received it
+    def __init__(self, argv, profiler: Profiler):
+        super().__init__(argv)
+        self.profiler = profiler
+        self._in_action = False
+
+    def notify(self, receiver, event):
+        if self._in_action or event.type() not in ACTION_EVENTS:
+            return super().notify(receiver, event)
+        self._in_action = True
+        try:
+            with self.profiler.phase(f"action: {describe_action(receiver, event)}"):
+                return super().notify(receiver, event)
+        finally:
+            self._in_action = False
+
+
+def describe_action(receiver, event) -> str:
+    if event.type() == QEvent.KeyPress:
+        kind = "key"
+    else:
+        kind = "click"
+    if isinstance(receiver, QAbstractButton) and receiver.text():
+        return f"{kind} {receiver.text()}"
+    name = receiver.objectName() or type(receiver).__name__
+    return f"{kind} {name}"
@@ -0,0 +1,394 @@
+# ui/table_models.py
+from bisect import bisect_right
+from itertools import islice
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+from management.events import ChangeEvent, ChangeType
+from management.hospital_management import HospitalManagement, appointment_order
+from ui.events import ChangeRelay
+
+# Formatted appointment rows kept by AppointmentDisplayRows; several pages'
+# worth, so paging back and forth stays cached
+DISPLAY_ROWS_CAPACITY = 10_000
+
+
+class RecordTableModel(QAbstractTableModel):
+    # Serves cells lazily from the records of one HospitalManagement
+    # collection, so only the rows the view actually paints cost anything.
+    # The rows are the source list itself, not a copy: doctors and patients
+    # are only ever appended, so a record's row never changes and inserts
+    # just extend the row count. A filter shows its own (short) list
+    # instead.
+    headers: List[str] = []
+    collection = ""
+
+    def __init__(
+        self,
+        hospital_mgmt: HospitalManagement,
+        source: Callable[[], Sequence],
+        parent=None,
+    ):
+        super().__init__(parent)
+        self.hospital_mgmt = hospital_mgmt
+        self._source = source
+        self._records: Sequence = []
+        self._count = 0
+        # Record number -> row, built by the first row_of()
+        self._rows: Optional[Dict[int, int]] = None
+        # True while showing a fixed subset (e.g. search results) instead
+        # of the whole collection
+        self._filtered = False
+        self._set_records(source(), filtered=False)
+        self._relay = ChangeRelay(hospital_mgmt, self.on_change)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._count
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        return self.column_value(self._records[index.row()], index.column())
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.headers[section]
+        return str(section + 1)
+
+    def column_value(self, record, column: int) -> str:
+        raise NotImplementedError
+
+    def record_at(self, row: int):
+        if 0 <= row < self._count:
+            return self._records[row]
+        return None
+
+    def refresh(self):
+        self.beginResetModel()
+        self._set_records(self._source(), filtered=False)
+        self.endResetModel()
+
+    def append_loaded(self):
+        # Picks up records appended to the source while data is loading
+        if not self._filtered:
+            self.append_new()
+
+    def show_records(self, records: list):
+        self.beginResetModel()
+        self._set_records(list(records), filtered=True)
+        self.endResetModel()
+
+    def _set_records(self, records: Sequence, filtered: bool):
+        # Rows of the same source list stay where they were, so its row
+        # map survives a refresh
+        if records is not self._records:
+            self._rows = None
+        self._records = records
+        self._count = len(records)
+        self._filtered = filtered
+
+    def on_change(self, event: ChangeEvent):
+        if event.collection != self.collection:
+            return
+        if event.change_type == ChangeType.INSERTED:
+            # New records are not part of a filtered subset
+            if not self._filtered:
+                self.append_new()
+        elif event.change_type == ChangeType.UPDATED:
+            self.update_records(event.records)
+
+    def append_new(self):
+        # Shows the rows the source list has grown by
+        count = len(self._records)
+        if count <= self._count:
+            return
+        first = self._count
+        self.beginInsertRows(QModelIndex(), first, count - 1)
+        self._count = count
+        if self._rows is not None:
+            for row in range(first, count):
+                self._rows[self._records[row].number] = row
+        self.endInsertRows()
+
+    def row_of(self, record) -> int:
+        # This model's row for a changed record, or -1 if it is not shown
+        if self._rows is None:
+            self._rows = {
+                shown.number: row
+                for row, shown in enumerate(islice(self._records, self._count))
+            }
+        row = self._rows.get(record.number, -1)
+        return row if row >= 0 and self._records[row] is record else -1
+
+    def update_records(self, records: list):
+        for row in map(self.row_of, records):
+            if row >= 0:
+                self.update_row(row)
+
+    def update_row(self, row: int):
+        last_column = self.columnCount() - 1
+        self.dataChanged.emit(self.index(row, 0), self.index(row, last_column))
+
+
+class PatientTableModel(RecordTableModel):
+    headers = ["Patient ID", "Name", "Age", "Medical History"]
+    collection = "patients"
+
+    def __init__(self, hospital_mgmt: HospitalManagement, parent=None):
+        super().__init__(hospital_mgmt, hospital_mgmt.list_patients, parent)
+
+    def column_value(self, patient, column: int) -> str:
+        if column == 0:
+            return patient.patient_id
+        if column == 1:
+            return patient.name
+        if column == 2:
+            return str(patient.age)
+        return patient.medical_history
+
+
+class DoctorTableModel(RecordTableModel):
+    headers = ["Doctor ID", "Name", "Age", "Specialization"]
+    collection = "doctors"
+
+    def __init__(self, hospital_mgmt: HospitalManagement, parent=None):
+        super().__init__(hospital_mgmt, hospital_mgmt.list_doctors, parent)
+
+    def column_value(self, doctor, column: int) -> str:
+        if column == 0:
+            return doctor.id
+        if column == 1:
+            return doctor.name
+        if column == 2:
+            return str(doctor.age)
+        return doctor.specialization.value
+
+
+class AppointmentDisplayRows:
+    # The formatted cells of appointment rows, with the doctor and patient
+    # resolved to "Name (ID)" labels, keyed by appointment number. A row is
+    # dropped only when its appointment changes or a doctor or patient it
+    # refers to does, so refreshes, paging back and detail views of
+    # unchanged rows cost no lookups or formatting.
+    def __init__(
+        self, hospital_mgmt: HospitalManagement, capacity: int = DISPLAY_ROWS_CAPACITY
+    ):
+        self.hospital_mgmt = hospital_mgmt
+        self.capacity = capacity
+        # appointment number -> (doctor number, patient number, cells)
+        self._rows: Dict[int, Tuple[int, int, Tuple[str, ...]]] = {}
+        # doctor / patient number -> numbers of the cached appointments
+        # referring to it, including ones shown as "Unknown"
+        self._by_doctor: Dict[int, Set[int]] = {}
+        self._by_patient: Dict[int, Set[int]] = {}
+
+    def __len__(self):
+        return len(self._rows)
+
+    def row(self, appointment) -> Tuple[str, ...]:
+        cached = self._rows.get(appointment.number)
+        if cached is not None:
+            return cached[2]
+
+        doctor = self.hospital_mgmt.find_doctor_by_id(appointment.doctor_id)
+        patient = self.hospital_mgmt.find_patient_by_id(appointment.patient_id)
+        cells = (
+            appointment.appointment_id,
+            f"{doctor.name} ({doctor.id})" if doctor else "Unknown",
+            f"{patient.name} ({patient.patient_id})" if patient else "Unknown",
+            appointment.date,
+            f"{appointment.start_time}-{appointment.end_time}",
+        )
+        if len(self._rows) >= self.capacity:
+            # Oldest first; dicts keep insertion order
+            self.discard(next(iter(self._rows)))
+        number = appointment.number
+        self._rows[number] = (
+            appointment.doctor_number,
+            appointment.patient_number,
+            cells,
+        )
+        self._by_doctor.setdefault(appointment.doctor_number, set()).add(number)
+        self._by_patient.setdefault(appointment.patient_number, set()).add(number)
+        return cells
+
+    def discard(self, number: int) -> bool:
+        cached = self._rows.pop(number, None)
+        if cached is None:
+            return False
+        doctor_number, patient_number, _ = cached
+        for references, key in (
+            (self._by_doctor, doctor_number),
+            (self._by_patient, patient_number),
+        ):
+            numbers = references[key]
+            numbers.discard(number)
+            if not numbers:
+                del references[key]
+        return True
+
+    def on_change(self, event: ChangeEvent) -> Set[int]:
+        # Drops the rows the change affects; returns their appointment
+        # numbers
+        if not self._rows:
+            return set()
+        if event.collection == "appointments":
+            if event.change_type == ChangeType.INSERTED:
+                return set()
+            numbers = {appointment.number for appointment in event.records}
+        elif event.collection in ("doctors", "patients"):
+            # An inserted doctor or patient may resolve an "Unknown" label
+            references = (
+                self._by_doctor if event.collection == "doctors" else self._by_patient
+            )
+            numbers = set()
+            for record in event.records:
+                numbers.update(references.get(record.number, ()))
+        else:
+            return set()
+        return {number for number in numbers if self.discard(number)}
+
+
+class AppointmentTableModel(RecordTableModel):
+    # Shows one page of the appointments in a date window, queried through
+    # the sorted date index instead of listing every appointment. Cells
+    # come from an AppointmentDisplayRows cache that outlives the page.
+    # The page is its own list of at most `page_size` rows, so its row map
+    # is kept up to date and inserts and deletes are applied row by row.
+    headers = ["Appointment ID", "Doctor", "Patient", "Date", "Time"]
+    collection = "appointments"
+
+    def __init__(
+        self,
+        hospital_mgmt: HospitalManagement,
+        parent=None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        page_size: Optional[int] = None,
+    ):
+        self.date_from = date_from
+        self.date_to = date_to
+        self.page_size = page_size
+        self.offset = 0
+        self.display_rows = AppointmentDisplayRows(hospital_mgmt)
+        super().__init__(hospital_mgmt, self.query_page, parent)
+
+    def query_page(self) -> list:
+        return self.hospital_mgmt.query_appointments(
+            date_from=self.date_from,
+            date_to=self.date_to,
+            limit=self.page_size,
+            offset=self.offset,
+        )
+
+    def total(self) -> int:
+        return self.hospital_mgmt.count_appointments(
+            date_from=self.date_from, date_to=self.date_to
+        )
+
+    def set_window(self, date_from: Optional[str], date_to: Optional[str]):
+        self.date_from = date_from
+        self.date_to = date_to
+        self.offset = 0
+        self.refresh()
+
+    def set_offset(self, offset: int):
+        self.offset = max(offset, 0)
+        self.refresh()
+
+    def _set_records(self, records: Sequence, filtered: bool):
+        super()._set_records(records, filtered)
+        self.index_rows()
+
+    def index_rows(self, first: int = 0):
+        # (Re)numbers the page's rows from `first` on
+        if not first:
+            self._rows = {}
+        rows = self._rows
+        for row in range(first, self._count):
+            rows[self._records[row].number] = row
+
+    def on_change(self, event: ChangeEvent):
+        # Stale rows go first, so repainted cells are formatted afresh
+        changed = self.display_rows.on_change(event)
+        if event.collection != self.collection:
+            for number in changed:
+                row = self._rows.get(number)
+                if row is not None:
+                    self.update_row(row)
+        elif event.change_type == ChangeType.INSERTED:
+            records = [record for record in event.records if self.accepts(record)]
+            if records:
+                self.insert_records(sorted(records, key=appointment_order))
+        elif event.change_type == ChangeType.DELETED:
+            self.remove_records(event.records)
+        else:
+            self.update_records(event.records)
+
+    def accepts(self, appointment) -> bool:
+        # Whether a newly booked appointment falls in the date window and is
+        # not on the page yet (a refresh may beat a queued event to it)
+        if appointment.number in self._rows:
+            return False
+        date = appointment.date
+        if self.date_from and date < self.date_from:
+            return False
+        if self.date_to and date > self.date_to:
+            return False
+        return True
+
+    def insert_records(self, records: list):
+        # Puts each appointment, in order, at its place on the page. One
+        # that sorts before a later page's first row belongs to an earlier
+        # page and pushes a row onto this one, so the page is queried again.
+        for record in records:
+            orders = [appointment_order(row) for row in self._records]
+            row = bisect_right(orders, appointment_order(record))
+            if row == 0 and self.offset:
+                self.refresh()
+                return
+            full = self.page_size is not None and self._count >= self.page_size
+            if full and row == self._count:
+                # Shows up on a later page
+                continue
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._records.insert(row, record)
+            self._count += 1
+            self.endInsertRows()
+            if full:
+                # The last row moves on to the next page
+                last = self._count - 1
+                self.beginRemoveRows(QModelIndex(), last, last)
+                del self._rows[self._records[last].number]
+                del self._records[last]
+                self._count -= 1
+                self.endRemoveRows()
+            self.index_rows(row)
+
+    def remove_records(self, records: list):
+        rows = sorted(
+            (row for row in map(self.row_of, records) if row >= 0), reverse=True
+        )
+        if not rows:
+            return
+        # Highest row first so earlier removals don't shift later ones
+        for row in rows:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._rows[self._records[row].number]
+            del self._records[row]
+            self._count -= 1
+            self.endRemoveRows()
+        # Only rows after the first removed one moved
+        self.index_rows(rows[-1])
+
+    def column_value(self, appointment, column: int) -> str:
+        return self.display_rows.row(appointment)[column]
+
+    def display_row(self, appointment) -> Tuple[str, ...]:
+        return self.display_rows.row(appointment)